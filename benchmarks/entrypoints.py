@@ -0,0 +1,123 @@
+"""
+Сравнение производительности точек входа сервера.
+
+Запускает по очереди:
+- текущую точку входа: `uvicorn src.server:app` (один процесс, asyncio + h11);
+- production-лаунчер: `python -m src.launcher` (воркеры по числу ядер,
+  uvloop + httptools при наличии).
+
+Для каждой нагружает эндпоинт с keep-alive соединениями и печатает
+RPS и перцентили задержки. Эндпоинт по умолчанию (`/openapi.json`)
+не обращается к БД, но lifespan сервера всё равно требует доступную БД:
+Postgres из настроек или, с `--sqlite`, локальный файл SQLite (aiosqlite, WAL)
+без внешних сервисов.
+
+Запуск из корня репозитория:
+    python benchmarks/entrypoints.py --requests 20000 --concurrency 64
+    python benchmarks/entrypoints.py --sqlite --path /src/user/1
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ENTRYPOINTS = {
+    "uvicorn (текущий)": [sys.executable, "-m", "uvicorn", "src.server:app"],
+    "launcher": [sys.executable, "-m", "src.launcher"],
+}
+
+
+def wait_ready(port: int, path: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", path)
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Сервер на порту {port} не поднялся за {timeout} с")
+
+
+def worker(port: int, path: str, count: int) -> list[float]:
+    # Одно keep-alive соединение на поток, как у клиента с пулом
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        conn.request("GET", path)
+        conn.getresponse().read()
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+    return latencies
+
+
+def run_load(port: int, path: str, total: int, concurrency: int) -> dict:
+    per_worker = max(total // concurrency, 1)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = pool.map(
+            worker,
+            [port] * concurrency,
+            [path] * concurrency,
+            [per_worker] * concurrency,
+        )
+        latencies = sorted(lat for chunk in results for lat in chunk)
+    elapsed = time.perf_counter() - started
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--path", default="/openapi.json")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--sqlite",
+        metavar="FILE",
+        nargs="?",
+        const="benchmark.db",
+        help="Использовать SQLite вместо Postgres (по умолчанию benchmark.db).",
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.sqlite:
+        env["DB_URL"] = f"sqlite+aiosqlite:///{args.sqlite}"
+
+    for name, command in ENTRYPOINTS.items():
+        proc = subprocess.Popen(
+            [*command, "--host", "127.0.0.1", "--port", str(args.port)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(args.port, args.path)
+            # Прогрев: первые запросы компилируют схемы и заполняют кэши
+            run_load(args.port, args.path, args.concurrency * 10, args.concurrency)
+            stats = run_load(args.port, args.path, args.requests, args.concurrency)
+            print(
+                f"{name:<20} {stats['rps']:>10.0f} req/s"
+                f"  p50={stats['p50']:.2f} ms  p99={stats['p99']:.2f} ms"
+            )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Асинхронный клиент Advertisement API.
+
+Пакет не зависит от серверного кода (`src`) и требует только httpx и pydantic.
+"""
+
+from client.models import AdvertisementResponse, UserResponse
+from client.sdk import AdvertisementClient, ApiError
+
+__all__ = ["AdvertisementClient", "AdvertisementResponse", "ApiError", "UserResponse"]
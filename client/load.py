@@ -0,0 +1,91 @@
+"""
+Генератор нагрузки на Advertisement API на основе `client.sdk`.
+
+Создаёт (при необходимости) пользователя и набор объявлений, затем
+выполняет заданное число запросов сценария с ограничением параллельности
+и печатает RPS, перцентили задержки и число ошибок.
+
+Запуск из корня репозитория:
+    python -m client.load --scenario get --requests 20000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+from client.sdk import AdvertisementClient, ApiError
+
+
+async def prepare(api: AdvertisementClient, name: str, ads: int) -> list[int]:
+    try:
+        await api.create_user(name, api.password)
+    except ApiError as exc:
+        if exc.status_code != 409:
+            raise
+    await api.login()
+    return await api.create_advertisements(
+        {
+            "title": f"load_{i}",
+            "description": "load test " * 20,
+            "price": i,
+            "owner": name,
+        }
+        for i in range(ads)
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--name", default="load_user")
+    parser.add_argument("--password", default="load_password")
+    parser.add_argument("--scenario", choices=["get", "search"], default="get")
+    parser.add_argument("--ads", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    async with AdvertisementClient(
+        args.base_url,
+        name=args.name,
+        password=args.password,
+        max_connections=args.concurrency,
+        max_concurrency=args.concurrency,
+    ) as api:
+        adv_ids = await prepare(api, args.name, args.ads)
+
+        latencies: list[float] = []
+        errors = 0
+
+        async def one() -> None:
+            nonlocal errors
+            started = time.perf_counter()
+            try:
+                if args.scenario == "get":
+                    await api.get_advertisement(random.choice(adv_ids))
+                else:
+                    await api.search_advertisements(
+                        title="load_", fields=["id", "title", "price"], limit=100
+                    )
+            except (ApiError, httpx.HTTPError):
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{args.scenario}: {len(latencies) / elapsed:.0f} req/s"
+        f"  p50={quantiles[49] * 1000:.2f} ms  p99={quantiles[98] * 1000:.2f} ms"
+        f"  errors={errors}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
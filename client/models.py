@@ -0,0 +1,40 @@
+"""
+Модели ответов Advertisement API для клиента.
+
+Клиент не зависит от серверного пакета `src`: модели описывают контракт
+API независимо от его реализации и допускают новые поля в ответах.
+"""
+
+import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+# Роль пользователя
+Role = Literal["user", "admin"]
+
+
+class UserResponse(BaseModel):
+    """
+    Данные пользователя (`GET /user/{id}`).
+    """
+
+    id: int  # Уникальный идентификатор пользователя
+    name: str  # Имя пользователя
+    role: Role  # Роль пользователя
+
+
+class AdvertisementResponse(BaseModel):
+    """
+    Объявление (`GET /advertisement/{id}` и элементы поиска).
+
+    Все поля необязательны: сервер возвращает только запрошенные
+    параметром `fields`.
+    """
+
+    id: Optional[int] = None  # Уникальный идентификатор объявления
+    title: Optional[str] = None  # Заголовок объявления
+    description: Optional[str] = None  # Описание объявления
+    price: Optional[int] = None  # Цена
+    owner: Optional[str] = None  # Владелец объявления
+    date_posted: Optional[datetime.datetime] = None  # Дата публикации
@@ -0,0 +1,343 @@
+import asyncio
+import uuid
+from typing import Any, AsyncIterator, Iterable, Optional
+
+import httpx
+
+from client.models import AdvertisementResponse, UserResponse
+
+
+class ApiError(Exception):
+    """
+    Ошибка, возвращённая API (код ответа 4xx/5xx).
+
+    Args:
+        status_code (int): HTTP-код ответа.
+        detail (Any): Поле `detail` из тела ответа (или текст ответа).
+    """
+
+    def __init__(self, status_code: int, detail: Any) -> None:
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AdvertisementClient:
+    """
+    Асинхронный клиент Advertisement API.
+
+    - Пул keep-alive соединений HTTP/1.1 (`httpx.AsyncClient`), общий для всех вызовов.
+    - Получение токена через `/login` и его обновление при ответе 401.
+    - Ограничение числа одновременных запросов (`max_concurrency`).
+    - Типизированные методы для пользователей, объявлений, поиска и пакетных
+      операций; постраничный обход результатов поиска.
+
+    Пример:
+        async with AdvertisementClient(name="user", password="secret") as api:
+            adv_id = await api.create_advertisement("title", "desc", 100, "user")
+            async for adv in api.iter_advertisements(title="title"):
+                ...
+
+    Args:
+        base_url (str): Адрес сервера.
+        prefix (str): Префикс маршрутов API.
+        name (str | None): Имя пользователя для аутентификации.
+        password (str | None): Пароль пользователя.
+        max_connections (int): Размер пула соединений.
+        max_concurrency (int): Максимум одновременно выполняемых запросов.
+        timeout (float): Таймаут запроса в секундах.
+        transport (httpx.AsyncBaseTransport | None): Транспорт httpx (например,
+            `httpx.ASGITransport` для вызова приложения без сети).
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        prefix: str = "/src",
+        *,
+        name: Optional[str] = None,
+        password: Optional[str] = None,
+        max_connections: int = 100,
+        max_concurrency: int = 100,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.name = name
+        self.password = password
+        self.token: Optional[uuid.UUID] = None
+        self._http = httpx.AsyncClient(
+            base_url=base_url.rstrip("/") + prefix,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._login_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AdvertisementClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Закрывает пул соединений.
+        """
+        await self._http.aclose()
+
+    async def _send(
+        self, method: str, path: str, *, auth: bool, **kwargs
+    ) -> httpx.Response:
+        headers = kwargs.pop("headers", {})
+        if auth:
+            if self.token is None:
+                await self.login()
+            headers["x-token"] = str(self.token)
+        async with self._semaphore:
+            return await self._http.request(method, path, headers=headers, **kwargs)
+
+    async def _request(
+        self, method: str, path: str, *, auth: bool = False, **kwargs
+    ) -> Any:
+        token = self.token
+        response = await self._send(method, path, auth=auth, **kwargs)
+        if response.status_code == 401 and auth and self.password is not None:
+            # Токен истёк: получаем новый (один раз на все ожидающие запросы)
+            await self.login(stale_token=token)
+            response = await self._send(method, path, auth=auth, **kwargs)
+        if response.is_error:
+            try:
+                detail = response.json().get("detail")
+            except ValueError:
+                detail = response.text
+            raise ApiError(response.status_code, detail)
+        return response.json()
+
+    # --- Аутентификация ---
+
+    async def login(
+        self,
+        name: Optional[str] = None,
+        password: Optional[str] = None,
+        *,
+        stale_token: Optional[uuid.UUID] = None,
+    ) -> uuid.UUID:
+        """
+        Получает токен через `/login` и сохраняет его для последующих запросов.
+
+        Args:
+            name (str | None): Имя пользователя (по умолчанию — из конструктора).
+            password (str | None): Пароль (по умолчанию — из конструктора).
+            stale_token (uuid.UUID | None): Токен, признанный недействительным.
+                Если другой запрос уже успел его заменить, повторный вход
+                не выполняется.
+
+        Returns:
+            uuid.UUID: Полученный токен.
+        """
+        if name is not None:
+            self.name, self.password = name, password
+        async with self._login_lock:
+            if self.token is not None and self.token != stale_token and name is None:
+                return self.token
+            data = await self._request(
+                "POST", "/login", json={"name": self.name, "password": self.password}
+            )
+            self.token = uuid.UUID(data["token"])
+            return self.token
+
+    # --- Пользователи ---
+
+    async def create_user(
+        self, name: str, password: str, role: Optional[str] = None
+    ) -> int:
+        """
+        Создаёт пользователя и возвращает его id.
+        """
+        data = await self._request(
+            "POST", "/user", json={"name": name, "password": password, "role": role}
+        )
+        return data["id"]
+
+    async def get_user(self, user_id: int) -> UserResponse:
+        """
+        Возвращает данные пользователя по id.
+        """
+        return UserResponse(**await self._request("GET", f"/user/{user_id}"))
+
+    async def update_user(
+        self,
+        user_id: int,
+        *,
+        name: Optional[str] = None,
+        password: Optional[str] = None,
+        role: Optional[str] = None,
+    ) -> int:
+        """
+        Обновляет переданные поля пользователя и возвращает его id.
+        """
+        data = await self._request(
+            "PATCH",
+            f"/user/{user_id}",
+            auth=True,
+            json={"name": name, "password": password, "role": role},
+        )
+        return data["id"]
+
+    async def delete_user(self, user_id: int) -> int:
+        """
+        Удаляет пользователя и возвращает его id.
+        """
+        data = await self._request("DELETE", f"/user/{user_id}", auth=True)
+        return data["id"]
+
+    # --- Объявления ---
+
+    async def create_advertisement(
+        self, title: str, description: str, price: int, owner: str
+    ) -> int:
+        """
+        Создаёт объявление и возвращает его id.
+        """
+        data = await self._request(
+            "POST",
+            "/advertisement",
+            auth=True,
+            json={
+                "title": title,
+                "description": description,
+                "price": price,
+                "owner": owner,
+            },
+        )
+        return data["id"]
+
+    async def get_advertisement(
+        self, advertisement_id: int, fields: Optional[Iterable[str]] = None
+    ) -> AdvertisementResponse:
+        """
+        Возвращает объявление по id (только поля `fields`, если указаны).
+        """
+        params = {"fields": ",".join(fields)} if fields else None
+        data = await self._request(
+            "GET", f"/advertisement/{advertisement_id}", auth=True, params=params
+        )
+        return AdvertisementResponse(**data)
+
+    async def update_advertisement(
+        self,
+        advertisement_id: int,
+        *,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+    ) -> int:
+        """
+        Обновляет заголовок и/или описание объявления и возвращает его id.
+        """
+        data = await self._request(
+            "PATCH",
+            f"/advertisement/{advertisement_id}",
+            auth=True,
+            json={"title": title, "description": description},
+        )
+        return data["id"]
+
+    async def delete_advertisement(self, advertisement_id: int) -> int:
+        """
+        Удаляет объявление и возвращает его id.
+        """
+        data = await self._request(
+            "DELETE", f"/advertisement/{advertisement_id}", auth=True
+        )
+        return data["id"]
+
+    # --- Поиск ---
+
+    async def search_advertisements(
+        self,
+        *,
+        fields: Optional[Iterable[str]] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        **filters: Any,
+    ) -> list[AdvertisementResponse]:
+        """
+        Выполняет одну страницу поиска объявлений.
+
+        Args:
+            fields (Iterable[str] | None): Возвращаемые поля.
+            after_id (int | None): Вернуть объявления с id больше указанного.
+            limit (int | None): Размер страницы.
+            **filters: Фильтры поиска (title, description, price, owner, date_posted).
+
+        Returns:
+            list[AdvertisementResponse]: Найденные объявления, упорядоченные по id.
+        """
+        params = {key: value for key, value in filters.items() if value is not None}
+        if fields:
+            params["fields"] = ",".join(fields)
+        if after_id is not None:
+            params["after_id"] = after_id
+        if limit is not None:
+            params["limit"] = limit
+        data = await self._request("GET", "/advertisement", params=params)
+        return [AdvertisementResponse(**adv) for adv in data["advs"]]
+
+    async def iter_advertisements(
+        self,
+        *,
+        fields: Optional[Iterable[str]] = None,
+        page_size: int = 1000,
+        **filters: Any,
+    ) -> AsyncIterator[AdvertisementResponse]:
+        """
+        Обходит все результаты поиска постранично (по ключу id).
+
+        Поле `id` запрашивается всегда — по нему строится следующая страница.
+        """
+        fields = list(fields) if fields else None
+        if fields and "id" not in fields:
+            fields.append("id")
+        after_id = None
+        while True:
+            page = await self.search_advertisements(
+                fields=fields, after_id=after_id, limit=page_size, **filters
+            )
+            for adv in page:
+                yield adv
+            if len(page) < page_size:
+                return
+            after_id = page[-1].id
+
+    # --- Пакетные операции ---
+
+    async def get_advertisements(
+        self, advertisement_ids: Iterable[int], fields: Optional[Iterable[str]] = None
+    ) -> list[AdvertisementResponse]:
+        """
+        Загружает несколько объявлений параллельно (в пределах `max_concurrency`).
+        """
+        fields = list(fields) if fields else None
+        return list(
+            await asyncio.gather(
+                *(
+                    self.get_advertisement(adv_id, fields)
+                    for adv_id in advertisement_ids
+                )
+            )
+        )
+
+    async def create_advertisements(self, items: Iterable[dict]) -> list[int]:
+        """
+        Создаёт несколько объявлений параллельно и возвращает их id.
+
+        Args:
+            items (Iterable[dict]): Словари с ключами title, description, price, owner.
+        """
+        return list(
+            await asyncio.gather(*(self.create_advertisement(**item) for item in items))
+        )
@@ -40,3 +40,20 @@ def check_password(password: str, password_hashed: str) -> bool:
 
     # Выполняем проверку пароля
     return bcrypt.checkpw(password, password_hashed)
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """
+    Хэширует список паролей (см. `hash_password`).
+
+    Выполняется в процессах пула при массовом создании пользователей
+    (`src.core.provisioning`), поэтому модуль не должен импортировать
+    ничего, кроме bcrypt: дочерние процессы импортируют его заново.
+
+    Args:
+        passwords (list[str]): Необработанные пароли.
+
+    Returns:
+        list[str]: Хэши паролей в том же порядке.
+    """
+    return [hash_password(password) for password in passwords]
@@ -0,0 +1,62 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Ограниченный по размеру кэш с вытеснением давно не используемых записей.
+
+    Args:
+        size (int): Максимальное количество записей.
+        ttl (float | None): Время жизни записи в секундах. None — без ограничения.
+    """
+
+    def __init__(self, size: int, ttl: Optional[float] = None) -> None:
+        self.size = size
+        self.ttl = ttl
+        # Ключ -> (момент устаревания по time.monotonic() или None, значение)
+        self._data: OrderedDict[Hashable, tuple[Optional[float], Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Возвращает значение по ключу или None, если записи нет или она устарела.
+        """
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at is not None and time.monotonic() > expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Сохраняет значение, вытесняя самую старую запись при переполнении.
+
+        Args:
+            key (Hashable): Ключ.
+            value (Any): Значение.
+            ttl (float | None): Время жизни этой записи в секундах
+                (по умолчанию — время жизни кэша).
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Удаляет запись (инвалидация), если она есть.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи.
+        """
+        self._data.clear()
@@ -1,6 +1,9 @@
 import os
+from functools import lru_cache
+from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
 
 
 class Settings(BaseSettings):
@@ -27,26 +30,271 @@ class Settings(BaseSettings):
     # Имя пользователя для подключения к базе данных. По умолчанию "app".
     DB_USER: str = os.getenv("POSTGRES_USER", "app")
 
+    # Полный URL подключения к БД. Если задан, параметры DB_* не используются.
+    # Например, `sqlite+aiosqlite:///bench.db` — локальная БД без внешних сервисов
+    # (только основные эндпоинты: без LISTEN/NOTIFY, секционирования и статистики).
+    DB_URL: str = ""
+
     # Время жизни токена в секундах (TTL). По умолчанию 2 дня (60 * 60 * 48).
     TOKEN_TLL_SEC: int = 60 * 60 * 48
 
+    # Включает сжатие ответов (gzip, br/zstd при наличии пакетов).
+    COMPRESSION_ENABLED: bool = True
+
+    # Минимальный размер тела ответа в байтах, начиная с которого оно сжимается.
+    COMPRESSION_MIN_SIZE: int = 1024
+
+    # Уровень сжатия (для gzip 1-9, для brotli ограничивается 11).
+    COMPRESSION_LEVEL: int = 6
+
+    # Размер порции в байтах, начиная с которого сжатие выполняется в потоке,
+    # а не в event loop.
+    COMPRESSION_OFFLOAD_SIZE: int = 256 * 1024
+
+    # Сколько раз повторять запрос при конфликте сериализации/взаимоблокировке.
+    TX_RETRY_ATTEMPTS: int = 3
+
+    # Базовая пауза между повторами в секундах (растёт экспоненциально).
+    TX_RETRY_BACKOFF_SEC: float = 0.02
+
+    # Включает поток событий `/advertisement/stream` (LISTEN/NOTIFY).
+    FEED_ENABLED: bool = True
+
+    # Размер очереди событий одного подписчика потока.
+    FEED_QUEUE_SIZE: int = 100
+
+    # Интервал отправки keep-alive комментариев в потоке событий, в секундах.
+    FEED_HEARTBEAT_SEC: float = 15.0
+
+    # Включает фоновый диспетчер transactional outbox.
+    OUTBOX_ENABLED: bool = True
+
+    # Сколько событий outbox захватывается и обрабатывается за раз.
+    OUTBOX_BATCH_SIZE: int = 100
+
+    # Время на обработку захваченной пачки outbox, в секундах: после него
+    # события необработанной (например, из-за падения воркера) пачки
+    # становятся доступны снова.
+    OUTBOX_LEASE_SEC: int = 60
+
+    # Пауза между опросами пустого outbox, в секундах.
+    OUTBOX_POLL_SEC: float = 1.0
+
+    # Максимальная отсрочка повторной обработки события после ошибки, в секундах.
+    OUTBOX_MAX_BACKOFF_SEC: int = 300
+
+    # Секционирует таблицу объявлений по месяцам `date_posted` (RANGE).
+    ADV_PARTITIONED: bool = False
+
+    # На сколько месяцев вперёд заранее создавать секции.
+    ADV_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Сколько месяцев хранить секции; более старые отсоединяются в архив.
+    # 0 — хранить все секции.
+    ADV_PARTITION_RETENTION_MONTHS: int = 0
+
+    # Интервал проверки секций фоновой задачей, в секундах.
+    ADV_PARTITION_CHECK_SEC: int = 60 * 60
+
+    # Окно поиска объявлений по умолчанию в днях (ограничивает `date_posted`,
+    # чтобы планировщик отсекал старые секции). 0 — без ограничения.
+    ADV_SEARCH_WINDOW_DAYS: int = 0
+
+    # Срок действия ключа идемпотентности (заголовок `Idempotency-Key`), в секундах.
+    IDEMPOTENCY_TTL_SEC: int = 60 * 60 * 24
+
+    # Через сколько секунд захват ключа без сохранённого ответа считается
+    # зависшим (воркер упал во время запроса) и ключ можно занять заново.
+    IDEMPOTENCY_CLAIM_TIMEOUT_SEC: int = 60
+
+    # Размер in-memory LRU сохранённых идемпотентных ответов.
+    IDEMPOTENCY_CACHE_SIZE: int = 10000
+
+    # Размер кэша учётных данных пользователей (имя -> id, хэш пароля, роль).
+    USER_CACHE_SIZE: int = 10000
+
+    # Время жизни записи кэша пользователей в секундах. Ограничивает
+    # устаревание данных в других воркерах после изменения пользователя.
+    USER_CACHE_TTL_SEC: float = 60.0
+
+    # Включает защиту от перегрузки (адаптивный лимит одновременных запросов).
+    OVERLOAD_ENABLED: bool = True
+
+    # Начальный, минимальный и максимальный лимит одновременных запросов на воркер.
+    OVERLOAD_INITIAL_LIMIT: int = 50
+    OVERLOAD_MIN_LIMIT: int = 5
+    OVERLOAD_MAX_LIMIT: int = 500
+
+    # Целевая задержка ответа в миллисекундах: более медленные ответы уменьшают лимит.
+    OVERLOAD_TARGET_LATENCY_MS: int = 250
+
+    # Целевая задержка для классов маршрутов в миллисекундах (по умолчанию —
+    # OVERLOAD_TARGET_LATENCY_MS). Для auth 0: вход и регистрация хэшируют пароль
+    # bcrypt дольше общей цели, и их задержка не должна снижать лимит.
+    # Для bulk 0: массовое создание пользователей длится секундами.
+    OVERLOAD_TARGET_LATENCY_AUTH_MS: int = 0
+    OVERLOAD_TARGET_LATENCY_BULK_MS: int = 0
+    OVERLOAD_TARGET_LATENCY_WRITE_MS: Optional[int] = None
+    OVERLOAD_TARGET_LATENCY_SEARCH_MS: Optional[int] = None
+    OVERLOAD_TARGET_LATENCY_GET_MS: Optional[int] = None
+
+    # Мест в очереди ожидания для каждого класса маршрутов.
+    OVERLOAD_QUEUE_AUTH: int = 50
+    OVERLOAD_QUEUE_WRITE: int = 100
+    OVERLOAD_QUEUE_SEARCH: int = 50
+    OVERLOAD_QUEUE_GET: int = 200
+    OVERLOAD_QUEUE_BULK: int = 10
+
+    # Максимальное ожидание в очереди в секундах, после которого возвращается 503.
+    OVERLOAD_QUEUE_TIMEOUT_SEC: float = 2.0
+
+    # Значение заголовка Retry-After в ответе 503, в секундах.
+    OVERLOAD_RETRY_AFTER_SEC: int = 1
+
+    # Таймауты SQL-запросов по классам маршрутов, в миллисекундах (0 — без таймаута).
+    # Для изменяющих запросов применяются через `SET LOCAL statement_timeout`,
+    # для читающих (без транзакции) — отменой запроса по истечении времени.
+    STATEMENT_TIMEOUT_AUTH_MS: int = 2000
+    STATEMENT_TIMEOUT_WRITE_MS: int = 5000
+    STATEMENT_TIMEOUT_SEARCH_MS: int = 3000
+    STATEMENT_TIMEOUT_GET_MS: int = 1000
+    STATEMENT_TIMEOUT_BULK_MS: int = 5000
+
+    # Включает фоновую очистку мягко удалённых пользователей и объявлений.
+    PURGE_ENABLED: bool = True
+
+    # Сколько строк удаляется за одну транзакцию очистки.
+    PURGE_BATCH_SIZE: int = 500
+
+    # Пауза между пачками очистки в секундах (снижает нагрузку на БД).
+    PURGE_BATCH_PAUSE_SEC: float = 0.1
+
+    # Интервал запуска очистки, в секундах.
+    PURGE_INTERVAL_SEC: int = 60
+
+    # Сколько строк выгрузки объявлений выбирается из серверного курсора за раз.
+    EXPORT_BATCH_SIZE: int = 5000
+
+    # Сколько id ниже watermark повторно просматривает инкрементальная выгрузка:
+    # строки, зафиксированные позже выгрузки с меньшим id, не теряются.
+    EXPORT_RESCAN_WINDOW: int = 1000
+
+    # Включает фоновое обновление статистики по объявлениям (`/stats`).
+    STATS_ENABLED: bool = True
+
+    # Интервал обновления статистики, в секундах.
+    STATS_REFRESH_SEC: int = 60
+
+    # Сколько форм SQL-запросов хранит реестр заранее построенных запросов.
+    QUERY_CACHE_SIZE: int = 512
+
+    # Максимальное количество пользователей в одном массовом запросе (`/user/bulk`).
+    BULK_USER_MAX_BATCH: int = 10000
+
+    # Количество процессов для хэширования паролей при массовом создании
+    # (на воркер). 0 — ядра CPU поровну между воркерами сервера.
+    BULK_HASH_WORKERS: int = 0
+
+    # Адрес и порт, на которых production-лаунчер принимает соединения.
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 80
+
+    # Количество воркеров. 0 — определить автоматически по числу ядер CPU.
+    SERVER_WORKERS: int = 0
+
+    # Время удержания keep-alive соединения без запросов, в секундах.
+    SERVER_KEEPALIVE_SEC: int = 15
+
+    # Размер очереди ожидающих соединений (listen backlog).
+    SERVER_BACKLOG: int = 2048
+
+    # Сколько секунд ждать завершения текущих запросов при остановке воркера.
+    SERVER_GRACEFUL_TIMEOUT_SEC: int = 30
+
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"),
         env_file_encoding="utf-8",
     )
 
+    def statement_timeout_ms(self, route_class: str) -> int:
+        """
+        Возвращает таймаут SQL-запросов для класса маршрута.
+
+        Args:
+            route_class (str): Класс маршрута: auth, write, search, get или bulk.
+
+        Returns:
+            int: Таймаут в миллисекундах (0 — без таймаута).
+        """
+        return getattr(self, f"STATEMENT_TIMEOUT_{route_class.upper()}_MS", 0)
+
+    def overload_target_latencies(self) -> dict[str, float]:
+        """
+        Возвращает целевые задержки классов маршрутов для `OverloadMiddleware`.
+
+        Returns:
+            dict[str, float]: Задержка в секундах по классу маршрута
+                (0 — задержка класса не учитывается).
+        """
+        targets = {}
+        for route_class in ("auth", "write", "search", "get", "bulk"):
+            value = getattr(self, f"OVERLOAD_TARGET_LATENCY_{route_class.upper()}_MS")
+            if value is None:
+                value = self.OVERLOAD_TARGET_LATENCY_MS
+            targets[route_class] = value / 1000
+        return targets
+
+    def is_postgres(self) -> bool:
+        """
+        Проверяет, что приложение работает с PostgreSQL.
+
+        Возможности, специфичные для Postgres (LISTEN/NOTIFY, секционирование,
+        материализованные представления, `statement_timeout`), на других
+        СУБД отключаются.
+        """
+        return make_url(self.det_db_url()).get_backend_name() == "postgresql"
+
     def det_db_url(self) -> str:
         """
-        Формирует строку подключения к PostgreSQL.
+        Формирует строку подключения к базе данных.
 
-        Использует данные из конфигурации для построения URL в формате:
+        Возвращает `DB_URL`, если он задан, иначе строит URL PostgreSQL в формате:
         postgresql+asyncpg://<user>:<password>@<host>:<port>/<dbname>
 
         Returns:
             str: Полная строка подключения к базе данных.
         """
+        if self.DB_URL:
+            return self.DB_URL
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
 
-# Глобальная экземпляр конфигурации, который используется в других частях приложения
-settings = Settings()
+def default_workers() -> int:
+    """
+    Определяет количество воркеров по числу доступных процессу ядер CPU.
+
+    Учитывает CPU affinity (например, ограничения контейнера через cpuset),
+    если платформа это поддерживает.
+
+    Returns:
+        int: Количество воркеров (не меньше 1).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return max(cpus, 1)
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Возвращает экземпляр конфигурации приложения.
+
+    Конфигурация создаётся при первом обращении, а не при импорте модуля,
+    и затем переиспользуется всеми частями приложения.
+
+    Returns:
+        Settings: Экземпляр конфигурации.
+    """
+    return Settings()
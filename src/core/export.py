@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import csv
+import datetime
+import io
+import json
+import sys
+from typing import AsyncIterator, Callable, Iterable, Optional, Sequence
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.engine import Row
+
+from src.core.config import get_settings
+from src.models.advertisements import ADV_FIELDS, AdvertisementORM
+from src.models.database import Session, close_orm, create_engine
+
+# Parquet — необязательная зависимость: без pyarrow формат недоступен.
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - зависит от окружения
+    pyarrow = None
+
+# Форматы выгрузки и их MIME-типы
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def available_formats() -> tuple[str, ...]:
+    """
+    Возвращает форматы выгрузки, доступные в текущем окружении.
+    """
+    if pyarrow is None:
+        return tuple(fmt for fmt in MEDIA_TYPES if fmt != "parquet")
+    return tuple(MEDIA_TYPES)
+
+
+def parquet_schema(fields: Sequence[str]) -> "pyarrow.Schema":
+    """
+    Возвращает схему Parquet для выгружаемых полей.
+
+    Схема задаётся явно, а не выводится из первой пачки: если в первой пачке
+    поле целиком NULL (например, описание), выведенный тип `null` не совпал бы
+    с типом следующих пачек и выгрузка оборвалась бы на середине.
+    """
+    types = {
+        "id": pyarrow.int64(),
+        "title": pyarrow.string(),
+        "description": pyarrow.string(),
+        "price": pyarrow.int64(),
+        "owner": pyarrow.string(),
+        "date_posted": pyarrow.timestamp("us"),
+    }
+    return pyarrow.schema([(field, types[field]) for field in fields])
+
+
+async def get_watermark() -> int:
+    """
+    Возвращает максимальный id объявления на момент начала выгрузки.
+
+    Выгрузка ограничивается этим id; следующая инкрементальная выгрузка
+    передаёт его в `after_id` (см. `rescan_from`).
+    """
+    async with Session() as session:
+        query = select(func.coalesce(func.max(AdvertisementORM.id), 0))
+        return await session.scalar(query)
+
+
+def rescan_from(after_id: int) -> int:
+    """
+    Возвращает нижнюю границу id инкрементальной выгрузки.
+
+    Id выдаются последовательностью до COMMIT, поэтому транзакция с меньшим
+    id может зафиксироваться позже выгрузки, получившей больший watermark.
+    Такие строки не теряются: выгрузка повторно просматривает
+    `EXPORT_RESCAN_WINDOW` id ниже `after_id`. Строки из этого окна могут
+    прийти повторно — получатель применяет выгрузку по id (upsert).
+    """
+    return max(0, after_id - get_settings().EXPORT_RESCAN_WINDOW)
+
+
+def export_query(
+    fields: Sequence[str],
+    watermark: int,
+    after_id: Optional[int] = None,
+    since: Optional[datetime.date] = None,
+) -> Select:
+    """
+    Формирует запрос выгрузки неудалённых объявлений в порядке id.
+
+    Args:
+        fields (Sequence[str]): Выгружаемые поля из `ADV_FIELDS`.
+        watermark (int): Верхняя граница id (включительно).
+        after_id (int | None): Выгружать объявления с id больше указанного.
+        since (date | None): Выгружать объявления, опубликованные с этой даты.
+
+    Returns:
+        Select: Запрос SQLAlchemy.
+    """
+    query = (
+        select(*(getattr(AdvertisementORM, field) for field in fields))
+        .where(AdvertisementORM.deleted_at.is_(None), AdvertisementORM.id <= watermark)
+        .order_by(AdvertisementORM.id)
+    )
+    if after_id is not None:
+        query = query.where(AdvertisementORM.id > after_id)
+    if since is not None:
+        query = query.where(AdvertisementORM.date_posted >= since)
+    return query
+
+
+async def stream_rows(query: Select, batch_size: int) -> AsyncIterator[Sequence[Row]]:
+    """
+    Выполняет запрос через серверный курсор и отдаёт строки пачками.
+
+    В памяти одновременно находится не больше `batch_size` строк,
+    независимо от размера таблицы.
+
+    Args:
+        query (Select): Запрос выгрузки.
+        batch_size (int): Количество строк, выбираемых из курсора за раз.
+
+    Yields:
+        Sequence[Row]: Очередная пачка строк.
+    """
+    async with Session() as session:
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield rows
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_writer(fields: Sequence[str]) -> Callable[[Iterable[Row]], bytes]:
+    def write(rows: Iterable[Row]) -> bytes:
+        lines = (
+            json.dumps({field: _jsonable(value) for field, value in zip(fields, row)})
+            for row in rows
+        )
+        return "".join(f"{line}\n" for line in lines).encode()
+
+    return write
+
+
+def _csv_writer(fields: Sequence[str]) -> Callable[[Iterable[Row]], bytes]:
+    header = True
+
+    def write(rows: Iterable[Row]) -> bytes:
+        nonlocal header
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(fields)
+            header = False
+        writer.writerows(rows)
+        return buffer.getvalue().encode()
+
+    return write
+
+
+class _ParquetSink(io.RawIOBase):
+    """
+    Файлоподобный приёмник для `ParquetWriter`: накапливает записанные
+    байты до очередного `drain`, не храня файл целиком.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+async def encode(
+    batches: AsyncIterator[Sequence[Row]], fields: Sequence[str], fmt: str
+) -> AsyncIterator[bytes]:
+    """
+    Кодирует пачки строк в выбранный формат.
+
+    Каждая пачка кодируется и отдаётся сразу: NDJSON и CSV — строками,
+    Parquet — отдельной группой строк (row group) в одном файле.
+
+    Args:
+        batches (AsyncIterator[Sequence[Row]]): Пачки строк (см. `stream_rows`).
+        fields (Sequence[str]): Имена выгружаемых полей.
+        fmt (str): Формат: ndjson, csv или parquet.
+
+    Yields:
+        bytes: Очередная порция выгрузки.
+    """
+    if fmt != "parquet":
+        write = _ndjson_writer(fields) if fmt == "ndjson" else _csv_writer(fields)
+        if fmt == "csv":
+            # Заголовок CSV отдаётся даже для пустой выгрузки
+            yield write(())
+        async for rows in batches:
+            yield write(rows)
+        return
+
+    schema = parquet_schema(fields)
+    sink = _ParquetSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    async for rows in batches:
+        table = pyarrow.Table.from_pylist(
+            [dict(zip(fields, row)) for row in rows], schema=schema
+        )
+        writer.write_table(table)
+        yield sink.drain()
+    # Пустая выгрузка — корректный файл Parquet без строк
+    writer.close()
+    yield sink.drain()
+
+
+async def export(
+    fmt: str,
+    fields: Sequence[str] = ADV_FIELDS,
+    watermark: Optional[int] = None,
+    after_id: Optional[int] = None,
+    since: Optional[datetime.date] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Потоковая выгрузка объявлений в формате `fmt`.
+
+    Args:
+        fmt (str): Формат: ndjson, csv или parquet.
+        fields (Sequence[str]): Выгружаемые поля.
+        watermark (int | None): Верхняя граница id (по умолчанию — текущий
+            максимальный id, см. `get_watermark`).
+        after_id (int | None): Watermark предыдущей выгрузки: выгружаются
+            объявления с большим id и окно повторного просмотра ниже него
+            (см. `rescan_from`).
+        since (date | None): Выгружать объявления, опубликованные с этой даты.
+
+    Yields:
+        bytes: Очередная порция выгрузки.
+    """
+    if watermark is None:
+        watermark = await get_watermark()
+    if after_id is not None:
+        after_id = rescan_from(after_id)
+    query = export_query(fields, watermark, after_id, since)
+    batches = stream_rows(query, get_settings().EXPORT_BATCH_SIZE)
+    async for chunk in encode(batches, fields, fmt):
+        yield chunk
+
+
+async def _cli(args: argparse.Namespace) -> None:
+    create_engine()
+    try:
+        watermark = await get_watermark()
+        since = args.since and datetime.date.fromisoformat(args.since)
+        output = open(args.output, "wb") if args.output else sys.stdout.buffer
+        try:
+            async for chunk in export(
+                args.format, args.fields, watermark, args.after_id, since
+            ):
+                output.write(chunk)
+        finally:
+            if args.output:
+                output.close()
+    finally:
+        await close_orm()
+    # Значение для --after-id следующей инкрементальной выгрузки
+    print(f"watermark: {watermark}", file=sys.stderr)
+
+
+def _fields(value: str) -> tuple[str, ...]:
+    # Неизвестное поле — ошибка: опечатка не должна молча убирать колонку
+    requested = value.split(",")
+    unknown = [field for field in requested if field not in ADV_FIELDS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown fields: {', '.join(unknown)} "
+            f"(allowed: {', '.join(ADV_FIELDS)})"
+        )
+    return tuple(field for field in ADV_FIELDS if field in requested)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    CLI выгрузки объявлений:
+
+        python -m src.core.export --format csv --output advs.csv
+        python -m src.core.export --format ndjson --after-id 1000 > delta.ndjson
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.core.export")
+    parser.add_argument("--format", choices=available_formats(), default="ndjson")
+    parser.add_argument("--output", help="Файл выгрузки (по умолчанию stdout).")
+    parser.add_argument(
+        "--fields",
+        type=_fields,
+        default=ADV_FIELDS,
+        help="Поля через запятую.",
+    )
+    parser.add_argument("--after-id", type=int, help="Watermark предыдущей выгрузки.")
+    parser.add_argument("--since", help="Дата публикации в формате YYYY-MM-DD.")
+    asyncio.run(_cli(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
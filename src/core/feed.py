@@ -0,0 +1,184 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.core.tasks import BackgroundTask
+from src.models.advertisements import AdvertisementORM
+from src.models.database import Session
+
+logger = logging.getLogger(__name__)
+
+# Канал Postgres LISTEN/NOTIFY для событий по объявлениям.
+CHANNEL = "advertisements"
+
+# Поля объявления в событии подписчика. Описание не передаётся.
+EVENT_FIELDS = ("id", "title", "price", "owner", "date_posted", "user_id")
+
+
+async def notify_advertisement(
+    session: AsyncSession, action: str, adv: AdvertisementORM
+) -> None:
+    """
+    Публикует событие об объявлении через `pg_notify`.
+
+    Уведомление отправляется в транзакции запроса, поэтому Postgres доставит
+    его слушателям только после успешного COMMIT (и не доставит при откате).
+    В payload только id и тип события: его размер не зависит от длины
+    заголовка и имени владельца и не может превысить лимит NOTIFY
+    (8000 байт), сорвав транзакцию записи. Поля объявления читает хаб.
+    Если поток событий выключен (`FEED_ENABLED`) или СУБД не Postgres
+    (например, SQLite для локальных замеров), ничего не делает.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        action (str): Тип события ("created" или "updated").
+        adv (AdvertisementORM): Объявление после изменения.
+    """
+    if not get_settings().FEED_ENABLED or session.bind.dialect.name != "postgresql":
+        return
+    payload = json.dumps({"id": adv.id, "action": action})
+    await session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+class Subscription:
+    """
+    Подписка на поток событий с фильтром.
+
+    Фильтры совпадают с параметрами поиска: подстрока (без учёта регистра)
+    для заголовка и владельца, точное совпадение для цены.
+
+    Args:
+        title (str | None): Подстрока заголовка.
+        owner (str | None): Подстрока имени владельца.
+        price (int | None): Цена.
+        queue_size (int): Размер очереди событий подписчика.
+    """
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        owner: Optional[str] = None,
+        price: Optional[int] = None,
+        queue_size: int = 100,
+    ) -> None:
+        self.title = title.lower() if title else None
+        self.owner = owner.lower() if owner else None
+        self.price = price
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(queue_size)
+
+    def matches(self, event: dict) -> bool:
+        if self.title and self.title not in str(event.get("title", "")).lower():
+            return False
+        if self.owner and self.owner not in str(event.get("owner", "")).lower():
+            return False
+        if self.price is not None and event.get("price") != self.price:
+            return False
+        return True
+
+    def push(self, event: dict) -> None:
+        # Медленный подписчик не должен тормозить остальных:
+        # при переполнении очереди отбрасываем самое старое событие
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+
+class AdvertisementHub(BackgroundTask):
+    """
+    Внутрипроцессный хаб событий по объявлениям.
+
+    Держит одно соединение asyncpg с `LISTEN advertisements` на воркер.
+    По каждому уведомлению (id и тип события) читает поля объявления одним
+    запросом — только если в воркере есть подписки — и раздаёт событие всем
+    подходящим подпискам. При обрыве соединения переподключается с паузой
+    `reconnect_delay`.
+    """
+
+    def __init__(self, reconnect_delay: float = 1.0) -> None:
+        super().__init__()
+        self.reconnect_delay = reconnect_delay
+        self.subscriptions: set[Subscription] = set()
+        self._deliveries: set[asyncio.Task] = set()
+
+    def subscribe(self, subscription: Subscription) -> Subscription:
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    def publish(self, event: dict) -> None:
+        """
+        Раздаёт событие всем подпискам, чей фильтр ему соответствует.
+        """
+        for subscription in self.subscriptions:
+            if subscription.matches(event):
+                subscription.push(event)
+
+    async def deliver(self, notification: dict) -> None:
+        """
+        Читает объявление из уведомления и публикует событие.
+
+        Удалённое к этому моменту объявление не публикуется.
+        """
+        query = select(
+            *(getattr(AdvertisementORM, field) for field in EVENT_FIELDS)
+        ).where(
+            AdvertisementORM.id == notification["id"],
+            AdvertisementORM.deleted_at.is_(None),
+        )
+        async with Session() as session:
+            row = (await session.execute(query)).first()
+        if row is None:
+            return
+        event = {field: value for field, value in zip(EVENT_FIELDS, row)}
+        event["date_posted"] = str(event["date_posted"])
+        event["action"] = notification["action"]
+        self.publish(event)
+
+    async def _deliver_logged(self, notification: dict) -> None:
+        try:
+            await self.deliver(notification)
+        except Exception:
+            logger.exception("Advertisement event delivery failed")
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        if not self.subscriptions:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._deliver_logged(json.loads(payload))
+        )
+        # Ссылка на задачу хранится до её завершения
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+    async def run(self) -> None:
+        url = make_url(get_settings().det_db_url()).set(drivername="postgresql")
+        dsn = url.render_as_string(hide_password=False)
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            try:
+                await connection.add_listener(CHANNEL, self._on_notify)
+                await closed.wait()
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                pass
+            finally:
+                await connection.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+
+# Хаб текущего воркера
+hub = AdvertisementHub()
@@ -0,0 +1,286 @@
+import asyncio
+import datetime
+import hashlib
+import uuid
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, or_, select, update
+
+from src.core.cache import LRUCache
+from src.core.config import get_settings
+from src.core.queries import get_registry, token_query
+from src.models.database import Session, insert
+from src.models.idempotency import IdempotencyKeyORM
+
+# Заголовок запроса с ключом идемпотентности
+HEADER = "idempotency-key"
+
+# Вызывающий без токена (например, регистрация `POST /user`)
+ANONYMOUS = "-"
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+def idempotent(endpoint: Callable) -> Callable:
+    """
+    Помечает эндпоинт как поддерживающий заголовок `Idempotency-Key`.
+
+    Обработку выполняет `TransactionalRoute` (см. `wrap_handler`);
+    сигнатура эндпоинта не меняется.
+    """
+    endpoint.__idempotent__ = True
+    return endpoint
+
+
+class StoredResponse:
+    """
+    Сохранённый ответ на идемпотентный запрос.
+
+    Args:
+        fingerprint (str): SHA-256 тела исходного запроса.
+        status_code (int): HTTP-код ответа.
+        body (bytes): Тело ответа (JSON).
+    """
+
+    def __init__(self, fingerprint: str, status_code: int, body: bytes) -> None:
+        self.fingerprint = fingerprint
+        self.status_code = status_code
+        self.body = body
+
+    def response(self) -> Response:
+        return Response(
+            self.body,
+            status_code=self.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+
+class IdempotencyStore:
+    """
+    In-memory часть хранилища ключей идемпотентности (на воркер).
+
+    - LRU сохранённых ответов: повторы обслуживаются без обращения к БД.
+      Запись живёт не дольше ключа (`IDEMPOTENCY_TTL_SEC` с первого запроса).
+    - Таблица выполняющихся запросов: одновременные повторы с тем же ключом
+      ждут завершения первого запроса, а не выполняются параллельно.
+    """
+
+    def __init__(self, size: int, ttl: float) -> None:
+        self.cache = LRUCache(size, ttl)
+        self.in_flight: dict[str, asyncio.Future] = {}
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        return self.cache.get(key)
+
+    def put(
+        self, key: str, stored: StoredResponse, ttl: Optional[float] = None
+    ) -> None:
+        self.cache.put(key, stored, ttl)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+@lru_cache
+def get_store() -> IdempotencyStore:
+    """
+    Возвращает хранилище ключей идемпотентности текущего воркера.
+
+    Создаётся при первом запросе, а не при импорте: настройки читаются
+    уже после конфигурации окружения.
+    """
+    settings = get_settings()
+    return IdempotencyStore(
+        settings.IDEMPOTENCY_CACHE_SIZE, settings.IDEMPOTENCY_TTL_SEC
+    )
+
+
+async def _caller(request: Request) -> Optional[str]:
+    """
+    Определяет вызывающего по заголовку `X-Token`.
+
+    Returns:
+        str | None: Id пользователя, `ANONYMOUS` без заголовка или None,
+            если токен недействителен (запрос выполняется без идемпотентности
+            и получает 401 от обработчика).
+    """
+    header = request.headers.get("x-token")
+    if not header:
+        return ANONYMOUS
+    try:
+        token = uuid.UUID(header)
+    except ValueError:
+        return None
+    min_created = datetime.datetime.now() - datetime.timedelta(
+        seconds=get_settings().TOKEN_TLL_SEC
+    )
+    async with Session() as session:
+        found = await session.scalar(
+            get_registry().get("token", token_query),
+            {"token": token, "min_created": min_created},
+        )
+        if found is None or found.user.deleted_at is not None:
+            return None
+        return str(found.user_id)
+
+
+async def _claim(key: str, fingerprint: str) -> Optional[IdempotencyKeyORM]:
+    """
+    Пытается занять ключ в БД.
+
+    Истёкшие ключи и "зависшие" захваты (без ответа дольше
+    `IDEMPOTENCY_CLAIM_TIMEOUT_SEC`, например после падения воркера между
+    захватом и сохранением ответа) удаляются и могут быть заняты заново.
+
+    Returns:
+        IdempotencyKeyORM | None: None, если ключ занят этим вызовом;
+            иначе существующая запись (выполняется или уже выполнена).
+    """
+    settings = get_settings()
+    # Время задаётся приложением и при записи, и при сравнении: часовой пояс
+    # сервера БД не влияет на срок действия ключа
+    now = datetime.datetime.now()
+    expired = now - datetime.timedelta(seconds=settings.IDEMPOTENCY_TTL_SEC)
+    stale = now - datetime.timedelta(seconds=settings.IDEMPOTENCY_CLAIM_TIMEOUT_SEC)
+    async with Session() as session, session.begin():
+        await session.execute(
+            delete(IdempotencyKeyORM).where(
+                IdempotencyKeyORM.key == key,
+                or_(
+                    IdempotencyKeyORM.created_at < expired,
+                    IdempotencyKeyORM.status_code.is_(None)
+                    & (IdempotencyKeyORM.created_at < stale),
+                ),
+            )
+        )
+        claimed = await session.scalar(
+            insert(IdempotencyKeyORM)
+            .values(key=key, fingerprint=fingerprint, created_at=now)
+            .on_conflict_do_nothing(index_elements=[IdempotencyKeyORM.key])
+            .returning(IdempotencyKeyORM.id)
+        )
+        if claimed is not None:
+            return None
+        return await session.scalar(
+            select(IdempotencyKeyORM).where(IdempotencyKeyORM.key == key)
+        )
+
+
+async def _complete(key: str, stored: Optional[StoredResponse]) -> None:
+    """
+    Сохраняет ответ для ключа или освобождает ключ, если ответ не сохраняется.
+    """
+    async with Session() as session, session.begin():
+        if stored is None:
+            query = delete(IdempotencyKeyORM).where(IdempotencyKeyORM.key == key)
+        else:
+            query = (
+                update(IdempotencyKeyORM)
+                .where(IdempotencyKeyORM.key == key)
+                .values(status_code=stored.status_code, body=stored.body)
+            )
+        await session.execute(query)
+
+
+def _conflict(detail: str, status_code: int) -> Response:
+    return JSONResponse({"detail": detail}, status_code=status_code)
+
+
+def wrap_handler(handler: Handler, scope: str) -> Handler:
+    """
+    Оборачивает обработчик маршрута поддержкой `Idempotency-Key`.
+
+    Повтор с тем же ключом и телом получает сохранённый успешный ответ
+    (заголовок `Idempotent-Replayed: true`) без повторного выполнения:
+    сначала из LRU воркера, затем из таблицы `idempotency_keys`.
+    Одновременные повторы в одном воркере ждут первый запрос; в другом
+    воркере получают 409, пока первый запрос не завершится.
+    Сохраняются только ответы 2xx; после ошибки ключ освобождается.
+
+    Ключ привязан к вызывающему (id пользователя по `X-Token`): одинаковые
+    ключ и тело от разных пользователей — разные запросы.
+
+    Args:
+        handler (Handler): Исходный обработчик (вместе с фиксацией транзакции).
+        scope (str): Область ключа — путь маршрута.
+
+    Returns:
+        Handler: Обработчик с поддержкой идемпотентности.
+    """
+
+    async def idempotent_handler(request: Request) -> Response:
+        header = request.headers.get(HEADER)
+        if not header:
+            return await handler(request)
+
+        caller = await _caller(request)
+        if caller is None:
+            return await handler(request)
+
+        key = f"{scope}:{caller}:{header}"
+        fingerprint = hashlib.sha256(await request.body()).hexdigest()
+        store = get_store()
+
+        while (future := store.in_flight.get(key)) is not None:
+            # Такой же запрос уже выполняется в этом воркере: ждём его результата
+            await asyncio.shield(future)
+
+        stored = store.get(key)
+        if stored is None:
+            store.in_flight[key] = asyncio.get_running_loop().create_future()
+            try:
+                result = await _execute(request, handler, key, fingerprint)
+            finally:
+                store.in_flight.pop(key).set_result(None)
+            if isinstance(result, Response):
+                return result
+            stored = result
+
+        if stored.fingerprint != fingerprint:
+            return _conflict("Idempotency-Key reused with a different request", 422)
+        return stored.response()
+
+    return idempotent_handler
+
+
+async def _execute(
+    request: Request, handler: Handler, key: str, fingerprint: str
+) -> StoredResponse | Response:
+    """
+    Выполняет запрос под ключом идемпотентности.
+
+    Returns:
+        StoredResponse | Response: Ранее сохранённый в БД ответ для повтора
+            или ответ, который нужно вернуть как есть (результат выполнения
+            либо конфликт ключа).
+    """
+    existing = await _claim(key, fingerprint)
+    if existing is not None:
+        if existing.status_code is None:
+            return _conflict("A request with this Idempotency-Key is in progress", 409)
+        stored = StoredResponse(
+            existing.fingerprint, existing.status_code, existing.body
+        )
+        # Срок действия ключа отсчитывается от первого запроса, а не от повтора
+        age = datetime.datetime.now() - existing.created_at
+        ttl = get_settings().IDEMPOTENCY_TTL_SEC - age.total_seconds()
+        if ttl > 0:
+            get_store().put(key, stored, ttl)
+        return stored
+
+    stored = None
+    try:
+        response = await handler(request)
+        body = getattr(response, "body", None)
+        if 200 <= response.status_code < 300 and body is not None:
+            stored = StoredResponse(fingerprint, response.status_code, bytes(body))
+    finally:
+        await _complete(key, stored)
+
+    if stored is not None:
+        get_store().put(key, stored)
+    return response
@@ -1,6 +1,8 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
+from src.core.config import get_settings
+from src.core.startup import phase
 from src.models.database import init_orm, close_orm
 
 
@@ -10,7 +12,10 @@ async def lifespan(app: FastAPI):
     Асинхронный контекст-менеджер жизненного цикла приложения FastAPI.
 
     Выполняет инициализацию базы данных при запуске приложения и
-    закрывает соединение с БД после завершения работы.
+    закрывает соединение с БД после завершения работы. Движок и пул
+    соединений создаются здесь, а не при импорте. Длительность каждой
+    фазы записывается в `src.core.startup.PHASES`. Модули фоновых задач
+    импортируются здесь же, чтобы не замедлять импорт `src.server`.
 
     Args:
         app (FastAPI): Экземпляр приложения FastAPI.
@@ -18,13 +23,54 @@ async def lifespan(app: FastAPI):
     Yields:
         None: Передаёт управление дальше для запуска приложения.
     """
+    from src.core.feed import hub
+    from src.core.outbox import dispatcher
+    from src.core.partitions import maintainer
+    from src.core.provisioning import shutdown_pool
+    from src.core.purge import purger
+    from src.core.stats import refresher
+
     print("START")
+    settings = get_settings()
+    # LISTEN/NOTIFY, секционирование и статистика доступны только в PostgreSQL
+    postgres = settings.is_postgres()
+
     # Инициализируем структуру базы данных (создаём таблицы при необходимости)
-    await init_orm()
+    with phase("lifespan: init_orm"):
+        await init_orm()
+
+    # Создаём секции таблицы объявлений и запускаем их обслуживание
+    if settings.ADV_PARTITIONED and postgres:
+        with phase("lifespan: partitions"):
+            await maintainer.start()
+
+    # Запускаем слушателя событий по объявлениям (один на воркер)
+    if settings.FEED_ENABLED and postgres:
+        await hub.start()
+
+    # Запускаем фоновую обработку transactional outbox
+    if settings.OUTBOX_ENABLED:
+        await dispatcher.start()
+
+    # Запускаем фоновую очистку мягко удалённых строк
+    if settings.PURGE_ENABLED:
+        await purger.start()
+
+    # Запускаем периодическое обновление статистики
+    if settings.STATS_ENABLED and postgres:
+        await refresher.start()
 
     # Передача управления основному приложению
     yield
 
+    await refresher.stop()
+    await purger.stop()
+    await dispatcher.stop()
+    await hub.stop()
+    await maintainer.stop()
+    shutdown_pool()
+
     # Завершение работы: закрываем соединение с базой данных
-    await close_orm()
+    with phase("lifespan: close_orm"):
+        await close_orm()
     print("FINISH")
@@ -0,0 +1,184 @@
+import datetime
+import logging
+from typing import Awaitable, Callable
+
+from sqlalchemy import ColumnElement, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.core.tasks import PeriodicTask
+from src.models.database import Session
+from src.models.outbox import OutboxORM
+
+logger = logging.getLogger(__name__)
+
+# Потребитель события outbox: получает словарь `OutboxORM.dict`.
+Consumer = Callable[[dict], Awaitable[None]]
+
+# Зарегистрированные потребители по темам событий.
+consumers: dict[str, list[Consumer]] = {}
+
+
+def register(topic: str) -> Callable[[Consumer], Consumer]:
+    """
+    Декоратор регистрации потребителя событий outbox.
+
+    Доставка выполняется "хотя бы один раз": при ошибке любого потребителя
+    событие будет обработано повторно всеми потребителями темы, поэтому
+    потребители должны быть идемпотентными.
+
+    Пример:
+        @outbox.register("advertisement")
+        async def invalidate_cache(event: dict) -> None:
+            ...
+
+    Args:
+        topic (str): Тема событий (см. `__outbox_topic__` модели).
+    """
+
+    def decorator(consumer: Consumer) -> Consumer:
+        consumers.setdefault(topic, []).append(consumer)
+        return consumer
+
+    return decorator
+
+
+def db_time(session: AsyncSession, seconds: float = 0) -> ColumnElement:
+    """
+    Возвращает SQL-выражение "время БД через `seconds` секунд".
+
+    `available_at` заполняется `server_default=now()`, поэтому сравнивается
+    и сдвигается только временем БД: часовые пояса приложения и БД
+    могут не совпадать.
+    """
+    if session.bind.dialect.name == "sqlite":
+        # Тот же формат и часовой пояс (UTC), что у CURRENT_TIMESTAMP
+        return func.datetime("now", f"{seconds:+f} seconds")
+    if not seconds:
+        return func.now()
+    return func.now() + datetime.timedelta(seconds=seconds)
+
+
+async def claim_batch(batch_size: int, lease: float) -> list[OutboxORM]:
+    """
+    Захватывает пачку готовых событий outbox.
+
+    Строки выбираются с `FOR UPDATE SKIP LOCKED`, поэтому несколько воркеров
+    разбирают outbox параллельно, не мешая друг другу. Захват — сдвиг
+    `available_at` на `lease` секунд — фиксируется сразу, и блокировки
+    снимаются до вызова потребителей. Если воркер не завершит обработку
+    (упадёт или будет остановлен), события станут доступны снова.
+
+    Args:
+        batch_size (int): Максимальное количество событий в пачке.
+        lease (float): Время на обработку захваченных событий, в секундах.
+
+    Returns:
+        list[OutboxORM]: Захваченные события.
+    """
+    async with Session() as session, session.begin():
+        query = (
+            select(OutboxORM)
+            .where(OutboxORM.available_at <= db_time(session))
+            .order_by(OutboxORM.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        events = (await session.scalars(query)).all()
+        if events:
+            await session.execute(
+                update(OutboxORM)
+                .where(OutboxORM.id.in_([event.id for event in events]))
+                .values(available_at=db_time(session, lease))
+            )
+    return list(events)
+
+
+async def finish_batch(
+    done: list[int], failed: list[OutboxORM], max_backoff: int
+) -> None:
+    """
+    Удаляет обработанные события и откладывает события с ошибкой.
+
+    Для событий с ошибкой увеличивается счётчик попыток и назначается
+    экспоненциальная отсрочка.
+    """
+    async with Session() as session, session.begin():
+        if done:
+            await session.execute(delete(OutboxORM).where(OutboxORM.id.in_(done)))
+        for event in failed:
+            attempts = event.attempts + 1
+            await session.execute(
+                update(OutboxORM)
+                .where(OutboxORM.id == event.id)
+                .values(
+                    attempts=attempts,
+                    available_at=db_time(session, min(2**attempts, max_backoff)),
+                )
+            )
+
+
+async def drain_batch(batch_size: int, max_backoff: int, lease: float = 60) -> int:
+    """
+    Обрабатывает одну пачку готовых событий outbox.
+
+    События захватываются короткой транзакцией (`claim_batch`), потребители
+    вызываются вне транзакции — медленный потребитель не держит блокировки
+    и соединение, — затем результат фиксируется второй короткой транзакцией
+    (`finish_batch`).
+
+    Args:
+        batch_size (int): Максимальное количество событий в пачке.
+        max_backoff (int): Максимальная отсрочка после ошибки, в секундах.
+        lease (float): Время на обработку пачки, в секундах.
+
+    Returns:
+        int: Количество выбранных событий (0 — outbox пуст).
+    """
+    events = await claim_batch(batch_size, lease)
+
+    done, failed = [], []
+    for event in events:
+        try:
+            for consumer in consumers.get(event.topic, ()):
+                await consumer(event.dict)
+        except Exception:
+            logger.exception("Outbox event %s failed", event.id)
+            failed.append(event)
+        else:
+            done.append(event.id)
+
+    if events:
+        await finish_batch(done, failed, max_backoff)
+    return len(events)
+
+
+class OutboxDispatcher(PeriodicTask):
+    """
+    Фоновый диспетчер transactional outbox.
+
+    Запускается из `lifespan`, разбирает outbox пачками, пока есть
+    готовые события, затем ждёт `OUTBOX_POLL_SEC` до следующего опроса.
+    Ошибка (например, временная недоступность БД) откладывает разбор
+    до следующего опроса; незавершённая при остановке пачка обрабатывается
+    повторно по истечении `OUTBOX_LEASE_SEC`.
+    """
+
+    name = "Outbox drain"
+    wait_first = False
+
+    def interval(self) -> float:
+        return get_settings().OUTBOX_POLL_SEC
+
+    async def tick(self) -> bool:
+        settings = get_settings()
+        count = await drain_batch(
+            settings.OUTBOX_BATCH_SIZE,
+            settings.OUTBOX_MAX_BACKOFF_SEC,
+            settings.OUTBOX_LEASE_SEC,
+        )
+        return count >= settings.OUTBOX_BATCH_SIZE
+
+
+# Диспетчер текущего воркера
+dispatcher = OutboxDispatcher()
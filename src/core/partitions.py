@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import datetime
+import logging
+from typing import Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.core.config import get_settings
+from src.core.tasks import PeriodicTask
+from src.models.advertisements import AdvertisementORM
+from src.models.database import close_orm, create_engine
+
+logger = logging.getLogger(__name__)
+
+# Имя секционированной таблицы объявлений
+TABLE = AdvertisementORM.__tablename__
+
+# Ключ advisory-блокировки: DDL секций выполняет только один воркер за раз.
+PARTITION_LOCK_KEY = 0x61647670
+
+
+def month_start(day: datetime.date, shift: int = 0) -> datetime.date:
+    """
+    Возвращает первое число месяца, сдвинутого на `shift` месяцев от `day`.
+    """
+    index = day.year * 12 + day.month - 1 + shift
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime.date) -> str:
+    """
+    Возвращает имя секции для месяца, например `advertisements_y2026m10`.
+    """
+    return f"{TABLE}_y{month.year}m{month.month:02d}"
+
+
+async def list_partitions(conn: AsyncConnection) -> list[tuple[str, datetime.date]]:
+    """
+    Возвращает секции таблицы объявлений.
+
+    Месяц секции определяется по её имени (см. `partition_name`).
+
+    Args:
+        conn (AsyncConnection): Соединение с БД.
+
+    Returns:
+        list[tuple[str, datetime.date]]: (имя секции, первое число месяца),
+            по возрастанию месяца.
+    """
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": TABLE},
+    )
+    partitions = []
+    for (name,) in result:
+        suffix = name[len(TABLE) + 1 :]
+        if len(suffix) == 8 and suffix[0] == "y" and suffix[5] == "m":
+            month = datetime.date(int(suffix[1:5]), int(suffix[6:8]), 1)
+            partitions.append((name, month))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, months_ahead: int, today: Optional[datetime.date] = None
+) -> list[str]:
+    """
+    Создаёт секции с текущего месяца на `months_ahead` месяцев вперёд.
+
+    Args:
+        conn (AsyncConnection): Соединение с БД (в транзакции).
+        months_ahead (int): Количество месяцев после текущего.
+        today (datetime.date | None): Текущая дата (для тестов и отчётов).
+
+    Returns:
+        list[str]: Имена созданных секций.
+    """
+    today = today or datetime.date.today()
+    existing = {name for name, _ in await list_partitions(conn)}
+    created = []
+    for shift in range(months_ahead + 1):
+        month = month_start(today, shift)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        await conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{month}') TO ('{month_start(month, 1)}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def archive_partitions(
+    conn: AsyncConnection, before: datetime.date, drop: bool = False
+) -> list[str]:
+    """
+    Отсоединяет (и при `drop=True` удаляет) секции старше месяца `before`.
+
+    Отсоединённая секция остаётся обычной таблицей с тем же именем — архивом,
+    который можно выгрузить или удалить позже. Удаление данных таким образом
+    — операция над метаданными, без построчного DELETE.
+
+    Args:
+        conn (AsyncConnection): Соединение с БД (в транзакции).
+        before (datetime.date): Секции месяцев раньше этой даты обрабатываются.
+        drop (bool): Удалить секции, а не только отсоединить.
+
+    Returns:
+        list[str]: Имена обработанных секций.
+    """
+    archived = []
+    for name, month in await list_partitions(conn):
+        if month >= month_start(before):
+            break
+        await conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        if drop:
+            await conn.execute(text(f"DROP TABLE {name}"))
+        archived.append(name)
+    return archived
+
+
+async def maintain(wait: bool = False) -> bool:
+    """
+    Создаёт будущие секции и применяет срок хранения из настроек.
+
+    DDL выполняется под транзакционной advisory-блокировкой: воркеры,
+    одновременно запущенные `src.launcher`, не выполняют CREATE/DETACH
+    параллельно. Блокировка снимается вместе с транзакцией.
+
+    Args:
+        wait (bool): Ждать блокировку (при старте воркера секции текущего
+            месяца нужны до первой вставки). Иначе, если обслуживание уже
+            выполняет другой воркер, ничего не делать.
+
+    Returns:
+        bool: True, если обслуживание выполнено этим вызовом.
+    """
+    settings = get_settings()
+    async with create_engine().begin() as conn:
+        if wait:
+            await conn.execute(select(func.pg_advisory_xact_lock(PARTITION_LOCK_KEY)))
+        else:
+            locked = await conn.scalar(
+                select(func.pg_try_advisory_xact_lock(PARTITION_LOCK_KEY))
+            )
+            if not locked:
+                return False
+        created = await ensure_partitions(conn, settings.ADV_PARTITION_MONTHS_AHEAD)
+        archived = []
+        if settings.ADV_PARTITION_RETENTION_MONTHS > 0:
+            before = month_start(
+                datetime.date.today(), -settings.ADV_PARTITION_RETENTION_MONTHS
+            )
+            archived = await archive_partitions(conn, before)
+    if created or archived:
+        logger.info("Partitions created: %s, archived: %s", created, archived)
+    return True
+
+
+class PartitionMaintainer(PeriodicTask):
+    """
+    Фоновая задача обслуживания секций таблицы объявлений.
+
+    Запускается из `lifespan`, если включено `ADV_PARTITIONED`: при старте
+    сразу создаёт недостающие секции (иначе вставка в текущий месяц упадёт),
+    затем проверяет их каждые `ADV_PARTITION_CHECK_SEC` секунд. Ошибка
+    обслуживания записывается в лог и не прерывает запуск воркера.
+    """
+
+    name = "Partition maintenance"
+
+    def interval(self) -> float:
+        return get_settings().ADV_PARTITION_CHECK_SEC
+
+    async def tick(self) -> None:
+        await maintain()
+
+    async def start(self) -> None:
+        """
+        Создаёт недостающие секции и запускает периодическую проверку.
+        """
+        if self._task is None:
+            try:
+                await maintain(wait=True)
+            except Exception:
+                logger.exception("%s failed", self.name)
+            await super().start()
+
+
+# Обслуживание секций текущего воркера
+maintainer = PartitionMaintainer()
+
+
+async def _cli(args: argparse.Namespace) -> None:
+    try:
+        async with create_engine().begin() as conn:
+            if args.command == "ensure":
+                names = await ensure_partitions(conn, args.months_ahead)
+            elif args.command == "archive":
+                before = datetime.datetime.strptime(args.before, "%Y-%m").date()
+                names = await archive_partitions(conn, before, drop=args.drop)
+            else:
+                names = [
+                    f"{name}  {month:%Y-%m}"
+                    for name, month in await list_partitions(conn)
+                ]
+    finally:
+        await close_orm()
+    print("\n".join(names) or "-")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    CLI обслуживания секций:
+
+        python -m src.core.partitions list
+        python -m src.core.partitions ensure --months-ahead 6
+        python -m src.core.partitions archive --before 2025-01 [--drop]
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.core.partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Показать секции.")
+    ensure = commands.add_parser("ensure", help="Создать будущие секции.")
+    ensure.add_argument(
+        "--months-ahead",
+        type=int,
+        default=get_settings().ADV_PARTITION_MONTHS_AHEAD,
+    )
+    archive = commands.add_parser(
+        "archive", help="Отсоединить секции старше месяца --before."
+    )
+    archive.add_argument("--before", required=True, help="Месяц в формате YYYY-MM.")
+    archive.add_argument("--drop", action="store_true", help="Удалить секции.")
+    asyncio.run(_cli(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import csv
+import json
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+from sqlalchemy import select
+
+from src.auth import auth
+from src.core.config import default_workers, get_settings
+from src.models.database import Session, close_orm, create_engine, insert
+from src.models.users import UserORM
+from src.schemas.users import CreateUserRequest
+
+# Сколько строк вставляется одним INSERT (3 параметра на строку; лимит
+# параметров одного запроса в asyncpg — 32767).
+INSERT_CHUNK_SIZE = 5000
+
+# Пул процессов для хэширования паролей. Создаётся при первом использовании.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+
+
+def pool_size() -> int:
+    """
+    Возвращает количество процессов пула хэширования в воркере сервера.
+
+    Пул создаётся в каждом воркере uvicorn, поэтому по умолчанию ядра CPU
+    делятся между воркерами (`SERVER_WORKERS`, его выставляет `src.launcher`):
+    всего процессов хэширования не больше, чем ядер.
+    """
+    settings = get_settings()
+    if settings.BULK_HASH_WORKERS:
+        return settings.BULK_HASH_WORKERS
+    workers = settings.SERVER_WORKERS or default_workers()
+    return max(1, default_workers() // workers)
+
+
+def get_pool(size: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Возвращает пул процессов для хэширования паролей.
+
+    Процессы запускаются методом spawn: fork процесса с работающим
+    event loop и потоками небезопасен.
+
+    Args:
+        size (int | None): Количество процессов при создании пула
+            (по умолчанию `pool_size()`).
+    """
+    global _pool, _pool_size
+    if _pool is None:
+        _pool_size = size or pool_size()
+        _pool = ProcessPoolExecutor(
+            _pool_size, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """
+    Останавливает пул процессов (вызывается из `lifespan`).
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def hash_passwords(passwords: Sequence[str]) -> list[str]:
+    """
+    Хэширует пароли параллельно в пуле процессов, не блокируя event loop.
+
+    Пароли делятся на порции по числу процессов пула.
+
+    Args:
+        passwords (Sequence[str]): Необработанные пароли.
+
+    Returns:
+        list[str]: Хэши паролей в том же порядке.
+    """
+    if not passwords:
+        return []
+    pool = get_pool()
+    step = -(-len(passwords) // _pool_size)
+    loop = asyncio.get_running_loop()
+    chunks = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                pool, auth.hash_passwords, list(passwords[i : i + step])
+            )
+            for i in range(0, len(passwords), step)
+        )
+    )
+    return [hashed for chunk in chunks for hashed in chunk]
+
+
+async def provision_users(users: Sequence[CreateUserRequest]) -> list[dict]:
+    """
+    Массово создаёт пользователей.
+
+    - Повторы имени внутри запроса получают статус "duplicate".
+    - Занятые имена определяются одним запросом до хэширования паролей
+      и получают статус "exists".
+    - Пароли остальных хэшируются параллельно (`hash_passwords`).
+    - Вставка выполняется многострочным `INSERT ... ON CONFLICT DO NOTHING
+      RETURNING`: имя, занятое параллельным запросом, не прерывает вставку,
+      а получает статус "exists".
+
+    Хэширование (минуты для больших пачек) выполняется вне транзакции:
+    проверка имён и вставка используют отдельные короткие сессии, поэтому
+    соединение из пула не простаивает в открытой транзакции.
+
+    Args:
+        users (Sequence[CreateUserRequest]): Создаваемые пользователи.
+
+    Returns:
+        list[dict]: Результаты `BulkUserResult` в порядке `users`.
+    """
+    results = [{"name": user.name, "status": "duplicate"} for user in users]
+
+    first = {}
+    for index, user in enumerate(users):
+        first.setdefault(user.name, index)
+
+    query = select(UserORM.name).where(
+        UserORM.name.in_(list(first)), UserORM.deleted_at.is_(None)
+    )
+    async with Session() as session:
+        existing = set(await session.scalars(query))
+    for name in existing:
+        results[first[name]]["status"] = "exists"
+
+    pending = [index for name, index in first.items() if name not in existing]
+    hashes = await hash_passwords([users[index].password for index in pending])
+
+    rows = [
+        {
+            "name": users[index].name,
+            "password": hashed,
+            "role": users[index].role or "user",
+        }
+        for index, hashed in zip(pending, hashes)
+    ]
+    created = {}
+    async with Session() as session, session.begin():
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            statement = (
+                insert(UserORM)
+                .values(rows[start : start + INSERT_CHUNK_SIZE])
+                .on_conflict_do_nothing(
+                    index_elements=[UserORM.name],
+                    index_where=UserORM.deleted_at.is_(None),
+                )
+                .returning(UserORM.id, UserORM.name)
+            )
+            created.update(
+                (name, user_id) for user_id, name in await session.execute(statement)
+            )
+
+    for index in pending:
+        result = results[index]
+        if result["name"] in created:
+            result["status"] = "created"
+            result["id"] = created[result["name"]]
+        else:
+            result["status"] = "exists"
+    return results
+
+
+def read_users(path: str) -> list[CreateUserRequest]:
+    """
+    Читает пользователей из CSV (колонки name, password и необязательная role)
+    или NDJSON (по объекту на строку).
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.endswith((".ndjson", ".jsonl")):
+            records = [json.loads(line) for line in file if line.strip()]
+        else:
+            records = list(csv.DictReader(file))
+    return [
+        CreateUserRequest(
+            name=record["name"],
+            password=record["password"],
+            role=record.get("role") or None,
+        )
+        for record in records
+    ]
+
+
+async def _cli(args: argparse.Namespace) -> None:
+    users = read_users(args.file)
+    create_engine()
+    # CLI — единственный процесс: хэширование использует все ядра
+    get_pool(get_settings().BULK_HASH_WORKERS or default_workers())
+    try:
+        results = await provision_users(users)
+    finally:
+        shutdown_pool()
+        await close_orm()
+    for result in results:
+        print(json.dumps(result))
+    statuses = [result["status"] for result in results]
+    summary = {status: statuses.count(status) for status in sorted(set(statuses))}
+    print(f"total: {len(results)}, {summary}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    CLI массового создания пользователей:
+
+        python -m src.core.provisioning users.csv > results.ndjson
+        python -m src.core.provisioning users.ndjson
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.core.provisioning")
+    parser.add_argument("file", help="CSV (name,password[,role]) или NDJSON.")
+    asyncio.run(_cli(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
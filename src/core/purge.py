@@ -0,0 +1,131 @@
+import asyncio
+import datetime
+import logging
+
+from sqlalchemy import ColumnElement, and_, delete, exists, or_, select
+
+from src.core.config import get_settings
+from src.core.tasks import PeriodicTask
+from src.models.advertisements import AdvertisementORM
+from src.models.database import Base, Session
+from src.models.idempotency import IdempotencyKeyORM
+from src.models.tokens import TokenORM
+from src.models.users import UserORM
+
+logger = logging.getLogger(__name__)
+
+
+def purge_steps() -> list[tuple[type[Base], ColumnElement[bool]]]:
+    """
+    Возвращает шаги очистки: (модель, условие удаления строки).
+
+    Порядок учитывает внешние ключи: сначала объявления и токены, затем
+    пользователи, у которых их больше не осталось. Последний шаг удаляет
+    истёкшие ключи идемпотентности (старше `IDEMPOTENCY_TTL_SEC`).
+    """
+    deleted_users = select(UserORM.id).where(UserORM.deleted_at.is_not(None))
+    # Время ключей задаётся приложением (см. `src.core.idempotency._claim`)
+    expired_keys = datetime.datetime.now() - datetime.timedelta(
+        seconds=get_settings().IDEMPOTENCY_TTL_SEC
+    )
+    return [
+        (
+            AdvertisementORM,
+            or_(
+                AdvertisementORM.deleted_at.is_not(None),
+                AdvertisementORM.user_id.in_(deleted_users),
+            ),
+        ),
+        (TokenORM, TokenORM.user_id.in_(deleted_users)),
+        (
+            UserORM,
+            and_(
+                UserORM.deleted_at.is_not(None),
+                ~exists().where(AdvertisementORM.user_id == UserORM.id),
+                ~exists().where(TokenORM.user_id == UserORM.id),
+            ),
+        ),
+        (IdempotencyKeyORM, IdempotencyKeyORM.created_at < expired_keys),
+    ]
+
+
+async def purge_batch(
+    orm_cls: type[Base], condition: ColumnElement[bool], batch_size: int
+) -> int:
+    """
+    Удаляет одну пачку строк в отдельной короткой транзакции.
+
+    Строки выбираются с `FOR UPDATE SKIP LOCKED`: строки, занятые запросами
+    или очисткой в другом воркере, пропускаются, а не ожидаются.
+
+    Args:
+        orm_cls (type[Base]): Класс модели ORM.
+        condition (ColumnElement[bool]): Условие удаления строки.
+        batch_size (int): Максимальное количество строк в пачке.
+
+    Returns:
+        int: Количество удалённых строк.
+    """
+    batch = (
+        select(orm_cls.id)
+        .where(condition)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    async with Session() as session, session.begin():
+        result = await session.execute(
+            delete(orm_cls)
+            .where(orm_cls.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+async def purge(batch_size: int, pause: float) -> dict[str, int]:
+    """
+    Удаляет все мягко удалённые строки пачками по `batch_size`
+    с паузой `pause` секунд между пачками.
+
+    Returns:
+        dict[str, int]: Количество удалённых строк по таблицам.
+    """
+    purged = {}
+    for orm_cls, condition in purge_steps():
+        total = 0
+        while True:
+            count = await purge_batch(orm_cls, condition, batch_size)
+            total += count
+            if count < batch_size:
+                break
+            await asyncio.sleep(pause)
+        purged[orm_cls.__tablename__] = total
+    return purged
+
+
+class Purger(PeriodicTask):
+    """
+    Фоновая очистка мягко удалённых пользователей и объявлений.
+
+    Запускается из `lifespan`, если включено `PURGE_ENABLED`, и каждые
+    `PURGE_INTERVAL_SEC` секунд удаляет строки с заполненным `deleted_at`,
+    а также токены и объявления удалённых пользователей и истёкшие ключи
+    идемпотентности (иначе таблица `idempotency_keys` растёт без ограничения,
+    а ключ удаляется, только когда приходит снова). Удаление идёт
+    пачками по `PURGE_BATCH_SIZE` строк, поэтому блокировки короткие даже
+    для больших аккаунтов.
+    """
+
+    name = "Purge"
+
+    def interval(self) -> float:
+        return get_settings().PURGE_INTERVAL_SEC
+
+    async def tick(self) -> None:
+        settings = get_settings()
+        purged = await purge(settings.PURGE_BATCH_SIZE, settings.PURGE_BATCH_PAUSE_SEC)
+        if any(purged.values()):
+            logger.info("Purged rows: %s", purged)
+
+
+# Очистка текущего воркера
+purger = Purger()
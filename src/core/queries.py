@@ -0,0 +1,155 @@
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Hashable
+
+from sqlalchemy import Date, Select, String, bindparam, cast, or_, select
+
+from src.core.cache import LRUCache
+from src.core.config import get_settings
+from src.models.advertisements import AdvertisementORM
+from src.models.tokens import TokenORM
+from src.models.users import UserORM
+
+
+class QueryRegistry:
+    """
+    Реестр заранее построенных параметризованных запросов.
+
+    Запрос строится один раз для каждой "формы" (набора условий и колонок)
+    и затем переиспользуется: значения передаются параметрами при выполнении.
+    Это экономит построение конструкций SQLAlchemy и вычисление ключа кэша
+    компиляции (он запоминается в объекте запроса), а одинаковый SQL
+    для одинаковой формы попадает в кэш подготовленных запросов asyncpg.
+
+    Счётчики `hits`/`misses` по имени запроса показывают эффективность кэша.
+
+    Args:
+        size (int): Максимальное количество форм запросов в кэше.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.cache = LRUCache(size)
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def get(self, name: str, build: Callable[..., Select], *shape: Hashable) -> Select:
+        """
+        Возвращает запрос `name` для формы `shape`, строя его при первом обращении.
+
+        Args:
+            name (str): Имя запроса (для счётчиков).
+            build (Callable[..., Select]): Строит запрос; получает `shape`.
+            *shape (Hashable): Параметры формы запроса.
+
+        Returns:
+            Select: Параметризованный запрос.
+        """
+        key = (name, *shape)
+        query = self.cache.get(key)
+        if query is None:
+            self.misses[name] += 1
+            query = build(*shape)
+            self.cache.put(key, query)
+        else:
+            self.hits[name] += 1
+        return query
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Возвращает счётчики попаданий и промахов по именам запросов.
+        """
+        return {
+            name: {"hits": self.hits[name], "misses": self.misses[name]}
+            for name in sorted(self.hits.keys() | self.misses.keys())
+        }
+
+
+@lru_cache
+def get_registry() -> QueryRegistry:
+    """
+    Возвращает реестр запросов текущего воркера.
+
+    Создаётся при первом запросе, а не при импорте: настройки читаются
+    уже после конфигурации окружения.
+    """
+    return QueryRegistry(get_settings().QUERY_CACHE_SIZE)
+
+
+def token_query() -> Select:
+    """
+    Поиск действующего токена. Параметры: `token`, `min_created`.
+    """
+    return select(TokenORM).where(
+        TokenORM.token == bindparam("token"),
+        TokenORM.creation_time >= bindparam("min_created"),
+    )
+
+
+def user_credentials_query() -> Select:
+    """
+    Учётные данные неудалённого пользователя. Параметр: `name`.
+    """
+    return select(UserORM.id, UserORM.password, UserORM.role).where(
+        UserORM.name == bindparam("name"), UserORM.deleted_at.is_(None)
+    )
+
+
+def user_id_query() -> Select:
+    """
+    Id неудалённого пользователя по имени. Параметр: `name`.
+    """
+    return select(UserORM.id).where(
+        UserORM.name == bindparam("name"), UserORM.deleted_at.is_(None)
+    )
+
+
+# Условия поиска объявлений; параметр условия называется так же, как фильтр.
+SEARCH_FILTERS = {
+    "title": AdvertisementORM.title.ilike(bindparam("title")),
+    "description": AdvertisementORM.description.ilike(bindparam("description")),
+    "price": AdvertisementORM.price == bindparam("price"),
+    "owner": AdvertisementORM.owner.ilike(bindparam("owner")),
+    "date": cast(AdvertisementORM.date_posted, Date) == bindparam("date"),
+    "date_text": AdvertisementORM.date_posted.cast(String).ilike(
+        bindparam("date_text")
+    ),
+}
+
+
+def search_query(
+    fields: tuple[str, ...],
+    filters: tuple[str, ...],
+    with_after_id: bool,
+    with_since: bool,
+) -> Select:
+    """
+    Поиск объявлений канонической формы.
+
+    Форма определяется запрошенными полями и набором фильтров (в порядке
+    `SEARCH_FILTERS`), поэтому одинаковые по составу поиски дают один и тот же
+    SQL. Параметры: значения фильтров, `limit`, а также `after_id`
+    и `since`, если они входят в форму.
+
+    Args:
+        fields (tuple[str, ...]): Выбираемые поля объявлений.
+        filters (tuple[str, ...]): Имена фильтров из `SEARCH_FILTERS`.
+        with_after_id (bool): Условие `id > :after_id`.
+        with_since (bool): Условие `date_posted >= :since`.
+
+    Returns:
+        Select: Параметризованный запрос.
+    """
+    query = (
+        select(*(getattr(AdvertisementORM, field) for field in fields))
+        .where(
+            or_(*(SEARCH_FILTERS[name] for name in filters)),
+            AdvertisementORM.deleted_at.is_(None),
+        )
+        .order_by(AdvertisementORM.id)
+        .limit(bindparam("limit"))
+    )
+    if with_after_id:
+        query = query.where(AdvertisementORM.id > bindparam("after_id"))
+    if with_since:
+        query = query.where(AdvertisementORM.date_posted >= bindparam("since"))
+    return query
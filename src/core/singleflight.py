@@ -0,0 +1,69 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых вызовов (single-flight).
+
+    Пока вызов с ключом `key` выполняется, остальные вызовы с тем же ключом
+    не запускают работу заново, а ждут и получают тот же результат (или ту же
+    ошибку). После завершения ключ освобождается — результат не кэшируется.
+
+    Общая работа выполняется в отдельной задаче: отмена одного из ожидающих
+    (например, клиент отключился) не прерывает её для остальных. Если же
+    отменены все ожидающие, общая задача тоже отменяется — брошенный запрос
+    не занимает соединение пула.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[Hashable, int] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполняет `func` или присоединяется к уже выполняющемуся вызову.
+
+        Args:
+            key (Hashable): Ключ вызова (маршрут и нормализованные параметры).
+            func (Callable[[], Awaitable[Any]]): Функция, выполняющая работу.
+                Не должна зависеть от ресурсов конкретного запроса (например,
+                его сессии БД).
+
+        Returns:
+            Any: Результат общего вызова.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done: self._release(key, done))
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(key) == 1 and not task.done():
+                # Последний ожидающий ушёл — результат больше никому не нужен.
+                # Ключ освобождается сразу, чтобы новые вызовы не попали
+                # на отменяемую задачу
+                task.cancel()
+                del self._calls[key]
+                del self._waiters[key]
+            raise
+        finally:
+            if key in self._waiters and self._calls.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            del self._waiters[key]
+        # Помечаем исключение полученным, даже если все ожидающие отменены
+        if not task.cancelled():
+            task.exception()
+
+
+# Объединение одинаковых чтений текущего воркера
+singleflight = SingleFlight()
@@ -0,0 +1,105 @@
+import importlib
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# Длительности фаз запуска текущего процесса в секундах, в порядке выполнения.
+# Заполняется `phase()` — в том числе из `lifespan`.
+PHASES: dict[str, float] = {}
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Контекст-менеджер для замера длительности фазы запуска.
+
+    Args:
+        name (str): Имя фазы в отчёте.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASES[name] = time.perf_counter() - started
+
+
+# Код, импорты которого замеряются: роутеры и модели импортируются
+# внутри фабрики приложения, поэтому одного `import src.server` недостаточно.
+STARTUP_CODE = "from src.server import create_app; create_app()"
+
+
+def import_times(
+    code: str = STARTUP_CODE, limit: int = 20
+) -> list[tuple[int, int, str]]:
+    """
+    Собирает время импорта модулей в стиле `python -X importtime`.
+
+    Код выполняется в отдельном интерпретаторе, чтобы уже загруженные
+    в текущем процессе модули не искажали результат.
+
+    Args:
+        code (str): Выполняемый код (по умолчанию — создание приложения).
+        limit (int): Сколько самых тяжёлых модулей вернуть.
+
+    Returns:
+        list[tuple[int, int, str]]: (собственное время, суммарное время, модуль),
+            время в микросекундах, по убыванию суммарного времени.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # Строка-заголовок: "self [us] | cumulative | imported package"
+            continue
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows[:limit]
+
+
+async def collect_report(limit: int = 20, with_lifespan: bool = False) -> str:
+    """
+    Формирует отчёт о времени запуска приложения.
+
+    Включает разбивку по модулям времени импорта при создании приложения
+    (`src.server` и импортируемые фабрикой роутеры и модели), а также
+    длительности фаз в текущем процессе: импорт и создание приложения фабрикой.
+
+    Фазы `lifespan` замеряются только с `with_lifespan=True`: `init_orm`
+    пересоздаёт таблицы, поэтому запускать его можно только на временной БД.
+
+    Args:
+        limit (int): Сколько модулей показать в разбивке импорта.
+        with_lifespan (bool): Выполнить и замерить startup/shutdown `lifespan`.
+
+    Returns:
+        str: Текст отчёта.
+    """
+    lines = [
+        f"Import time (top {limit}, us):",
+        f"{'self':>10} {'cumulative':>12}  module",
+    ]
+    for self_us, cumulative_us, name in import_times(limit=limit):
+        lines.append(f"{self_us:>10} {cumulative_us:>12}  {name}")
+
+    PHASES.clear()
+    with phase("import src.server"):
+        server = importlib.import_module("src.server")
+    with phase("create_app (routers, models)"):
+        app = server.create_app()
+    if with_lifespan:
+        async with app.router.lifespan_context(app):
+            pass
+
+    lines.append("")
+    lines.append("Startup phases (ms):")
+    for name, seconds in PHASES.items():
+        lines.append(f"{seconds * 1000:>10.1f}  {name}")
+    return "\n".join(lines)
@@ -0,0 +1,58 @@
+from sqlalchemy import func, select, text
+
+from src.core.config import get_settings
+from src.core.tasks import PeriodicTask
+from src.models.database import create_engine
+from src.models.stats import VIEWS
+
+# Ключ advisory-блокировки: обновление выполняет только один воркер за раз.
+REFRESH_LOCK_KEY = 0x61647673
+
+
+async def refresh_views() -> bool:
+    """
+    Обновляет материализованные представления статистики.
+
+    Используется `REFRESH MATERIALIZED VIEW CONCURRENTLY`: чтение статистики
+    не блокируется на время обновления. Если обновление уже выполняет
+    другой воркер (advisory-блокировка занята), ничего не делает.
+
+    Returns:
+        bool: True, если представления были обновлены.
+    """
+    async with create_engine().connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        locked = await conn.scalar(select(func.pg_try_advisory_lock(REFRESH_LOCK_KEY)))
+        if not locked:
+            return False
+        try:
+            for name in VIEWS:
+                await conn.execute(
+                    text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}")
+                )
+        finally:
+            await conn.scalar(select(func.pg_advisory_unlock(REFRESH_LOCK_KEY)))
+    return True
+
+
+class StatsRefresher(PeriodicTask):
+    """
+    Фоновое обновление статистики по объявлениям.
+
+    Запускается из `lifespan`, если включено `STATS_ENABLED`, и обновляет
+    материализованные представления каждые `STATS_REFRESH_SEC` секунд.
+    Эндпоинт статистики читает готовые агрегаты, поэтому время ответа
+    не зависит от размера таблицы объявлений.
+    """
+
+    name = "Stats refresh"
+
+    def interval(self) -> float:
+        return get_settings().STATS_REFRESH_SEC
+
+    async def tick(self) -> None:
+        await refresh_views()
+
+
+# Обновление статистики текущего воркера
+refresher = StatsRefresher()
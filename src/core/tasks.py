@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTask:
+    """
+    Фоновая задача воркера с запуском и остановкой из `lifespan`.
+
+    Подклассы реализуют `run()`; задача создаётся в `start()` и отменяется
+    в `stop()`. Повторный `start()` ничего не делает.
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self) -> None:
+        raise NotImplementedError
+
+    async def start(self) -> None:
+        """
+        Запускает фоновую задачу.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Останавливает фоновую задачу и дожидается её завершения.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class PeriodicTask(BackgroundTask):
+    """
+    Фоновая задача, вызывающая `tick()` каждые `interval()` секунд.
+
+    Ошибки `tick()` логируются и не останавливают задачу. Если `tick()`
+    вернул True (работа осталась), следующий вызов выполняется без паузы.
+    При `wait_first = True` первый вызов выполняется после паузы.
+    """
+
+    # Имя задачи в логах
+    name = "Periodic task"
+
+    # Ждать интервал перед первым вызовом `tick()`
+    wait_first = True
+
+    def interval(self) -> float:
+        raise NotImplementedError
+
+    async def tick(self) -> Optional[bool]:
+        raise NotImplementedError
+
+    async def run(self) -> None:
+        if self.wait_first:
+            await asyncio.sleep(self.interval())
+        while True:
+            try:
+                busy = await self.tick()
+            except Exception:
+                logger.exception("%s failed", self.name)
+                busy = False
+            if not busy:
+                await asyncio.sleep(self.interval())
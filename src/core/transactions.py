@@ -0,0 +1,138 @@
+import asyncio
+import random
+from contextlib import suppress
+from typing import Awaitable, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from sqlalchemy.exc import DBAPIError
+
+from src.core import idempotency
+from src.core.config import get_settings
+
+# SQLSTATE ошибок, после которых транзакцию можно безопасно повторить:
+# 40001 — serialization_failure, 40P01 — deadlock_detected.
+RETRYABLE_SQLSTATES = frozenset({"40001", "40P01"})
+
+# SQLSTATE отмены запроса: 57014 — query_canceled (в т.ч. statement_timeout).
+TIMEOUT_SQLSTATE = "57014"
+
+# Код ответа для запроса, клиент которого отключился (нестандартный, как в nginx).
+CLIENT_CLOSED_REQUEST = 499
+
+
+def _sqlstate(exc: DBAPIError) -> str | None:
+    orig = exc.orig
+    # Адаптер asyncpg хранит исходное исключение драйвера в __cause__
+    return getattr(orig, "sqlstate", None) or getattr(orig.__cause__, "sqlstate", None)
+
+
+def is_serialization_failure(exc: BaseException) -> bool:
+    """
+    Проверяет, вызвана ли ошибка конфликтом сериализации или взаимоблокировкой.
+
+    Args:
+        exc (BaseException): Исключение, возникшее при работе с БД.
+
+    Returns:
+        bool: True, если транзакцию можно повторить.
+    """
+    if not isinstance(exc, DBAPIError):
+        return False
+    return _sqlstate(exc) in RETRYABLE_SQLSTATES
+
+
+async def _wait_disconnect(request: Request) -> None:
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def run_until_disconnect(
+    handler: Callable[[Request], Awaitable[Response]], request: Request
+) -> Response:
+    """
+    Выполняет обработчик, отменяя его при отключении клиента.
+
+    Отмена прерывает текущий SQL-запрос (asyncpg отправляет серверу cancel),
+    сессия закрывается и соединение сразу возвращается в пул, вместо того
+    чтобы дорабатывать результат, который уже некому отдать.
+
+    Args:
+        handler (Callable): Обработчик маршрута.
+        request (Request): Текущий HTTP-запрос.
+
+    Returns:
+        Response: Ответ обработчика или пустой ответ 499, если клиент отключился.
+            Отмена обработчика по другой причине (например, остановка воркера)
+            не превращается в 499 и передаётся дальше.
+    """
+    # Тело читается заранее: дальше receive() используется для ожидания отключения
+    await request.body()
+
+    task = asyncio.ensure_future(handler(request))
+    watcher = asyncio.ensure_future(_wait_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    disconnected = (
+        watcher.done() and not watcher.cancelled() and watcher.exception() is None
+    )
+    if disconnected and task.cancelled():
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    return task.result()
+
+
+def _timeout_response() -> Response:
+    return JSONResponse({"detail": "Statement timeout"}, status_code=504)
+
+
+class TransactionalRoute(APIRoute):
+    """
+    Класс маршрута, повторяющий обработку запроса при конфликте сериализации.
+
+    Каждая попытка заново решает зависимости, поэтому получает новую сессию
+    и новую транзакцию (см. `get_session`). Тело запроса кэшируется в объекте
+    `Request` и повторно не читается.
+
+    Обработчик отменяется при отключении клиента (`run_until_disconnect`),
+    а превышение таймаута SQL-запроса возвращает 504.
+
+    Для эндпоинтов, помеченных `@idempotent`, обработчик дополнительно
+    оборачивается поддержкой заголовка `Idempotency-Key`.
+    """
+
+    def get_route_handler(
+        self,
+    ) -> Callable[[Request], Coroutine[None, None, Response]]:
+        original_handler = super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            settings = get_settings()
+            attempt = 0
+            while True:
+                try:
+                    return await run_until_disconnect(original_handler, request)
+                except TimeoutError:
+                    return _timeout_response()
+                except DBAPIError as exc:
+                    if _sqlstate(exc) == TIMEOUT_SQLSTATE:
+                        return _timeout_response()
+                    attempt += 1
+                    if (
+                        not is_serialization_failure(exc)
+                        or attempt >= settings.TX_RETRY_ATTEMPTS
+                    ):
+                        raise
+                    # Экспоненциальная пауза со случайным разбросом
+                    delay = settings.TX_RETRY_BACKOFF_SEC * 2 ** (attempt - 1)
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+        if getattr(self.endpoint, "__idempotent__", False):
+            return idempotency.wrap_handler(handler, self.path)
+        return handler
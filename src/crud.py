@@ -1,23 +1,181 @@
+import datetime
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence
+
 from fastapi import HTTPException
+from sqlalchemy import event, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as SyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
+from src.core.cache import LRUCache
+from src.core.config import get_settings
 from src.core.db_config import ORM_CLS, ORM_OBJ
+from src.core.queries import get_registry, user_credentials_query, user_id_query
+from src.models.custom_type import ROLE
+from src.models.outbox import OutboxORM
+
+
+class UserCredentials(NamedTuple):
+    """
+    Данные пользователя, необходимые для аутентификации.
+    """
+
+    id: int
+    password: str
+    role: ROLE
+
+
+# Ключ `Session.info` с именами пользователей, которых нужно удалить из кэша
+# после фиксации транзакции (см. `forget_user`).
+FORGET_USERS_KEY = "forget_users"
+
+# Номер поколения кэша учётных данных: увеличивается при каждой инвалидации.
+# Чтение, начатое до инвалидации, не кладёт в кэш прочитанные (устаревшие) данные.
+_user_cache_generation = 0
+
+
+@lru_cache
+def get_user_cache() -> LRUCache:
+    """
+    Возвращает кэш учётных данных: имя пользователя -> UserCredentials.
+
+    Создаётся при первом обращении, а не при импорте. Инвалидируется после
+    фиксации изменения или удаления пользователя (`forget_user`).
+    """
+    settings = get_settings()
+    return LRUCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SEC)
+
+
+async def get_user_credentials(
+    session: AsyncSession, name: str
+) -> Optional[UserCredentials]:
+    """
+    Получает id, хэш пароля и роль пользователя по имени.
+
+    Выбирает только нужные колонки (без загрузки связанных токенов
+    и объявлений) заранее построенным запросом и кэширует результат.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        name (str): Имя пользователя.
+
+    Returns:
+        UserCredentials | None: Данные пользователя или None, если его нет.
+    """
+    cache = get_user_cache()
+    credentials = cache.get(name)
+    if credentials is not None:
+        return credentials
+
+    generation = _user_cache_generation
+    query = get_registry().get("user_credentials", user_credentials_query)
+    row = (await session.execute(query, {"name": name})).first()
+    if row is None:
+        return None
+
+    credentials = UserCredentials(*row)
+    # Пока шёл запрос, пользователь мог быть изменён: тогда строка могла
+    # быть прочитана до фиксации изменения и в кэш не попадает
+    if generation == _user_cache_generation:
+        cache.put(name, credentials)
+    return credentials
+
+
+async def user_name_exists(session: AsyncSession, name: str) -> bool:
+    """
+    Проверяет, занято ли имя пользователя.
+
+    Используется перед хэшированием пароля, чтобы не тратить время
+    на bcrypt для заведомо конфликтующего запроса.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        name (str): Имя пользователя.
+
+    Returns:
+        bool: True, если пользователь с таким именем существует.
+    """
+    if get_user_cache().get(name) is not None:
+        return True
+    query = get_registry().get("user_id", user_id_query)
+    return await session.scalar(query, {"name": name}) is not None
+
+
+def forget_user(session: AsyncSession, *names: str):
+    """
+    Удаляет пользователей из кэша учётных данных после фиксации транзакции.
+
+    До COMMIT параллельный вход ещё читает прежнюю строку и мог бы снова
+    положить её в кэш, поэтому кэш сбрасывается в `after_commit`
+    (`_forget_committed_users`). При откате кэш не меняется.
+
+    Args:
+        session (AsyncSession): Сессия транзакции, изменяющей пользователей.
+        *names (str): Имена пользователей (прежнее и новое при переименовании).
+    """
+    session.info.setdefault(FORGET_USERS_KEY, set()).update(names)
+
+
+def _invalidate_users(names) -> None:
+    global _user_cache_generation
+    _user_cache_generation += 1
+    cache = get_user_cache()
+    for name in names:
+        cache.pop(name)
+
+
+@event.listens_for(SyncSession, "after_commit")
+def _forget_committed_users(session: SyncSession) -> None:
+    names = session.info.pop(FORGET_USERS_KEY, None)
+    if names:
+        _invalidate_users(names)
+
+
+@event.listens_for(SyncSession, "after_rollback")
+def _keep_rolled_back_users(session: SyncSession) -> None:
+    session.info.pop(FORGET_USERS_KEY, None)
+
+
+def write_outbox(session: AsyncSession, action: str, item: ORM_OBJ):
+    """
+    Добавляет событие об изменении объекта в транзакционный outbox.
+
+    Событие пишется только для моделей с атрибутом `__outbox_topic__`
+    и фиксируется в той же транзакции, что и само изменение.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        action (str): Действие: "created", "updated" или "deleted".
+        item (ORM_OBJ): Изменённый объект модели ORM (id уже присвоен).
+    """
+    topic = getattr(item, "__outbox_topic__", None)
+    if topic is None:
+        return
+    payload = item.id_dict if action == "deleted" else item.dict
+    session.add(OutboxORM(topic=topic, action=action, payload=payload))
 
 
 async def get_item_by_id(
-    session: AsyncSession, orm_cls: ORM_CLS, item_id: int
+    session: AsyncSession,
+    orm_cls: ORM_CLS,
+    item_id: int,
+    options: Sequence[ORMOption] = (),
 ) -> ORM_OBJ:
     """
     Получает объект из базы данных по его ID.
 
     Использует асинхронную сессию SQLAlchemy для получения записи.
+    Мягко удалённые объекты (с заполненным `deleted_at`) считаются отсутствующими.
     Если объект не найден, вызывается исключение `HTTPException 404`.
 
     Args:
         session (AsyncSession): Асинхронная сессия SQLAlchemy.
         orm_cls (ORM_CLS): Класс модели ORM (например, UserORM).
         item_id (int): Идентификатор объекта.
+        options (Sequence[ORMOption]): Опции загрузки (например, `load_only`),
+            чтобы не выбирать из БД ненужные колонки и связи.
 
     Returns:
         ORM_OBJ: Найденный объект модели.
@@ -25,7 +183,11 @@ async def get_item_by_id(
     Raises:
         HTTPException 404: Если объект с указанным ID не существует.
     """
-    orm_obj = await session.get(orm_cls, item_id)
+    query = select(orm_cls).where(orm_cls.id == item_id).options(*options)
+    if hasattr(orm_cls, "deleted_at"):
+        query = query.where(orm_cls.deleted_at.is_(None))
+    # unique() обязателен для моделей с коллекциями, загружаемыми через JOIN
+    orm_obj = (await session.scalars(query)).unique().first()
     if orm_obj is None:
         raise HTTPException(404, "Item not found")
     return orm_obj
@@ -35,9 +197,10 @@ async def add_item(session: AsyncSession, item: ORM_OBJ):
     """
     Добавляет новый объект в базу данных.
 
-    Выполняет операцию `add` и `commit`. Если возникает конфликт уникальности
-    (например, попытка создать пользователя с уже существующим именем),
-    выбрасывается исключение `HTTPException 409`.
+    Выполняет операцию `add` и `flush`: изменения отправляются в БД в рамках
+    транзакции запроса, а фиксируются один раз в конце запроса (см. `get_session`).
+    Если возникает конфликт уникальности (например, попытка создать пользователя
+    с уже существующим именем), выбрасывается исключение `HTTPException 409`.
 
     Args:
         session (AsyncSession): Асинхронная сессия SQLAlchemy.
@@ -48,22 +211,88 @@ async def add_item(session: AsyncSession, item: ORM_OBJ):
     """
     session.add(item)
     try:
-        await session.commit()
+        await session.flush()
     except IntegrityError:
         # Откат транзакции, чтобы не оставлять частично выполненные изменения
         await session.rollback()
         raise HTTPException(409, "Item already exists")
+    write_outbox(session, "created", item)
 
 
 async def delete_item(session: AsyncSession, item: ORM_OBJ):
     """
     Удаляет объект из базы данных.
 
-    Выполняет удаление объекта и фиксирует транзакцию.
+    Выполняет удаление объекта в транзакции запроса (фиксируется в `get_session`).
+    Модели с колонкой `deleted_at` удаляются мягко: обновляется одна строка,
+    без каскада по связанным объектам, а сами строки позже удаляет фоновая
+    очистка (`src.core.purge`).
 
     Args:
         session (AsyncSession): Асинхронная сессия SQLAlchemy.
         item (ORM_OBJ): Объект модели ORM для удаления.
     """
-    await session.delete(item)
-    await session.commit()
+    write_outbox(session, "deleted", item)
+    if hasattr(type(item), "deleted_at"):
+        item.deleted_at = datetime.datetime.now()
+        await session.flush([item])
+    else:
+        await session.delete(item)
+        await session.flush()
+
+
+async def delete_user_items(
+    session: AsyncSession, orm_cls: ORM_CLS, user_id: int
+) -> list[int]:
+    """
+    Мягко удаляет все объекты пользователя (например, его объявления).
+
+    Выполняет один UPDATE без загрузки объектов и пишет событие "deleted"
+    в outbox для каждого удалённого объекта в той же транзакции.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        orm_cls (ORM_CLS): Класс модели ORM с колонками `user_id` и `deleted_at`.
+        user_id (int): Идентификатор пользователя.
+
+    Returns:
+        list[int]: Идентификаторы удалённых объектов.
+    """
+    result = await session.execute(
+        update(orm_cls)
+        .where(orm_cls.user_id == user_id, orm_cls.deleted_at.is_(None))
+        .values(deleted_at=datetime.datetime.now())
+        .returning(orm_cls.id)
+        .execution_options(synchronize_session=False)
+    )
+    item_ids = list(result.scalars())
+    topic = getattr(orm_cls, "__outbox_topic__", None)
+    if topic is not None:
+        session.add_all(
+            OutboxORM(topic=topic, action="deleted", payload={"id": item_id})
+            for item_id in item_ids
+        )
+    return item_ids
+
+
+async def update_item(session: AsyncSession, item: ORM_OBJ):
+    """
+    Сохраняет изменения существующего объекта.
+
+    Отправляет изменённые поля в БД в транзакции запроса (фиксируется
+    в `get_session`). Если изменение нарушает уникальность (например,
+    переименование пользователя в занятое имя), выбрасывается `HTTPException 409`.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        item (ORM_OBJ): Изменённый объект модели ORM.
+
+    Raises:
+        HTTPException 409: Если запись с такими данными уже существует.
+    """
+    try:
+        await session.flush([item])
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(409, "Item already exists")
+    write_outbox(session, "updated", item)
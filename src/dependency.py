@@ -1,29 +1,59 @@
 import datetime
 import uuid
-from email.header import Header
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import Depends, HTTPException
-from sqlalchemy import select
+from fastapi import Depends, Header, HTTPException, Query, Request
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.config import settings
-from src.models.database import Session
+from src.core.config import get_settings
+from src.core.queries import get_registry, token_query
+from src.middleware.overload import classify
+from src.models.advertisements import ADV_FIELDS
+from src.models.database import Session, read_only_session
 from src.models.tokens import TokenORM
 
 
-async def get_session() -> AsyncSession:
+# HTTP-методы, которые не изменяют данные и выполняются без транзакции.
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def get_session(request: Request) -> AsyncSession:
     """
-    Асинхронная зависимость для получения сессии SQLAlchemy.
+    Асинхронная зависимость для получения сессии SQLAlchemy (unit of work).
+
+    Одна сессия и одна транзакция на запрос:
+    - для читающих запросов (GET/HEAD/OPTIONS) соединение переводится в режим
+      AUTOCOMMIT — без лишних BEGIN/COMMIT на каждый запрос;
+    - для изменяющих запросов все операции `crud` выполняются в одной
+      транзакции, которая фиксируется один раз после успешного обработчика.
+      При исключении транзакция откатывается при закрытии сессии.
 
-    Использует контекстный менеджер `Session` из базы данных,
-    чтобы открыть новую сессию и передать её в запрос.
+    Таймаут SQL-запросов берётся из настроек для класса маршрута
+    (`Settings.statement_timeout_ms`): в транзакции — `SET LOCAL statement_timeout`,
+    для чтения — отмена запроса на стороне клиента (см. `read_only_session`).
+
+    Повтор при конфликтах сериализации выполняет `TransactionalRoute`.
+
+    Args:
+        request (Request): Текущий HTTP-запрос.
 
     Yields:
         AsyncSession: Активная асинхронная сессия SQLAlchemy.
     """
+    timeout_ms = get_settings().statement_timeout_ms(classify(request.scope))
+
+    if request.method in READ_ONLY_METHODS:
+        async with read_only_session(timeout_ms / 1000 or None) as session:
+            yield session
+        return
+
     async with Session() as session:
+        if timeout_ms and session.bind.dialect.name == "postgresql":
+            # SET LOCAL действует до конца транзакции и не "протекает" в пул
+            await session.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
         yield session
+        await session.commit()
 
 
 # Автоматически предоставляет сессию БД при вызове соответствующего маршрута.
@@ -39,6 +69,8 @@ async def get_token(
     Выполняет проверку:
     - Существует ли токен в базе данных.
     - Не истёк ли срок его действия (TTL).
+    - Не удалён ли его владелец (токены удалённого пользователя ещё
+      не удалены фоновой очисткой, но уже недействительны).
 
     Args:
         x_token (uuid.UUID): Токен, переданный в заголовке запроса.
@@ -50,20 +82,17 @@ async def get_token(
     Raises:
         HTTPException 401: Если токен не найден или истёк.
     """
-    # Формируем SQL-запрос: ищем токен по значению и проверяем, не истёк ли срок жизни
-    query = select(TokenORM).where(
-        TokenORM.token == x_token,
-        TokenORM.creation_time
-        >= (
-            datetime.datetime.now() - datetime.timedelta(seconds=settings.TOKEN_TLL_SEC)
-        ),
+    # Заранее построенный запрос: ищем токен по значению и проверяем срок жизни
+    query = get_registry().get("token", token_query)
+    min_created = datetime.datetime.now() - datetime.timedelta(
+        seconds=get_settings().TOKEN_TLL_SEC
     )
 
     # Выполняем запрос и получаем результат
-    token = await session.scalar(query)
+    token = await session.scalar(query, {"token": x_token, "min_created": min_created})
 
-    # Если токен не найден — ошибка авторизации
-    if token is None:
+    # Если токен не найден или пользователь удалён — ошибка авторизации
+    if token is None or token.user.deleted_at is not None:
         raise HTTPException(status_code=401, detail="Token not found")
 
     return token
@@ -71,3 +100,37 @@ async def get_token(
 
 # Автоматически проверяет наличие и валидность токена.
 TokenDependency = Annotated[TokenORM, Depends(get_token)]
+
+
+def get_adv_fields(fields: Optional[str] = Query(None)) -> tuple[str, ...]:
+    """
+    Зависимость для разбора параметра `fields` (sparse fieldsets).
+
+    Принимает список полей через запятую, например `fields=title,price,date_posted`.
+    Если параметр не передан, возвращаются все поля объявления.
+
+    Args:
+        fields (str | None): Список запрошенных полей через запятую.
+
+    Returns:
+        tuple[str, ...]: Запрошенные поля в каноническом порядке `ADV_FIELDS`.
+
+    Raises:
+        HTTPException 400: Если запрошено неизвестное поле.
+    """
+    requested = {field.strip() for field in (fields or "").split(",") if field.strip()}
+    if not requested:
+        return ADV_FIELDS
+
+    unknown = requested - set(ADV_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+
+    # Канонический порядок: одинаковые наборы полей дают одинаковые запросы
+    return tuple(field for field in ADV_FIELDS if field in requested)
+
+
+# Автоматически разбирает параметр `fields` для эндпоинтов объявлений.
+FieldsDependency = Annotated[tuple[str, ...], Depends(get_adv_fields)]
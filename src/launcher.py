@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import importlib.util
+import os
+
+import uvicorn
+
+from src.core.config import default_workers, get_settings
+
+# Путь к фабрике приложения для uvicorn (строкой — чтобы каждый воркер создавал
+# приложение сам)
+APP_PATH = "src.server:create_app"
+
+
+def pick_loop() -> str:
+    """
+    Возвращает реализацию event loop: uvloop, если установлен, иначе asyncio.
+    """
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def pick_http() -> str:
+    """
+    Возвращает HTTP-парсер: httptools, если установлен, иначе h11.
+    """
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Создаёт парсер аргументов командной строки.
+
+    Значения по умолчанию берутся из `Settings`, аргументы их переопределяют.
+    """
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="python -m src.launcher",
+        description="Production-запуск Advertisement API в несколько воркеров.",
+    )
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SERVER_WORKERS,
+        help="Количество воркеров (0 — по числу ядер CPU).",
+    )
+    parser.add_argument("--keepalive", type=int, default=settings.SERVER_KEEPALIVE_SEC)
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT_SEC
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Вывести время импорта и фаз запуска приложения и завершиться.",
+    )
+    parser.add_argument(
+        "--startup-report-lifespan",
+        action="store_true",
+        help=(
+            "Добавить в отчёт фазы lifespan. Пересоздаёт таблицы (init_orm): "
+            "только для временной БД."
+        ),
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Запускает uvicorn с настройками для production.
+
+    - Число воркеров по умолчанию равно числу ядер CPU.
+    - uvloop и httptools включаются, если установлены.
+    - При остановке воркер перестаёт принимать соединения, ждёт завершения
+      текущих запросов (не дольше `--graceful-timeout`) и выполняет
+      shutdown-фазу `lifespan`, которая закрывает пул соединений с БД.
+    - С флагом `--startup-report` печатает отчёт о времени запуска
+      (фазы `lifespan` — только с `--startup-report-lifespan` на временной БД).
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.startup_report:
+        from src.core.startup import collect_report
+
+        print(asyncio.run(collect_report(with_lifespan=args.startup_report_lifespan)))
+        return
+
+    # Число воркеров наследуется ими через окружение: по нему делятся ресурсы
+    # на воркер (например, пул хэширования паролей `src.core.provisioning`)
+    workers = args.workers or default_workers()
+    os.environ["SERVER_WORKERS"] = str(workers)
+
+    uvicorn.run(
+        APP_PATH,
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=pick_loop(),
+        http=pick_http(),
+        timeout_keep_alive=args.keepalive,
+        backlog=args.backlog,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import zlib
+from typing import Callable
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Brotli и zstd — необязательные зависимости: если пакет не установлен,
+# соответствующая кодировка просто не предлагается клиенту.
+try:
+    import brotli
+except ImportError:  # pragma: no cover - зависит от окружения
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - зависит от окружения
+    zstandard = None
+
+
+class _Compressor:
+    """
+    Единый интерфейс потокового компрессора для всех поддерживаемых кодировок.
+
+    Args:
+        compress (Callable[[bytes], bytes]): Сжимает очередную порцию данных.
+        flush (Callable[[], bytes]): Завершает поток и возвращает остаток.
+    """
+
+    def __init__(
+        self, compress: Callable[[bytes], bytes], flush: Callable[[], bytes]
+    ) -> None:
+        self.compress = compress
+        self.flush = flush
+
+
+def _gzip(level: int) -> _Compressor:
+    # wbits=31 — формат gzip (заголовок + CRC), а не "сырой" deflate
+    obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return _Compressor(obj.compress, obj.flush)
+
+
+def _brotli(level: int) -> _Compressor:
+    obj = brotli.Compressor(quality=min(level, 11))
+    return _Compressor(obj.process, obj.finish)
+
+
+def _zstd(level: int) -> _Compressor:
+    obj = zstandard.ZstdCompressor(level=level).compressobj()
+    return _Compressor(obj.compress, obj.flush)
+
+
+# Доступные кодировки в порядке предпочтения сервера (при равных q клиента).
+ENCODINGS: dict[str, Callable[[int], _Compressor]] = {}
+if zstandard is not None:
+    ENCODINGS["zstd"] = _zstd
+if brotli is not None:
+    ENCODINGS["br"] = _brotli
+ENCODINGS["gzip"] = _gzip
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """
+    Выбирает кодировку ответа по заголовку `Accept-Encoding`.
+
+    Учитывает q-значения клиента; при равных весах предпочтение отдаётся
+    порядку `ENCODINGS` (zstd, br, gzip).
+
+    Args:
+        accept_encoding (str): Значение заголовка `Accept-Encoding`.
+
+    Returns:
+        str | None: Имя кодировки или None, если подходящей нет.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for name in ENCODINGS:
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI-middleware для сжатия ответов (gzip, а также br/zstd при наличии пакетов).
+
+    - Сжимает только ответы не меньше `minimum_size` байт.
+    - Крупные тела (от `offload_size` байт) сжимаются в отдельном потоке,
+      чтобы не блокировать event loop.
+    - Поддерживает потоковые (chunked) ответы: каждая порция сжимается
+      по мере поступления, `Content-Length` при этом снимается.
+    - Не трогает ответы, у которых уже есть `Content-Encoding`, и типы
+      из `excluded_types` (например, `text/event-stream` и уже сжатый Parquet).
+
+    Args:
+        app (ASGIApp): Оборачиваемое ASGI-приложение.
+        minimum_size (int): Минимальный размер тела для сжатия.
+        level (int): Уровень сжатия.
+        offload_size (int): Размер порции, начиная с которого сжатие
+            выполняется вне event loop.
+        excluded_types (tuple[str, ...]): Префиксы Content-Type без сжатия.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        level: int = 6,
+        offload_size: int = 256 * 1024,
+        excluded_types: tuple[str, ...] = (
+            "text/event-stream",
+            "application/vnd.apache.parquet",
+        ),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.offload_size = offload_size
+        self.excluded_types = excluded_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    """
+    Обёртка над `send`, которая сжимает тело ответа на лету.
+    """
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Message | None = None
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def _run(self, func: Callable[..., bytes], *args) -> bytes:
+        # Маленькие порции дешевле сжать прямо в loop, чем переключать поток
+        size = len(args[0]) if args else 0
+        if size >= self.middleware.offload_size:
+            return await anyio.to_thread.run_sync(func, *args)
+        return func(*args)
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = "content-encoding" in headers or content_type.startswith(
+                self.middleware.excluded_types
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                # Откладываем заголовки до первой порции тела
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # Тело целиком и слишком маленькое — сжатие не окупается
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            self.compressor = ENCODINGS[self.encoding](self.middleware.level)
+
+            if not more_body:
+                compressed = await self._run(self._compress_all, body)
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Потоковый ответ: итоговая длина неизвестна
+            del headers["Content-Length"]
+            await self.send(start)
+
+        chunk = await self._run(self.compressor.compress, body) if body else b""
+        if not more_body:
+            chunk += self.compressor.flush()
+        if chunk or not more_body:
+            await self.send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+
+    def _compress_all(self, body: bytes) -> bytes:
+        return self.compressor.compress(body) + self.compressor.flush()
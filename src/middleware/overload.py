@@ -0,0 +1,230 @@
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# HTTP-методы, которые не изменяют данные
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Классы маршрутов с отдельными бюджетами очереди
+ROUTE_CLASSES = ("auth", "write", "search", "get", "bulk")
+
+
+def classify(scope: Scope) -> str:
+    """
+    Определяет класс маршрута запроса: auth, write, search, get или bulk.
+
+    К auth относятся вход и регистрация (`POST /user`): оба хэшируют пароль
+    bcrypt, их задержка определяется стоимостью хэша, а не нагрузкой.
+    Массовое создание пользователей (`POST /user/bulk`) длится секундами
+    и выделено в класс bulk, чтобы не расходовать бюджет обычных записей.
+
+    Args:
+        scope (Scope): ASGI scope запроса.
+
+    Returns:
+        str: Класс маршрута.
+    """
+    path = scope["path"].rstrip("/")
+    if path.endswith("/login"):
+        return "auth"
+    if scope["method"] == "POST" and path.endswith("/user"):
+        return "auth"
+    if scope["method"] == "POST" and path.endswith("/user/bulk"):
+        return "bulk"
+    if scope["method"] not in READ_METHODS:
+        return "write"
+    if path.endswith("/advertisement"):
+        return "search"
+    return "get"
+
+
+class AIMDLimiter:
+    """
+    Адаптивный лимит одновременных запросов (AIMD).
+
+    - Additive increase: каждый быстрый ответ увеличивает лимит на 1/лимит
+      (примерно +1 за "окно" из лимита запросов).
+    - Multiplicative decrease: ответ медленнее `target_latency` или с кодом 5xx
+      уменьшает лимит в `backoff` раз, но не чаще раза за `target_latency`,
+      чтобы одна волна медленных ответов не обрушила лимит до минимума.
+
+    Args:
+        initial (int): Начальный лимит.
+        min_limit (int): Минимальный лимит.
+        max_limit (int): Максимальный лимит.
+        target_latency (float): Целевая задержка ответа в секундах.
+        backoff (float): Множитель уменьшения лимита.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency: float,
+        backoff: float = 0.9,
+    ) -> None:
+        self.value = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self._last_decrease = 0.0
+
+    @property
+    def limit(self) -> int:
+        return int(self.value)
+
+    def on_sample(
+        self, latency: float, failed: bool, target_latency: Optional[float] = None
+    ) -> None:
+        """
+        Учитывает результат завершённого запроса.
+
+        Args:
+            latency (float): Длительность запроса в секундах.
+            failed (bool): Ответ с ошибкой сервера (5xx).
+            target_latency (float | None): Целевая задержка для класса
+                маршрута запроса (по умолчанию — `self.target_latency`).
+        """
+        if target_latency is None:
+            target_latency = self.target_latency
+        now = time.monotonic()
+        if failed or latency > target_latency:
+            if now - self._last_decrease >= self.target_latency:
+                self.value = max(self.min_limit, self.value * self.backoff)
+                self._last_decrease = now
+        else:
+            self.value = min(self.max_limit, self.value + 1 / self.value)
+
+
+class OverloadMiddleware:
+    """
+    ASGI-middleware защиты от перегрузки (на воркер).
+
+    Ограничивает число одновременно обрабатываемых запросов адаптивным
+    лимитом (`AIMDLimiter`). Запросы сверх лимита ждут в общей FIFO-очереди;
+    у каждого класса маршрутов (auth, write, search, get, bulk) свой бюджет мест
+    в очереди. Если бюджет исчерпан или ожидание дольше `queue_timeout`,
+    запрос сразу получает 503 с заголовком `Retry-After` — вместо того чтобы
+    копиться в пуле соединений с БД до таймаута.
+
+    Задержка ответа сравнивается с целевой задержкой класса маршрута
+    (`target_latencies`, по умолчанию — общая цель лимитера). Класс с целью 0
+    не влияет на лимит своей задержкой, только ошибками 5xx: так медленные
+    по природе запросы (bcrypt в auth, массовое создание в bulk) не снижают лимит для остальных.
+
+    Args:
+        app (ASGIApp): Оборачиваемое ASGI-приложение.
+        limiter (AIMDLimiter): Адаптивный лимит одновременных запросов.
+        queue_budgets (dict[str, int]): Мест в очереди для каждого класса.
+        target_latencies (dict[str, float] | None): Целевая задержка
+            в секундах для классов маршрутов (0 — задержка не учитывается).
+        queue_timeout (float): Максимальное ожидание в очереди, в секундах.
+        retry_after (int): Значение заголовка `Retry-After`, в секундах.
+        excluded_paths (tuple[str, ...]): Окончания путей без ограничения
+            (долгоживущие потоки вроде `/advertisement/stream` и выгрузки).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: AIMDLimiter,
+        queue_budgets: dict[str, int],
+        target_latencies: Optional[dict[str, float]] = None,
+        queue_timeout: float = 2.0,
+        retry_after: int = 1,
+        excluded_paths: tuple[str, ...] = (
+            "/advertisement/stream",
+            "/advertisement/export",
+        ),
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.queue_budgets = queue_budgets
+        self.target_latencies = target_latencies or {}
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.excluded_paths = excluded_paths
+        self.in_flight = 0
+        self.queued = dict.fromkeys(ROUTE_CLASSES, 0)
+        self.waiters: deque[asyncio.Future] = deque()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].endswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope)
+        if not await self._acquire(route_class):
+            response = JSONResponse(
+                {"detail": "Service overloaded"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._sample(route_class, time.monotonic() - started, status_code >= 500)
+            self._release()
+
+    def _sample(self, route_class: str, latency: float, failed: bool) -> None:
+        target = self.target_latencies.get(route_class)
+        if target == 0:
+            # Задержка класса не учитывается — только ошибки сервера
+            if failed:
+                self.limiter.on_sample(latency, failed)
+            return
+        self.limiter.on_sample(latency, failed, target)
+
+    async def _acquire(self, route_class: str) -> bool:
+        if self.in_flight < self.limiter.limit and not self.waiters:
+            self.in_flight += 1
+            return True
+
+        if self.queued[route_class] >= self.queue_budgets.get(route_class, 0):
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.queued[route_class] += 1
+        acquired = False
+        try:
+            # Место передаётся ожидающему в `_release` (in_flight уже увеличен)
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            acquired = True
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.queued[route_class] -= 1
+            if waiter.done() and not waiter.cancelled():
+                if not acquired:
+                    # Место передано, но запрос отменён — возвращаем его
+                    self._release()
+            elif waiter in self.waiters:
+                self.waiters.remove(waiter)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        while self.waiters and self.in_flight < self.limiter.limit:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
@@ -1,14 +1,38 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.core.config import get_settings
 from src.models.database import Base
 
 if TYPE_CHECKING:
     from src.models.users import UserORM
 
 
+# Поля объявления, которые клиент может запросить через параметр `fields`.
+# Порядок совпадает с порядком полей в ответе `GetAdvResponse`.
+ADV_FIELDS = ("id", "title", "description", "price", "owner", "date_posted")
+
+# Условие частичных индексов: индексируются только неудалённые объявления.
+# Частичные индексы поддерживают и PostgreSQL, и SQLite.
+LIVE = {
+    "postgresql_where": text("deleted_at IS NULL"),
+    "sqlite_where": text("deleted_at IS NULL"),
+}
+
+
 class AdvertisementORM(Base):
     """
     Модель объявления в базе данных.
@@ -19,26 +43,57 @@ class AdvertisementORM(Base):
 
     __tablename__ = "advertisements"
 
-    # Заголовок объявления. Уникальное, индексированное поле.
-    title: Mapped[str] = mapped_column(String, index=True)
+    # Индексы для поиска частичные (только неудалённые строки), поэтому
+    # мягко удалённые объявления не раздувают их. Запросы должны содержать
+    # условие `deleted_at IS NULL`, чтобы планировщик их использовал.
+    __table_args__ = (
+        Index("ix_advertisements_title_live", "title", **LIVE),
+        Index("ix_advertisements_price_live", "price", **LIVE),
+        Index("ix_advertisements_owner_live", "owner", **LIVE),
+        Index(
+            "ix_advertisements_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+        Index("ix_advertisements_user_id", "user_id"),
+    )
+
+    # Первичный ключ: целое число, автоинкремент
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    # Дата публикации объявления. Устанавливается автоматически сервером.
+    # При секционировании входит в первичный ключ таблицы (см. `partition_table`).
+    date_posted: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    # date_posted генерируется БД; eager_defaults возвращает его через RETURNING
+    # при flush (нужно для события в потоке `/advertisement/stream`).
+    # Для ORM объявление всегда идентифицируется только по id.
+    __mapper_args__ = {"eager_defaults": True, "primary_key": [id]}
+
+    # Тема событий transactional outbox (см. `crud.write_outbox`)
+    __outbox_topic__ = "advertisement"
+
+    # Заголовок объявления. Индексировано (частичный индекс).
+    title: Mapped[str] = mapped_column(String)
 
     # Описание объявления. Может быть пустым (default=None).
     description: Mapped[str] = mapped_column(String, default=None)
 
     # Цена объявления. Целое число, индексированное для быстрого поиска.
-    price: Mapped[int] = mapped_column(Integer, index=True)
+    price: Mapped[int] = mapped_column(Integer)
 
     # Имя владельца объявления. Индексировано для фильтрации.
-    owner: Mapped[str] = mapped_column(String, index=True)
+    owner: Mapped[str] = mapped_column(String)
 
-    # Дата публикации объявления. Устанавливается автоматически сервером.
-    date_posted: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    # Время мягкого удаления. Строка удаляется фоновой очисткой (`src.core.purge`).
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None)
 
     # Внешний ключ к таблице пользователей.
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
 
     # Связь один-ко-многим с моделью User.
-    # При удалении пользователя автоматически удаляются связанные объявления.
+    # Объявления удалённого пользователя удаляются фоновой очисткой.
     user: Mapped["UserORM"] = relationship(
         "UserORM",
         back_populates="advertisement",
@@ -63,3 +118,40 @@ class AdvertisementORM(Base):
             "date_posted": self.date_posted.isoformat(),
             "user_id": self.user_id,
         }
+
+    def fields_dict(self, fields: tuple[str, ...]) -> dict:
+        """
+        Возвращает словарь только с запрошенными полями объявления.
+
+        Обращается лишь к перечисленным атрибутам, поэтому безопасен для
+        объектов, загруженных через `load_only` (незагруженные колонки
+        не подтягиваются из БД).
+
+        Args:
+            fields (tuple[str, ...]): Имена полей из `ADV_FIELDS`.
+
+        Returns:
+            dict: Словарь {поле: значение} для запрошенных полей.
+        """
+        return {field: getattr(self, field) for field in fields}
+
+
+@event.listens_for(AdvertisementORM.__table__, "before_create")
+def partition_table(table: Table, connection, **kw) -> None:
+    """
+    Секционирует таблицу объявлений по месяцам `date_posted` (`ADV_PARTITIONED`).
+
+    Настройка определяет DDL таблицы, поэтому читается при её создании,
+    а не при импорте модели. Поддерживается только в PostgreSQL.
+    Секции создаёт и обслуживает `src.core.partitions`.
+
+    Args:
+        table (Table): Таблица объявлений.
+        connection: Соединение, в котором создаётся таблица.
+    """
+    if not get_settings().ADV_PARTITIONED or connection.dialect.name != "postgresql":
+        return
+    table.dialect_options["postgresql"]["partition_by"] = "RANGE (date_posted)"
+    # В секционированной таблице первичный ключ обязан включать ключ секционирования
+    if "date_posted" not in table.primary_key.columns:
+        table.primary_key._reload([table.c.date_posted])
@@ -1,17 +1,60 @@
-from sqlalchemy import Integer
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import Insert, Integer, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import (
+    AsyncAttrs,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
-from src.core.config import settings
+from src.core.config import get_settings
 
-# Формирование строки подключения к базе данных на основе конфигурации
-DATABASE_URL = settings.det_db_url()
+# Асинхронный движок SQLAlchemy для взаимодействия с БД.
+# Создаётся в `lifespan` (см. `create_engine`), а не при импорте модуля.
+engine: AsyncEngine | None = None
 
-# Асинхронный движок SQLAlchemy для взаимодействия с БД
-engine = create_async_engine(DATABASE_URL)
+# Ключ `AsyncSession.info` с таймаутом SQL-запросов сессии в секундах.
+STATEMENT_TIMEOUT_KEY = "statement_timeout"
 
-# Фабрика асинхронных сессий SQLAlchemy
-Session = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+class TimeoutSession(AsyncSession):
+    """
+    Асинхронная сессия с таймаутом отдельных SQL-запросов на стороне клиента.
+
+    Если в `info` задан `STATEMENT_TIMEOUT_KEY`, каждый запрос (`execute`,
+    `scalar`, `scalars`, `get`, `stream`) ограничивается этим временем:
+    по его истечении запрос отменяется (asyncpg отправляет серверу cancel)
+    и выбрасывается `TimeoutError`. Время между запросами не учитывается.
+    """
+
+    def _statement_timeout(self):
+        return asyncio.timeout(self.info.get(STATEMENT_TIMEOUT_KEY))
+
+    async def execute(self, *args, **kwargs):
+        async with self._statement_timeout():
+            return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        async with self._statement_timeout():
+            return await super().scalar(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        async with self._statement_timeout():
+            return await super().get(*args, **kwargs)
+
+    async def stream(self, *args, **kwargs):
+        async with self._statement_timeout():
+            return await super().stream(*args, **kwargs)
+
+
+# Фабрика асинхронных сессий SQLAlchemy. Привязывается к движку в `create_engine`.
+Session = async_sessionmaker(class_=TimeoutSession, expire_on_commit=False)
 
 
 class Base(DeclarativeBase, AsyncAttrs):
@@ -40,6 +83,83 @@ class Base(DeclarativeBase, AsyncAttrs):
         return {"id": self.id}
 
 
+def create_engine() -> AsyncEngine:
+    """
+    Создаёт движок SQLAlchemy и привязывает к нему фабрику сессий.
+
+    Повторный вызов возвращает уже созданный движок. Пул соединений
+    создаётся здесь, а не при импорте, что ускоряет холодный старт.
+    Для SQLite каждое соединение переводится в режим WAL (см. `_sqlite_pragmas`).
+
+    Returns:
+        AsyncEngine: Асинхронный движок SQLAlchemy.
+    """
+    global engine
+    if engine is None:
+        engine = create_async_engine(get_settings().det_db_url())
+        if engine.dialect.name == "sqlite":
+            event.listen(engine.sync_engine, "connect", _sqlite_pragmas)
+        Session.configure(bind=engine)
+    return engine
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # WAL: читатели не блокируют писателя и наоборот; synchronous=NORMAL
+    # в режиме WAL безопасен и не вызывает fsync на каждый COMMIT
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def insert(orm_cls) -> Insert:
+    """
+    Возвращает INSERT с поддержкой `on_conflict_do_nothing` для текущей СУБД.
+
+    Args:
+        orm_cls: Класс модели ORM.
+
+    Returns:
+        Insert: Конструкция INSERT диалекта PostgreSQL или SQLite.
+    """
+    if create_engine().dialect.name == "sqlite":
+        return sqlite.insert(orm_cls)
+    return postgresql.insert(orm_cls)
+
+
+@asynccontextmanager
+async def read_only_session(
+    timeout: Optional[float] = None,
+) -> AsyncIterator[AsyncSession]:
+    """
+    Открывает сессию для чтения без транзакции.
+
+    Соединение переводится в режим AUTOCOMMIT, поэтому запросы выполняются
+    без BEGIN/COMMIT. Изоляционный уровень сбрасывается при возврате
+    соединения в пул.
+
+    `SET LOCAL statement_timeout` вне транзакции не действует, поэтому таймаут
+    для чтения применяется на стороне клиента к каждому запросу
+    (см. `TimeoutSession`): по истечении `timeout` запрос отменяется
+    и выбрасывается `TimeoutError`. Работа обработчика между запросами
+    в таймаут не входит.
+
+    Args:
+        timeout (float | None): Таймаут одного SQL-запроса в секундах.
+
+    Yields:
+        AsyncSession: Асинхронная сессия SQLAlchemy.
+    """
+    async with Session() as session:
+        session.info[STATEMENT_TIMEOUT_KEY] = timeout
+        async with session._statement_timeout():
+            await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+        yield session
+
+
 async def init_orm():
     """
     Инициализирует структуру базы данных.
@@ -47,7 +167,7 @@ async def init_orm():
     Создаёт все таблицы, определённые в моделях, если они ещё не существуют.
     Вызывается при запуске приложения.
     """
-    async with engine.begin() as conn:
+    async with create_engine().begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all, checkfirst=True)
 
@@ -59,4 +179,7 @@ async def close_orm():
     Освобождает ресурсы, связанные с движком SQLAlchemy.
     Вызывается при завершении работы приложения.
     """
-    await engine.dispose()
\ No newline at end of file
+    global engine
+    if engine is not None:
+        await engine.dispose()
+        engine = None
\ No newline at end of file
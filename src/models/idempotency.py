@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.database import Base
+
+
+class IdempotencyKeyORM(Base):
+    """
+    Модель ключа идемпотентности в базе данных.
+
+    Представляет таблицу 'idempotency_keys'. Запись создаётся при первом
+    запросе с заголовком `Idempotency-Key` (статус пустой — запрос выполняется)
+    и дополняется сохранённым ответом после успешного выполнения.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    # Ключ идемпотентности вместе с маршрутом и вызывающим
+    # (например, "/src/advertisement:<id пользователя>:<ключ>").
+    key: Mapped[str] = mapped_column(String(300), unique=True, nullable=False)
+
+    # SHA-256 тела запроса: тот же ключ с другим телом — ошибка клиента.
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # HTTP-код сохранённого ответа. None — запрос ещё выполняется.
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # Тело сохранённого ответа.
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+    # Время создания записи; по нему определяется срок действия ключа.
+    # Индекс нужен фоновой очистке истёкших ключей (`src.core.purge`).
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), index=True
+    )
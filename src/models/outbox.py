@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.database import Base
+
+
+class OutboxORM(Base):
+    """
+    Модель записи транзакционного outbox.
+
+    Представляет таблицу 'outbox'. Запись добавляется в той же транзакции,
+    что и изменение основной сущности (см. `crud`), и затем обрабатывается
+    фоновым диспетчером (`src.core.outbox`), который вызывает потребителей
+    (кэши, поисковые индексы, уведомления) с доставкой "хотя бы один раз".
+    """
+
+    __tablename__ = "outbox"
+
+    # Тема события (например, "advertisement"). По ней выбираются потребители.
+    topic: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    # Действие над сущностью: "created", "updated" или "deleted".
+    action: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Данные события (сериализованная сущность или её id).
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    # Количество неудачных попыток обработки.
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Время создания записи.
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    # Время, не раньше которого запись можно обрабатывать (отсрочка после ошибки).
+    # Индексировано: диспетчер выбирает готовые к обработке записи.
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), index=True
+    )
+
+    @property
+    def dict(self):
+        """
+        Возвращает событие в виде словаря для передачи потребителям.
+        """
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "action": self.action,
+            "payload": self.payload,
+        }
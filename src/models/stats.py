@@ -0,0 +1,88 @@
+from sqlalchemy import DDL, column, event, table
+from sqlalchemy import Date, DateTime, Float, Integer, String
+
+from src.models.advertisements import AdvertisementORM
+
+# Материализованные представления статистики по объявлениям.
+# Создаются и удаляются вместе с таблицей объявлений (DDL-события ниже),
+# обновляются фоновой задачей `src.core.stats.StatsRefresher`.
+# Уникальный индекс каждого представления нужен для REFRESH ... CONCURRENTLY.
+
+# Общая статистика: одна строка (key = 1).
+TOTALS_VIEW = table(
+    "adv_stats_totals",
+    column("total", Integer),
+    column("price_avg", Float),
+    column("price_p50", Float),
+    column("price_p90", Float),
+    column("refreshed_at", DateTime),
+)
+
+# Количество и распределение цен по владельцам.
+OWNERS_VIEW = table(
+    "adv_stats_owners",
+    column("owner", String),
+    column("total", Integer),
+    column("price_min", Integer),
+    column("price_max", Integer),
+    column("price_avg", Float),
+    column("price_p50", Float),
+    column("price_p90", Float),
+)
+
+# Количество опубликованных объявлений по дням.
+DAILY_VIEW = table(
+    "adv_stats_daily",
+    column("day", Date),
+    column("total", Integer),
+)
+
+_PRICE_STATS = (
+    "avg(price)::float AS price_avg, "
+    "percentile_cont(0.5) WITHIN GROUP (ORDER BY price) AS price_p50, "
+    "percentile_cont(0.9) WITHIN GROUP (ORDER BY price) AS price_p90"
+)
+
+# Имя представления -> (запрос, колонки уникального индекса)
+VIEWS = {
+    TOTALS_VIEW.name: (
+        f"SELECT 1 AS key, count(*) AS total, {_PRICE_STATS}, "
+        "now() AS refreshed_at "
+        "FROM advertisements WHERE deleted_at IS NULL",
+        "key",
+    ),
+    OWNERS_VIEW.name: (
+        "SELECT owner, count(*) AS total, "
+        f"min(price) AS price_min, max(price) AS price_max, {_PRICE_STATS} "
+        "FROM advertisements WHERE deleted_at IS NULL GROUP BY owner",
+        "owner",
+    ),
+    DAILY_VIEW.name: (
+        "SELECT date_posted::date AS day, count(*) AS total "
+        "FROM advertisements WHERE deleted_at IS NULL GROUP BY day",
+        "day",
+    ),
+}
+
+for _name, (_query, _key) in VIEWS.items():
+    event.listen(
+        AdvertisementORM.__table__,
+        "after_create",
+        DDL(f"CREATE MATERIALIZED VIEW {_name} AS {_query}").execute_if(
+            dialect="postgresql"
+        ),
+    )
+    event.listen(
+        AdvertisementORM.__table__,
+        "after_create",
+        DDL(f"CREATE UNIQUE INDEX ix_{_name}_key ON {_name} ({_key})").execute_if(
+            dialect="postgresql"
+        ),
+    )
+    event.listen(
+        AdvertisementORM.__table__,
+        "before_drop",
+        DDL(f"DROP MATERIALIZED VIEW IF EXISTS {_name}").execute_if(
+            dialect="postgresql"
+        ),
+    )
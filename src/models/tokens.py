@@ -1,8 +1,8 @@
 import datetime
+import uuid
 from typing import TYPE_CHECKING
-from sqlalchemy.dialects.postgresql import UUID
 
-from sqlalchemy import DateTime, ForeignKey, func
+from sqlalchemy import DateTime, ForeignKey, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.models.database import Base
 
@@ -12,13 +12,18 @@ if TYPE_CHECKING:
 
 class TokenORM(Base):
     __tablename__ = "tokens"
-    token: Mapped[UUID] = mapped_column(
-        UUID, server_default=func.gen_random_uuid(), unique=True
-    )
+
+    # Время создания генерируется БД; eager_defaults возвращает его
+    # через RETURNING при flush, без отдельного SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Значение токена генерируется на стороне приложения (не зависит от СУБД)
+    token: Mapped[uuid.UUID] = mapped_column(Uuid, default=uuid.uuid4, unique=True)
     creation_time: Mapped[datetime.datetime] = mapped_column(
         DateTime, server_default=func.now()
     )
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    # Индекс нужен фоновой очистке токенов удалённых пользователей
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     user: Mapped["UserORM"] = relationship(
         "UserORM", back_populates="tokens", lazy="joined"
     )
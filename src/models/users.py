@@ -1,7 +1,8 @@
-from typing import List
+import datetime
+from typing import List, Optional
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String
+from sqlalchemy import DateTime, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.custom_type import ROLE
@@ -22,19 +23,42 @@ class UserORM(Base):
 
     __tablename__ = "users"
 
-    # Имя пользователя. Уникальное, индексированное, обязательное поле.
-    name: Mapped[str] = mapped_column(
-        String(50), unique=True, index=True, nullable=False
+    # Имя уникально только среди неудалённых пользователей: частичный индекс
+    # не содержит удалённых строк, и имя удалённого пользователя можно занять снова.
+    __table_args__ = (
+        Index(
+            "ix_users_name_live",
+            "name",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_users_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
     )
 
+    # Имя пользователя. Обязательное поле (уникальность — см. `__table_args__`).
+    name: Mapped[str] = mapped_column(String(50), nullable=False)
+
     # Хэшированный пароль пользователя. Обязательное поле.
     password: Mapped[str] = mapped_column(String(70), nullable=False)
 
     # Роль пользователя (например, 'user', 'admin'). По умолчанию 'user'.
     role: Mapped[ROLE] = mapped_column(String, default="user")
 
+    # Время мягкого удаления. Удалённый пользователь скрыт от запросов,
+    # а его токены и объявления удаляются фоновой очисткой (`src.core.purge`).
+    deleted_at: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DateTime, default=None
+    )
+
     # Связь один-ко-многим с моделью Token.
-    # При удалении пользователя автоматически удаляются все связанные токены.
+    # При удалении объекта через ORM удаляются и все связанные токены;
+    # API удаляет пользователей мягко, строки удаляет `src.core.purge`.
     tokens: Mapped[List["TokenORM"]] = relationship(
         "TokenORM", back_populates="user", cascade="all, delete-orphan", lazy="joined"
     )
@@ -1,24 +1,49 @@
+import asyncio
 import datetime
+import json
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query
-from sqlalchemy import String, or_, select
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import lazyload, load_only
 
 from src import crud
-from src.dependency import SessionDependency, TokenDependency
+from src.core import export
+from src.core.config import get_settings
+from src.core.feed import Subscription, hub, notify_advertisement
+from src.core.idempotency import idempotent
+from src.core.queries import SEARCH_FILTERS, get_registry, search_query
+from src.core.singleflight import singleflight
+from src.core.transactions import TransactionalRoute
+from src.dependency import FieldsDependency, SessionDependency, TokenDependency
 from src.models.advertisements import AdvertisementORM
+from src.models.database import read_only_session
 from src.schemas.advertisements import (
     CreateAdvRequest,
-    GetAdvResponse,
+    PartialAdvResponse,
     SearchAdvResponse,
 )
 from src.schemas.base import IdResponse
 from src.schemas.users import UpdateAdvRequest
 
-advertisement_router = APIRouter()
+advertisement_router = APIRouter(route_class=TransactionalRoute)
+
+
+def _adv_columns(fields: tuple[str, ...]) -> list:
+    """
+    Возвращает колонки `AdvertisementORM`, соответствующие запрошенным полям.
+
+    Args:
+        fields (tuple[str, ...]): Имена полей из `ADV_FIELDS`.
+
+    Returns:
+        list: Список атрибутов модели для `select`/`load_only`.
+    """
+    return [getattr(AdvertisementORM, field) for field in fields]
 
 
 @advertisement_router.post("/advertisement", response_model=IdResponse)
+@idempotent
 async def create_advertisement(
     session: SessionDependency, token: TokenDependency, item: CreateAdvRequest
 ) -> AdvertisementORM:
@@ -27,7 +52,8 @@ async def create_advertisement(
 
     Требует аутентификации. Пользователь создаёт объявление, передавая данные
     через модель `CreateAdvRequest`. Объявление связывается с пользователем
-    по его `user_id`.
+    по его `user_id`. Поддерживает заголовок `Idempotency-Key`: повтор
+    запроса (например, после таймаута) не создаёт дубликат.
 
     Args:
         session (Session): Асинхронная сессия SQLAlchemy.
@@ -40,101 +66,304 @@ async def create_advertisement(
     adv_dict = item.model_dump(exclude_unset=True)
     adv_orm_obj = AdvertisementORM(**adv_dict, user_id=token.user_id)
     await crud.add_item(session, adv_orm_obj)
+    await notify_advertisement(session, "created", adv_orm_obj)
     return adv_orm_obj.id_dict
 
 
+@advertisement_router.get("/advertisement/stream")
+async def stream_advertisements(
+    request: Request,
+    title: Optional[str] = Query(None),
+    owner: Optional[str] = Query(None),
+    price: Optional[int] = Query(None),
+) -> StreamingResponse:
+    """
+    Поток новых и изменённых объявлений (Server-Sent Events).
+
+    Вместо периодического поиска клиент подписывается на события, отфильтрованные
+    так же, как в поиске: подстрока заголовка/владельца и точная цена.
+    События приходят из Postgres LISTEN/NOTIFY через общий хаб воркера:
+    объявление читается один раз на событие, а не на каждого подписчика.
+
+    Args:
+        request (Request): Текущий HTTP-запрос (для отслеживания отключения клиента).
+        title (str): Фильтр по подстроке заголовка.
+        owner (str): Фильтр по подстроке имени владельца.
+        price (int): Фильтр по цене.
+
+    Returns:
+        StreamingResponse: Поток `text/event-stream`.
+
+    Raises:
+        HTTPException 501: Если поток событий выключен или БД не PostgreSQL.
+    """
+    settings = get_settings()
+    if not settings.FEED_ENABLED or not settings.is_postgres():
+        raise HTTPException(501, "Advertisement stream requires PostgreSQL")
+    subscription = hub.subscribe(
+        Subscription(title, owner, price, queue_size=settings.FEED_QUEUE_SIZE)
+    )
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), settings.FEED_HEARTBEAT_SEC
+                    )
+                except asyncio.TimeoutError:
+                    # Комментарий SSE не даёт прокси закрыть простаивающее соединение
+                    yield ": ping\n\n"
+                    continue
+                yield (
+                    f"event: {event['action']}\n"
+                    f"id: {event['id']}\n"
+                    f"data: {json.dumps(event)}\n\n"
+                )
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@advertisement_router.get("/advertisement/export")
+async def export_advertisements(
+    token: TokenDependency,
+    fields: FieldsDependency,
+    export_format: str = Query("ndjson", alias="format"),
+    after_id: Optional[int] = Query(None),
+    since: Optional[datetime.date] = Query(None),
+) -> StreamingResponse:
+    """
+    Потоковая выгрузка объявлений в NDJSON, CSV или Parquet (только для админа).
+
+    Строки читаются через серверный курсор пачками по `EXPORT_BATCH_SIZE`
+    и сразу отправляются клиенту, поэтому память не зависит от размера таблицы.
+    Заголовок `X-Export-Watermark` содержит максимальный id выгрузки:
+    следующая инкрементальная выгрузка запрашивается с `after_id`, равным ему.
+    Она повторно включает `EXPORT_RESCAN_WINDOW` id ниже `after_id`
+    (строки, зафиксированные позже), поэтому строки применяются по id.
+
+    Args:
+        token (Token): Данные токена аутентификации.
+        fields (tuple[str, ...]): Выгружаемые поля объявлений.
+        export_format (str): Формат выгрузки (параметр `format`):
+            ndjson, csv или parquet.
+        after_id (int): Watermark предыдущей выгрузки.
+        since (date): Выгрузить объявления, опубликованные с этой даты.
+
+    Returns:
+        StreamingResponse: Поток выгрузки.
+
+    Raises:
+        HTTPException 403: Если пользователь не администратор.
+        HTTPException 400: Если формат не поддерживается.
+    """
+    if token.user.role != "admin":
+        raise HTTPException(403, "Insufficient privileges")
+    if export_format not in export.available_formats():
+        raise HTTPException(400, f"Unsupported export format: {export_format}")
+
+    watermark = await export.get_watermark()
+    filename = f"advertisements.{export_format}"
+    return StreamingResponse(
+        export.export(export_format, fields, watermark, after_id, since),
+        media_type=export.MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Export-Watermark": str(watermark),
+        },
+    )
+
+
 @advertisement_router.get(
-    "/advertisement/{advertisement_id}", response_model=GetAdvResponse
+    "/advertisement/{advertisement_id}",
+    response_model=PartialAdvResponse,
+    response_model_exclude_unset=True,
 )
 async def get_advertisement(
-    session: SessionDependency, token: TokenDependency, advertisement_id: int
-) -> AdvertisementORM:
+    token: TokenDependency,
+    advertisement_id: int,
+    fields: FieldsDependency,
+) -> Response:
     """
     Получает информацию об объявлении по его ID.
 
     Пользователь может получить только своё объявление или если он является админом.
+    Параметр `fields` ограничивает набор возвращаемых полей: незапрошенные
+    колонки не выбираются из БД (`load_only`), связь с пользователем не подгружается.
+
+    Одновременные запросы одного объявления с одинаковым `fields` разделяют
+    один запрос к БД и одну сериализацию (single-flight); права доступа
+    проверяются для каждого вызывающего отдельно.
 
     Args:
-        session (Session): Асинхронная сессия SQLAlchemy.
         token (Token): Данные токена аутентификации.
         advertisement_id (int): Идентификатор объявления.
+        fields (tuple[str, ...]): Запрошенные поля объявления.
 
     Returns:
-        GetAdvResponse: Детали объявления.
+        PartialAdvResponse: Детали объявления (только запрошенные поля).
 
     Raises:
         HTTPException 403: Если у пользователя нет прав на просмотр объявления.
     """
-    adv_orm_obj = await crud.get_item_by_id(session, AdvertisementORM, advertisement_id)
-    if token.user.role == "admin" or adv_orm_obj.user_id == token.user_id:
-        return adv_orm_obj.dict
+
+    timeout = get_settings().statement_timeout_ms("get") / 1000 or None
+
+    async def load() -> tuple[int, bytes]:
+        async with read_only_session(timeout) as session:
+            adv_orm_obj = await crud.get_item_by_id(
+                session,
+                AdvertisementORM,
+                advertisement_id,
+                options=[
+                    # user_id нужен всегда — по нему проверяются права доступа
+                    load_only(*_adv_columns(fields), AdvertisementORM.user_id),
+                    lazyload(AdvertisementORM.user),
+                ],
+            )
+        body = PartialAdvResponse(**adv_orm_obj.fields_dict(fields))
+        return adv_orm_obj.user_id, body.model_dump_json(exclude_unset=True).encode()
+
+    user_id, body = await singleflight.do(
+        ("advertisement", advertisement_id, fields), load
+    )
+    if token.user.role == "admin" or user_id == token.user_id:
+        return Response(body, media_type="application/json")
     raise HTTPException(403, "Insufficient privileges")
 
 
-@advertisement_router.get("/advertisement", response_model=SearchAdvResponse)
+@advertisement_router.get(
+    "/advertisement",
+    response_model=SearchAdvResponse,
+    response_model_exclude_unset=True,
+)
 async def search_advertisement(
-    session: SessionDependency,
+    fields: FieldsDependency,
     title: Optional[str] = Query(None),
     description: Optional[str] = Query(None),
     price: Optional[str] = Query(None),
     owner: Optional[str] = Query(None),
     date_posted: Optional[str] = Query(None),
-) -> SearchAdvResponse:
+    since: Optional[datetime.date] = Query(None),
+    after_id: Optional[int] = Query(None),
+    limit: int = Query(10000, ge=1, le=10000),
+) -> Response:
     """
     Выполняет поиск объявлений по различным критериям.
 
     Поддерживает фильтрацию по заголовку, описанию, цене, владельцу и дате публикации.
-    Поиск поддерживает подстановочные знаки (`%`).
+    Поиск поддерживает подстановочные знаки (`%`). Параметр `fields` ограничивает
+    набор выбираемых колонок: запрос строится как `SELECT` только нужных полей.
+    Запрос каждой формы (поля и набор фильтров) берётся из реестра заранее
+    построенных запросов (`src.core.queries`), значения передаются параметрами.
+    Результаты упорядочены по id; постраничный обход — по ключу: следующая
+    страница запрашивается с `after_id`, равным id последнего объявления.
+    Нижняя граница `date_posted` (`since` или окно `ADV_SEARCH_WINDOW_DAYS`)
+    позволяет планировщику отсечь старые секции таблицы.
+
+    Одновременные одинаковые поиски разделяют один запрос к БД и одну
+    сериализацию ответа (single-flight).
 
     Args:
-        session (Session): Асинхронная сессия SQLAlchemy.
+        fields (tuple[str, ...]): Запрошенные поля объявлений.
         title (str): Поиск по заголовку объявления.
         description (str): Поиск по описанию.
         price (str): Поиск по цене.
         owner (str): Поиск по имени владельца.
         date_posted (str): Поиск по дате публикации.
+        since (date): Искать только объявления, опубликованные с этой даты.
+        after_id (int): Вернуть объявления с id больше указанного.
+        limit (int): Максимальное количество объявлений в ответе.
 
     Returns:
-        SearchAdvResponse: Список найденных объявлений.
+        Response: JSON `SearchAdvResponse` со списком найденных объявлений.
 
     Raises:
-        HTTPException 400: Если не указан ни один из параметров поиска.
+        HTTPException 400: Если не указан ни один из параметров поиска
+            или цена не является целым числом.
     """
     if not any([title, description, price, owner, date_posted]):
         raise HTTPException(
             status_code=400, detail="At least one search parameter is required"
         )
 
-    conditions = []
+    # Значения фильтров передаются параметрами заранее построенного запроса
+    params = {"limit": limit}
 
     if title:
         # Используем ilike для регистронезависимого поиска
-        conditions.append(AdvertisementORM.title.ilike(f"%{title}%"))
+        params["title"] = f"%{title}%"
     if description:
-        conditions.append(AdvertisementORM.description.ilike(f"%{description}%"))
+        params["description"] = f"%{description}%"
     if price:
         # Цена — это целое число, поэтому сравниваем точно
-        conditions.append(AdvertisementORM.price == price)
+        try:
+            params["price"] = int(price)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Price must be an integer")
     if owner:
-        conditions.append(AdvertisementORM.owner.ilike(f"%{owner}%"))
+        params["owner"] = f"%{owner}%"
     if date_posted:
         try:
             # Пробуем преобразовать строку в дату
-            date_obj = datetime.strptime(date_posted, "%Y-%m-%d").date()
-            conditions.append(AdvertisementORM.date_posted == date_obj)
+            date_obj = datetime.datetime.strptime(date_posted, "%Y-%m-%d").date()
+            params["date"] = date_obj
         except ValueError:
             # Если дата некорректна, пробуем искать как текстовую строку
-            conditions.append(
-                AdvertisementORM.date_posted.cast(String).ilike(f"%{date_posted}%")
-            )
-
-    # Формируем SQL-запрос с применением всех условий
-    query = select(AdvertisementORM).where(or_(*conditions)).limit(10000)
-
-    result = await session.execute(query)
-    advs = result.scalars().all()
+            params["date_text"] = f"%{date_posted}%"
+    filters = tuple(name for name in SEARCH_FILTERS if name in params)
+
+    if after_id is not None:
+        params["after_id"] = after_id
+
+    window_days = get_settings().ADV_SEARCH_WINDOW_DAYS
+    if since is None and window_days:
+        since = datetime.date.today() - datetime.timedelta(days=window_days)
+    if since is not None:
+        # Параметр сравнивается с колонкой TIMESTAMP, поэтому передаётся datetime
+        params["since"] = datetime.datetime.combine(since, datetime.time())
+
+    # Запрос канонической формы (поля + набор фильтров) строится один раз
+    # и переиспользуется; условие deleted_at IS NULL совпадает с условием
+    # частичных индексов
+    query = get_registry().get(
+        "search",
+        search_query,
+        fields,
+        filters,
+        after_id is not None,
+        since is not None,
+    )
 
-    return SearchAdvResponse(advs=[GetAdvResponse.model_validate(adv) for adv in advs])
+    timeout = get_settings().statement_timeout_ms("search") / 1000 or None
+
+    async def run() -> bytes:
+        async with read_only_session(timeout) as session:
+            result = await session.execute(query, params)
+            advs = [PartialAdvResponse(**row._mapping) for row in result]
+        response = SearchAdvResponse(advs=advs)
+        return response.model_dump_json(exclude_unset=True).encode()
+
+    # Ключ — нормализованные параметры поиска (после применения окна по дате)
+    key = (
+        "search",
+        fields,
+        title,
+        description,
+        price,
+        owner,
+        date_posted,
+        since,
+        after_id,
+        limit,
+    )
+    return Response(await singleflight.do(key, run), media_type="application/json")
 
 
 @advertisement_router.patch(
@@ -176,6 +405,7 @@ async def update_advertisement(
             orm_obj.description = item.description
 
         await crud.update_item(session, orm_obj)
+        await notify_advertisement(session, "updated", orm_obj)
         return {"id": advertisement_id}
     raise HTTPException(403, "Insufficient privileges")
 
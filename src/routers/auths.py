@@ -1,14 +1,13 @@
 from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
 
 from src.auth import auth
 from src import crud
+from src.core.transactions import TransactionalRoute
 from src.dependency import SessionDependency
 from src.models.tokens import TokenORM
-from src.models.users import UserORM
 from src.schemas.login import LoginRequest, LoginResponse
 
-auths_router = APIRouter()
+auths_router = APIRouter(route_class=TransactionalRoute)
 
 
 @auths_router.post("/login", response_model=LoginResponse)
@@ -30,11 +29,8 @@ async def login(login_data: LoginRequest, session: SessionDependency) -> LoginRe
         HTTPException 401: Если имя пользователя или пароль неверны.
     """
 
-    # Формируем SQL-запрос на получение пользователя по имени
-    query = select(UserORM).where(UserORM.name == login_data.name)
-
-    # Выполняем запрос и получаем пользователя из БД
-    user = await session.scalar(query)
+    # Получаем только id, хэш пароля и роль пользователя (с кэшем по имени)
+    user = await crud.get_user_credentials(session, login_data.name)
 
     # Если пользователь не найден — ошибка авторизации
     if user is None:
@@ -47,8 +43,8 @@ async def login(login_data: LoginRequest, session: SessionDependency) -> LoginRe
     # Создаём новый токен, связанный с пользователем
     token = TokenORM(user_id=user.id)
 
-    # Сохраняем токен в БД
+    # Сохраняем токен в транзакции запроса (фиксируется один раз в конце запроса)
     await crud.add_item(session, token)
 
     # Возвращаем данные токена пользователю
-    return token.dict
+    return {"token": token.token}
@@ -0,0 +1,64 @@
+import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import select
+
+from src.core.transactions import TransactionalRoute
+from src.dependency import SessionDependency
+from src.models.stats import DAILY_VIEW, OWNERS_VIEW, TOTALS_VIEW
+from src.schemas.stats import StatsResponse
+
+stats_router = APIRouter(route_class=TransactionalRoute)
+
+
+@stats_router.get("/stats", response_model=StatsResponse)
+async def get_stats(
+    session: SessionDependency,
+    owner: Optional[str] = Query(None),
+    days: int = Query(30, ge=1, le=366),
+    limit: int = Query(100, ge=1, le=1000),
+) -> dict:
+    """
+    Возвращает статистику по объявлениям.
+
+    Общее количество и распределение цен, статистику по владельцам
+    (по убыванию количества объявлений) и объём публикаций по дням.
+    Читает только материализованные представления (см. `src.models.stats`),
+    поэтому время ответа не зависит от размера таблицы объявлений.
+
+    Args:
+        session (Session): Асинхронная сессия SQLAlchemy.
+        owner (str): Вернуть статистику только этого владельца.
+        days (int): За сколько последних дней вернуть объём публикаций.
+        limit (int): Максимальное количество владельцев в ответе.
+
+    Returns:
+        StatsResponse: Статистика по объявлениям.
+
+    Raises:
+        HTTPException 501: Если БД не PostgreSQL (представлений нет).
+    """
+    if session.bind.dialect.name != "postgresql":
+        raise HTTPException(501, "Statistics require PostgreSQL")
+
+    totals = (await session.execute(select(TOTALS_VIEW))).one()
+
+    owners_query = (
+        select(OWNERS_VIEW)
+        .order_by(OWNERS_VIEW.c.total.desc(), OWNERS_VIEW.c.owner)
+        .limit(limit)
+    )
+    if owner is not None:
+        owners_query = owners_query.where(OWNERS_VIEW.c.owner == owner)
+
+    since = datetime.date.today() - datetime.timedelta(days=days - 1)
+    daily_query = (
+        select(DAILY_VIEW).where(DAILY_VIEW.c.day >= since).order_by(DAILY_VIEW.c.day)
+    )
+
+    return {
+        **totals._mapping,
+        "owners": [row._mapping for row in await session.execute(owners_query)],
+        "daily": [row._mapping for row in await session.execute(daily_query)],
+    }
@@ -1,16 +1,29 @@
 from fastapi import APIRouter, HTTPException
+from sqlalchemy.orm import lazyload
 
 from src import crud
+from src.core.config import get_settings
+from src.core.idempotency import idempotent
+from src.core.provisioning import provision_users
+from src.core.transactions import TransactionalRoute
 from src.auth import auth
 from src.dependency import SessionDependency, TokenDependency
+from src.models.advertisements import AdvertisementORM
 from src.models.users import UserORM
 from src.schemas.base import IdResponse
-from src.schemas.users import CreateUserRequest, GetUserResponse, UpdateUserRequest
+from src.schemas.users import (
+    BulkCreateUserRequest,
+    BulkCreateUserResponse,
+    CreateUserRequest,
+    GetUserResponse,
+    UpdateUserRequest,
+)
 
-users_router = APIRouter()
+users_router = APIRouter(route_class=TransactionalRoute)
 
 
 @users_router.post("/user", response_model=IdResponse)
+@idempotent
 async def create_user(
     user_data: CreateUserRequest, session: SessionDependency
 ) -> UserORM:
@@ -24,10 +37,21 @@ async def create_user(
     Returns:
         UserORM: Объект пользователя, включающий только его id.
 
+    Поддерживает заголовок `Idempotency-Key`: повтор запроса возвращает
+    сохранённый ответ без повторного хэширования пароля.
+
     Process:
+        - Проверяет, что имя свободно (до дорогого хэширования пароля).
         - Хэширует пароль перед сохранением.
         - Сохраняет пользователя в БД.
+
+    Raises:
+        HTTPException 409: Если пользователь с таким именем уже существует.
     """
+    # Проверяем конфликт имени до bcrypt; гонку закрывает уникальный индекс
+    if await crud.user_name_exists(session, user_data.name):
+        raise HTTPException(409, "Item already exists")
+
     # Преобразуем модель запроса в словарь
     user_dict = user_data.model_dump(exclude_unset=True)
 
@@ -44,6 +68,43 @@ async def create_user(
     return user_orm_obj.id_dict
 
 
+@users_router.post("/user/bulk", response_model=BulkCreateUserResponse)
+async def create_users_bulk(
+    data: BulkCreateUserRequest, session: SessionDependency, token: TokenDependency
+) -> dict:
+    """
+    Массово создаёт пользователей (только для администратора).
+
+    Занятые имена проверяются одним запросом, пароли хэшируются параллельно
+    в пуле процессов, пользователи вставляются многострочным
+    `INSERT ... ON CONFLICT DO NOTHING`. Конфликт имени не прерывает запрос:
+    результат возвращается для каждого пользователя (см. `BulkUserResult`).
+
+    Транзакция запроса (проверка токена) завершается до хэширования паролей:
+    `provision_users` работает в собственных коротких сессиях.
+
+    Args:
+        data (BulkCreateUserRequest): Создаваемые пользователи.
+        session (Session): Асинхронная сессия SQLAlchemy.
+        token (Token): Данные токена аутентификации.
+
+    Returns:
+        BulkCreateUserResponse: Результаты в порядке пользователей в запросе.
+
+    Raises:
+        HTTPException 403: Если пользователь не администратор.
+        HTTPException 413: Если пользователей больше `BULK_USER_MAX_BATCH`.
+    """
+    if token.user.role != "admin":
+        raise HTTPException(403, "Insufficient privileges")
+    if len(data.users) > get_settings().BULK_USER_MAX_BATCH:
+        raise HTTPException(413, "Too many users in one request")
+
+    # Не держим соединение в открытой транзакции на время хэширования
+    await session.commit()
+    return {"results": await provision_users(data.users)}
+
+
 @users_router.get("/user/{user_id}", response_model=GetUserResponse)
 async def get_user(user_id: int, session: SessionDependency) -> UserORM:
     """
@@ -71,6 +132,10 @@ async def delete_user(
     Удаляет пользователя по его ID.
 
     Пользователь может удалить только себя или если он является администратором.
+    Удаление мягкое: объявления пользователя помечаются удалёнными одним
+    UPDATE в той же транзакции (с событиями "deleted" в outbox) и сразу
+    пропадают из поиска, просмотра и выгрузки. Токены и объявления
+    не загружаются, строки удаляет фоновая очистка (`src.core.purge`).
 
     Args:
         user_id (int): Идентификатор удаляемого пользователя.
@@ -83,13 +148,21 @@ async def delete_user(
     Raises:
         HTTPException 403: Если у пользователя нет прав на удаление.
     """
-    # Получаем пользователя из БД
-    user_orm_obj = await crud.get_item_by_id(session, UserORM, user_id)
+    # Получаем пользователя из БД без связанных токенов и объявлений
+    user_orm_obj = await crud.get_item_by_id(
+        session,
+        UserORM,
+        user_id,
+        options=[lazyload(UserORM.tokens), lazyload(UserORM.advertisement)],
+    )
 
     # Проверяем права доступа
     if token.user.role == "admin" or user_orm_obj.id == token.user_id:
-        # Удаляем пользователя из БД
+        # Удаляем пользователя и его объявления из БД и (после фиксации)
+        # из кэша учётных данных
         await crud.delete_item(session, user_orm_obj)
+        await crud.delete_user_items(session, AdvertisementORM, user_orm_obj.id)
+        crud.forget_user(session, user_orm_obj.name)
         return {"id": user_orm_obj.id}
     raise HTTPException(403, "Insufficient privileges")
 
@@ -124,6 +197,8 @@ async def update_user(
 
     # Проверяем права доступа
     if token.user.role == "admin" or user_orm_obj.id == token.user_id:
+        old_name = user_orm_obj.name
+
         # Обновляем поля, если они были переданы
         if user_data.name is not None:
             user_orm_obj.name = user_data.name
@@ -132,7 +207,8 @@ async def update_user(
         if user_data.role is not None:
             user_orm_obj.role = user_data.role
 
-        # Сохраняем изменения
+        # Сохраняем изменения; кэш учётных данных сбрасывается после фиксации
         await crud.update_item(session, user_orm_obj)
+        crud.forget_user(session, old_name, user_orm_obj.name)
         return {"id": user_orm_obj.id}
     raise HTTPException(403, "Insufficient privileges")
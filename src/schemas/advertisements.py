@@ -38,6 +38,23 @@ class GetAdvResponse(BaseModel):
         from_attributes = True  # Позволяет создавать модель из ORM-объектов
 
 
+class PartialAdvResponse(BaseModel):
+    """
+    Модель данных для частичного ответа с объявлением (sparse fieldsets).
+
+    Используется, когда клиент ограничил набор полей параметром `fields`.
+    Все поля необязательны; в ответ попадают только запрошенные
+    (эндпоинты объявлены с `response_model_exclude_unset=True`).
+    """
+
+    id: int | None = None  # Уникальный идентификатор объявления
+    title: str | None = None  # Заголовок объявления
+    description: str | None = None  # Описание объявления
+    price: int | None = None  # Цена
+    owner: str | None = None  # Владелец объявления
+    date_posted: datetime.datetime | None = None  # Дата публикации объявления
+
+
 class SearchAdvRequest(BaseModel):
     """
     Модель данных для запроса списка объявлений по списку ID.
@@ -52,10 +69,11 @@ class SearchAdvResponse(BaseModel):
     """
     Модель ответа со списком объявлений.
 
-    Используется при выполнении поиска объявлений. Содержит список объектов `GetAdvResponse`.
+    Используется при выполнении поиска объявлений. Содержит список объектов
+    `PartialAdvResponse` (только поля, запрошенные через `fields`).
     """
 
-    advs: list[GetAdvResponse]  # Список объявлений
+    advs: list[PartialAdvResponse]  # Список объявлений
 
 
 class SearchParams(BaseModel):
@@ -0,0 +1,44 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class OwnerStats(BaseModel):
+    """
+    Статистика объявлений одного владельца.
+    """
+
+    owner: str  # Имя владельца
+    total: int  # Количество объявлений
+    price_min: int  # Минимальная цена
+    price_max: int  # Максимальная цена
+    price_avg: float  # Средняя цена
+    price_p50: float  # Медиана цены
+    price_p90: float  # 90-й перцентиль цены
+
+
+class DailyVolume(BaseModel):
+    """
+    Количество объявлений, опубликованных за день.
+    """
+
+    day: datetime.date  # День публикации
+    total: int  # Количество объявлений
+
+
+class StatsResponse(BaseModel):
+    """
+    Модель ответа со статистикой по объявлениям.
+
+    Данные берутся из материализованных представлений и отстают
+    от таблицы объявлений не больше чем на `STATS_REFRESH_SEC`
+    (момент обновления — в `refreshed_at`).
+    """
+
+    total: int  # Количество объявлений
+    price_avg: float | None  # Средняя цена
+    price_p50: float | None  # Медиана цены
+    price_p90: float | None  # 90-й перцентиль цены
+    refreshed_at: datetime.datetime  # Время последнего обновления статистики
+    owners: list[OwnerStats]  # Статистика по владельцам
+    daily: list[DailyVolume]  # Объём публикаций по дням
@@ -41,6 +41,41 @@ class CreateUserRequest(BaseUserRequest):
     role: ROLE | None  # Роль пользователя по умолчанию (обычный пользователь)
 
 
+class BulkCreateUserRequest(BaseModel):
+    """
+    Модель данных для массового создания пользователей.
+
+    Содержит список пользователей в формате `CreateUserRequest`.
+    """
+
+    users: list[CreateUserRequest]  # Создаваемые пользователи
+
+
+class BulkUserResult(BaseModel):
+    """
+    Результат создания одного пользователя в массовом запросе.
+
+    Статусы:
+    - "created": пользователь создан (`id` заполнен);
+    - "exists": пользователь с таким именем уже есть;
+    - "duplicate": имя повторяется в самом запросе (создан первый из повторов).
+    """
+
+    name: str  # Имя пользователя
+    status: str  # "created", "exists" или "duplicate"
+    id: int | None = None  # Идентификатор созданного пользователя
+
+
+class BulkCreateUserResponse(BaseModel):
+    """
+    Модель ответа на массовое создание пользователей.
+
+    Результаты идут в том же порядке, что и пользователи в запросе.
+    """
+
+    results: list[BulkUserResult]  # Результаты по каждому пользователю
+
+
 class CreateUserResponse(IdResponse):
     """
     Модель ответа после успешного создания пользователя.
@@ -1,33 +1,101 @@
 from fastapi import FastAPI
 
-from src.routers.auths import auths_router
-from src.routers.advertisements import advertisement_router
-from src.routers.users import users_router
+from src.core.config import get_settings
 from src.core.lifespan import lifespan
 
 
-app = FastAPI(
-    title="Advertisement API",
-    description="Сервис объявлений: позволяет пользователям создавать, просматривать, редактировать и удалять объявления.",
-    version="1.0.0",
-    terms_of_service=None,
-    lifespan=lifespan,
-)
+def create_app() -> FastAPI:
+    """
+    Фабрика приложения FastAPI.
 
-"""
-Настройка маршрутов (роутеров) приложения.
+    Роутеры (а вместе с ними модели) импортируются здесь, а движок БД
+    создаётся только в `lifespan`, поэтому импорт `src.server` дешёвый.
+    Используется uvicorn в режиме `--factory` (см. `src.launcher`).
 
-Приложение использует следующие роутеры:
-- `users_router`: Работа с пользователями (создание, получение, удаление).
-- `advertisement_router`: Работа с объявлениями (создание, поиск, обновление, удаление).
-- `auths_router`: Аутентификация пользователей (логин).
-"""
+    Returns:
+        FastAPI: Настроенное приложение.
+    """
+    from src.middleware.compression import CompressionMiddleware
+    from src.middleware.overload import AIMDLimiter, OverloadMiddleware
+    from src.routers.advertisements import advertisement_router
+    from src.routers.auths import auths_router
+    from src.routers.stats import stats_router
+    from src.routers.users import users_router
 
-# Регистрация роутера для работы с пользователями
-app.include_router(users_router, prefix="/src", tags=["Пользователи"])
+    settings = get_settings()
 
-# Регистрация роутера для работы с объявлениями
-app.include_router(advertisement_router, prefix="/src", tags=["Объявления"])
+    app = FastAPI(
+        title="Advertisement API",
+        description="Сервис объявлений: позволяет пользователям создавать, просматривать, редактировать и удалять объявления.",
+        version="1.0.0",
+        terms_of_service=None,
+        lifespan=lifespan,
+    )
 
-# Регистрация роутера для аутентификации
-app.include_router(auths_router, prefix="/src", tags=["Аутентификация"])
+    """
+    Настройка маршрутов (роутеров) приложения.
+
+    Приложение использует следующие роутеры:
+    - `users_router`: Работа с пользователями (создание, получение, удаление).
+    - `advertisement_router`: Работа с объявлениями (создание, поиск, обновление, удаление).
+    - `auths_router`: Аутентификация пользователей (логин).
+    - `stats_router`: Статистика по объявлениям.
+    """
+
+    # Регистрация роутера для работы с пользователями
+    app.include_router(users_router, prefix="/src", tags=["Пользователи"])
+
+    # Регистрация роутера для работы с объявлениями
+    app.include_router(advertisement_router, prefix="/src", tags=["Объявления"])
+
+    # Регистрация роутера для аутентификации
+    app.include_router(auths_router, prefix="/src", tags=["Аутентификация"])
+
+    # Регистрация роутера статистики
+    app.include_router(stats_router, prefix="/src", tags=["Статистика"])
+
+    # Сжатие ответов: крупные выдачи поиска передаются в gzip/br/zstd
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            level=settings.COMPRESSION_LEVEL,
+            offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+        )
+
+    # Защита от перегрузки. Добавляется последней, чтобы быть внешним слоем
+    # и отклонять лишние запросы до любой другой работы
+    if settings.OVERLOAD_ENABLED:
+        app.add_middleware(
+            OverloadMiddleware,
+            limiter=AIMDLimiter(
+                initial=settings.OVERLOAD_INITIAL_LIMIT,
+                min_limit=settings.OVERLOAD_MIN_LIMIT,
+                max_limit=settings.OVERLOAD_MAX_LIMIT,
+                target_latency=settings.OVERLOAD_TARGET_LATENCY_MS / 1000,
+            ),
+            queue_budgets={
+                "auth": settings.OVERLOAD_QUEUE_AUTH,
+                "write": settings.OVERLOAD_QUEUE_WRITE,
+                "search": settings.OVERLOAD_QUEUE_SEARCH,
+                "get": settings.OVERLOAD_QUEUE_GET,
+                "bulk": settings.OVERLOAD_QUEUE_BULK,
+            },
+            target_latencies=settings.overload_target_latencies(),
+            queue_timeout=settings.OVERLOAD_QUEUE_TIMEOUT_SEC,
+            retry_after=settings.OVERLOAD_RETRY_AFTER_SEC,
+        )
+
+    return app
+
+
+def __getattr__(name: str):
+    """
+    Обратная совместимость с `uvicorn src.server:app`.
+
+    Приложение создаётся фабрикой при первом обращении к `src.server.app`.
+    """
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+import pytest
+
+# Тесты работают с локальной SQLite (aiosqlite, WAL) без внешних сервисов.
+# Переменная задаётся до первого обращения к настройкам (`get_settings` кэширует их).
+os.environ.setdefault("DB_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db")
+
+
+@asynccontextmanager
+async def api() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Запускает приложение в процессе (вместе с `lifespan`, то есть на чистой БД)
+    и возвращает HTTP-клиент к нему.
+    """
+    from src.server import create_app
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test/src"
+        ) as client:
+            yield client
+
+
+async def login(client: httpx.AsyncClient, name: str, role: str = "user") -> dict:
+    """
+    Создаёт пользователя и возвращает заголовки с его токеном.
+    """
+    response = await client.post(
+        "/user", json={"name": name, "password": "secret", "role": role}
+    )
+    assert response.status_code == 200, response.text
+    response = await client.post("/login", json={"name": name, "password": "secret"})
+    assert response.status_code == 200, response.text
+    return {"x-token": response.json()["token"]}
+
+
+@pytest.fixture
+def run():
+    """
+    Выполняет корутину теста в отдельном event loop.
+    """
+    return asyncio.run
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    """
+    Сбрасывает in-memory кэши воркера: каждый тест начинает с чистой БД.
+    """
+    from src import crud
+    from src.core import idempotency
+
+    crud.get_user_cache().clear()
+    idempotency.get_store().clear()
+    yield
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+import httpx
+
+from client import AdvertisementClient, ApiError
+from src.server import create_app
+
+
+def test_client_does_not_import_server():
+    code = (
+        "import sys, client; "
+        "assert not [m for m in sys.modules if m == 'src' or m.startswith('src.')]"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_client_round_trip(run):
+    async def scenario():
+        app = create_app()
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with AdvertisementClient(
+                "http://test", name="alice", password="secret", transport=transport
+            ) as api:
+                user_id = await api.create_user("alice", "secret")
+                user = await api.get_user(user_id)
+                assert (user.name, user.role) == ("alice", "user")
+
+                adv_id = await api.create_advertisement("Bike", "Red", 100, "alice")
+                adv = await api.get_advertisement(adv_id, fields=["title", "price"])
+                assert (adv.title, adv.price, adv.description) == ("Bike", 100, None)
+
+                found = [adv.id async for adv in api.iter_advertisements(title="bik")]
+                assert found == [adv_id]
+
+                try:
+                    await api.create_user("alice", "other")
+                except ApiError as exc:
+                    assert exc.status_code == 409
+                else:
+                    raise AssertionError("duplicate user was created")
+
+    run(scenario())
@@ -0,0 +1,87 @@
+import gzip
+
+import httpx
+
+from src.middleware.compression import CompressionMiddleware, choose_encoding
+
+
+def make_app(body: bytes, content_type: str = "application/json", chunks: int = 1):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        step = -(-len(body) // chunks)
+        for i in range(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": body[i * step : (i + 1) * step],
+                    "more_body": i < chunks - 1,
+                }
+            )
+
+    return app
+
+
+async def fetch(app, accept_encoding: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=CompressionMiddleware(app, minimum_size=100))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get("/", headers={"accept-encoding": accept_encoding})
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("") is None
+    assert choose_encoding("*") is not None
+
+
+def test_large_body_is_gzipped(run):
+    body = b'{"advs": [' + b'{"title": "bike"},' * 200 + b"]}"
+    response = run(fetch(make_app(body), "gzip"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(body)
+    # httpx распаковывает gzip сам
+    assert response.content == body
+
+
+def test_streamed_body_is_gzipped(run):
+    body = b"line\n" * 1000
+    response = run(fetch(make_app(body, "application/x-ndjson", chunks=5), "gzip"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == body
+
+
+def test_small_excluded_and_unaccepted_bodies_pass_through(run):
+    small = run(fetch(make_app(b"{}"), "gzip"))
+    assert "content-encoding" not in small.headers
+
+    body = b"data: x\n\n" * 100
+    stream = run(fetch(make_app(body, "text/event-stream"), "gzip"))
+    assert "content-encoding" not in stream.headers
+
+    plain = run(fetch(make_app(b"x" * 1000), "identity"))
+    assert "content-encoding" not in plain.headers
+    assert plain.content == b"x" * 1000
+
+
+def test_gzip_stream_is_valid(run):
+    body = b"x" * 5000
+
+    async def raw():
+        transport = httpx.ASGITransport(
+            app=CompressionMiddleware(make_app(body), minimum_size=100)
+        )
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            async with c.stream("GET", "/", headers={"accept-encoding": "gzip"}) as r:
+                return b"".join([chunk async for chunk in r.aiter_raw()])
+
+    assert gzip.decompress(run(raw())) == body
@@ -0,0 +1,134 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+
+from src.core import export
+from src.core.config import get_settings
+from src.models.advertisements import ADV_FIELDS, AdvertisementORM
+from src.models.database import Session
+from tests.conftest import api, login
+
+
+async def add_advertisements(count: int, description: str = "text") -> None:
+    async with Session() as session, session.begin():
+        for i in range(count):
+            session.add(
+                AdvertisementORM(
+                    title=f"adv{i}",
+                    description=description,
+                    price=i,
+                    owner="alice",
+                    user_id=1,
+                )
+            )
+
+
+def test_ndjson_and_csv(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "root", role="admin")
+            await add_advertisements(3)
+
+            response = await client.get(
+                "/advertisement/export",
+                params={"format": "ndjson", "fields": "id,title"},
+                headers=headers,
+            )
+            assert response.status_code == 200
+            assert response.headers["x-export-watermark"] == "3"
+            rows = [json.loads(line) for line in response.text.splitlines()]
+            assert rows == [{"id": i + 1, "title": f"adv{i}"} for i in range(3)]
+
+            response = await client.get(
+                "/advertisement/export",
+                params={"format": "csv", "fields": "id,price"},
+                headers=headers,
+            )
+            assert response.headers["content-type"].startswith("text/csv")
+            rows = list(csv.reader(io.StringIO(response.text)))
+            assert rows == [["id", "price"], ["1", "0"], ["2", "1"], ["3", "2"]]
+
+    run(scenario())
+
+
+def test_parquet_with_null_first_batch(run):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    fields = ("id", "description", "date_posted")
+    posted = datetime.datetime(2026, 1, 1)
+
+    async def batches():
+        # Первая пачка целиком без описания, следующая — с описанием
+        yield [(1, None, posted), (2, None, posted)]
+        yield [(3, "text", posted)]
+
+    async def scenario():
+        chunks = export.encode(batches(), fields, "parquet")
+        return b"".join([chunk async for chunk in chunks])
+
+    table = pyarrow_parquet.read_table(io.BytesIO(run(scenario())))
+    assert table.column("description").to_pylist() == [None, None, "text"]
+    assert str(table.schema.field("description").type) == "string"
+
+
+def test_parquet_endpoint(run):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "root", role="admin")
+            await add_advertisements(3)
+            response = await client.get(
+                "/advertisement/export", params={"format": "parquet"}, headers=headers
+            )
+            assert response.status_code == 200
+            return response.content
+
+    table = pyarrow_parquet.read_table(io.BytesIO(run(scenario())))
+    assert table.column("id").to_pylist() == [1, 2, 3]
+    assert table.schema.names == list(ADV_FIELDS)
+
+
+def test_incremental_export_rescans_window(run, monkeypatch):
+    monkeypatch.setattr(get_settings(), "EXPORT_RESCAN_WINDOW", 2)
+
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "root", role="admin")
+            await add_advertisements(5)
+            response = await client.get(
+                "/advertisement/export",
+                params={"format": "ndjson", "fields": "id", "after_id": 4},
+                headers=headers,
+            )
+            ids = [json.loads(line)["id"] for line in response.text.splitlines()]
+            assert ids == [3, 4, 5]
+
+    run(scenario())
+
+
+def test_export_errors(run):
+    async def scenario():
+        async with api() as client:
+            user = await login(client, "alice")
+            response = await client.get("/advertisement/export", headers=user)
+            assert response.status_code == 403
+
+            admin = await login(client, "root", role="admin")
+            response = await client.get(
+                "/advertisement/export", params={"format": "xml"}, headers=admin
+            )
+            assert response.status_code == 400
+
+    run(scenario())
+
+
+def test_cli_rejects_unknown_fields(capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        export.main(["--fields", "id,titel"])
+    assert exc_info.value.code == 2
+    error = capsys.readouterr().err
+    assert "unknown fields: titel" in error
+    assert "allowed: id, title, description" in error
@@ -0,0 +1,76 @@
+import json
+from types import SimpleNamespace
+
+from src.core.config import get_settings
+from src.core.feed import AdvertisementHub, Subscription, notify_advertisement
+from src.models.advertisements import AdvertisementORM
+from tests.conftest import api, login
+
+ADV = {"title": "Bike", "description": "Red", "price": 100, "owner": "alice"}
+
+
+class RecordingSession:
+    """
+    Сессия-заглушка Postgres, запоминающая выполненные запросы.
+    """
+
+    bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    def __init__(self) -> None:
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+def test_notify_payload_is_bounded(run):
+    adv = AdvertisementORM(id=7, title="x" * 10000, owner="o" * 10000)
+    session = RecordingSession()
+    run(notify_advertisement(session, "created", adv))
+
+    params = session.statements[0].compile().params
+    payload = next(value for value in params.values() if value != "advertisements")
+    assert json.loads(payload) == {"id": 7, "action": "created"}
+
+
+def test_hub_delivers_fetched_advertisement(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice")
+            response = await client.post("/advertisement", json=ADV, headers=headers)
+            adv_id = response.json()["id"]
+
+            hub = AdvertisementHub()
+            matching = hub.subscribe(Subscription(title="bik"))
+            other = hub.subscribe(Subscription(price=1))
+            await hub.deliver({"id": adv_id, "action": "updated"})
+
+            event = matching.queue.get_nowait()
+            assert event["id"] == adv_id
+            assert event["title"] == "Bike"
+            assert event["action"] == "updated"
+            json.dumps(event)
+            assert other.queue.empty()
+
+            # Удалённое объявление не публикуется
+            await client.delete(f"/advertisement/{adv_id}", headers=headers)
+            await hub.deliver({"id": adv_id, "action": "updated"})
+            assert matching.queue.empty()
+
+    run(scenario())
+
+
+def test_notify_skipped_when_feed_disabled(run, monkeypatch):
+    monkeypatch.setattr(get_settings(), "FEED_ENABLED", False)
+    session = RecordingSession()
+    run(notify_advertisement(session, "created", AdvertisementORM(id=1)))
+    assert session.statements == []
+
+
+def test_stream_requires_postgres(run):
+    async def scenario():
+        async with api() as client:
+            response = await client.get("/advertisement/stream")
+            assert response.status_code == 501
+
+    run(scenario())
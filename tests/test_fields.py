@@ -0,0 +1,51 @@
+from src.models.advertisements import ADV_FIELDS
+from tests.conftest import api, login
+
+ADV = {"title": "Bike", "description": "Red", "price": 100, "owner": "alice"}
+
+
+def test_get_returns_only_requested_fields(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice")
+            response = await client.post("/advertisement", json=ADV, headers=headers)
+            adv_id = response.json()["id"]
+
+            response = await client.get(
+                f"/advertisement/{adv_id}",
+                params={"fields": "price,title"},
+                headers=headers,
+            )
+            assert response.status_code == 200
+            assert response.json() == {"title": "Bike", "price": 100}
+
+            response = await client.get(f"/advertisement/{adv_id}", headers=headers)
+            assert tuple(response.json()) == ADV_FIELDS
+
+    run(scenario())
+
+
+def test_search_returns_only_requested_fields(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice")
+            await client.post("/advertisement", json=ADV, headers=headers)
+            response = await client.get(
+                "/advertisement", params={"title": "bike", "fields": "id,owner"}
+            )
+            assert response.status_code == 200
+            assert response.json() == {"advs": [{"id": 1, "owner": "alice"}]}
+
+    run(scenario())
+
+
+def test_unknown_field_is_rejected(run):
+    async def scenario():
+        async with api() as client:
+            response = await client.get(
+                "/advertisement", params={"title": "bike", "fields": "id,password"}
+            )
+            assert response.status_code == 400
+            assert "password" in response.json()["detail"]
+
+    run(scenario())
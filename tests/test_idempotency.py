@@ -0,0 +1,173 @@
+import asyncio
+import datetime
+import time
+
+from sqlalchemy import func, select
+
+from src.core import idempotency
+from src.core.purge import purge
+from src.models.advertisements import AdvertisementORM
+from src.models.database import Session
+from src.models.idempotency import IdempotencyKeyORM
+from tests.conftest import api, login
+
+ADV = {"title": "Bike", "description": "Red", "price": 100, "owner": "alice"}
+
+
+async def count_advertisements() -> int:
+    async with Session() as session:
+        return await session.scalar(select(func.count(AdvertisementORM.id)))
+
+
+def test_replay_returns_stored_response(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice") | {"idempotency-key": "k1"}
+            first = await client.post("/advertisement", json=ADV, headers=headers)
+            assert first.status_code == 200
+            assert "idempotent-replayed" not in first.headers
+
+            second = await client.post("/advertisement", json=ADV, headers=headers)
+            assert second.status_code == 200
+            assert second.headers["idempotent-replayed"] == "true"
+            assert second.json() == first.json()
+
+            # Повтор из таблицы, а не из LRU воркера
+            idempotency.get_store().clear()
+            third = await client.post("/advertisement", json=ADV, headers=headers)
+            assert third.json() == first.json()
+            assert await count_advertisements() == 1
+
+    run(scenario())
+
+
+def test_key_reused_with_different_body(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice") | {"idempotency-key": "k1"}
+            await client.post("/advertisement", json=ADV, headers=headers)
+            response = await client.post(
+                "/advertisement", json=ADV | {"price": 1}, headers=headers
+            )
+            assert response.status_code == 422
+            assert await count_advertisements() == 1
+
+    run(scenario())
+
+
+def test_key_is_scoped_to_caller(run):
+    async def scenario():
+        async with api() as client:
+            alice = await login(client, "alice") | {"idempotency-key": "k1"}
+            bob = await login(client, "bob") | {"idempotency-key": "k1"}
+            first = await client.post("/advertisement", json=ADV, headers=alice)
+            second = await client.post("/advertisement", json=ADV, headers=bob)
+            assert second.status_code == 200
+            assert "idempotent-replayed" not in second.headers
+            assert second.json() != first.json()
+            assert await count_advertisements() == 2
+
+    run(scenario())
+
+
+def test_in_progress_and_stale_claims(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice") | {"idempotency-key": "k1"}
+            user_id = 1
+            key = f"/src/advertisement:{user_id}:k1"
+            async with Session() as session, session.begin():
+                session.add(
+                    IdempotencyKeyORM(
+                        key=key,
+                        fingerprint="-",
+                        created_at=datetime.datetime.now(),
+                    )
+                )
+            response = await client.post("/advertisement", json=ADV, headers=headers)
+            assert response.status_code == 409
+
+            # Захват старше IDEMPOTENCY_CLAIM_TIMEOUT_SEC (упавший воркер) снимается
+            async with Session() as session, session.begin():
+                row = await session.scalar(
+                    select(IdempotencyKeyORM).where(IdempotencyKeyORM.key == key)
+                )
+                row.created_at -= datetime.timedelta(hours=1)
+            response = await client.post("/advertisement", json=ADV, headers=headers)
+            assert response.status_code == 200
+            assert await count_advertisements() == 1
+
+    run(scenario())
+
+
+def test_failed_request_releases_key(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice") | {"idempotency-key": "k1"}
+            bad = await client.post(
+                "/advertisement", json={"title": "x"}, headers=headers
+            )
+            assert bad.status_code == 422
+            good = await client.post("/advertisement", json=ADV, headers=headers)
+            assert good.status_code == 200
+            assert "idempotent-replayed" not in good.headers
+
+    run(scenario())
+
+
+def test_concurrent_requests_run_handler_once(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice") | {"idempotency-key": "k1"}
+            responses = await asyncio.gather(
+                *(
+                    client.post("/advertisement", json=ADV, headers=headers)
+                    for _ in range(2)
+                )
+            )
+            assert [response.status_code for response in responses] == [200, 200]
+            assert responses[0].json() == responses[1].json()
+            replayed = [
+                "idempotent-replayed" in response.headers for response in responses
+            ]
+            assert sorted(replayed) == [False, True]
+            assert await count_advertisements() == 1
+
+    run(scenario())
+
+
+def test_stored_responses_expire():
+    store = idempotency.IdempotencyStore(10, ttl=0.05)
+    stored = idempotency.StoredResponse("-", 200, b"{}")
+    store.put("fresh", stored)
+    # Ответ, прочитанный из БД, живёт только остаток срока ключа
+    store.put("replayed", stored, ttl=0.01)
+    time.sleep(0.02)
+    assert store.get("replayed") is None
+    assert store.get("fresh") is stored
+    time.sleep(0.05)
+    assert store.get("fresh") is None
+
+
+def test_purge_removes_expired_keys(run):
+    async def scenario():
+        async with api():
+            now = datetime.datetime.now()
+            async with Session() as session, session.begin():
+                session.add_all(
+                    [
+                        IdempotencyKeyORM(
+                            key="old",
+                            fingerprint="-",
+                            created_at=now - datetime.timedelta(days=2),
+                        ),
+                        IdempotencyKeyORM(key="new", fingerprint="-", created_at=now),
+                    ]
+                )
+            purged = await purge(batch_size=100, pause=0)
+            assert purged["idempotency_keys"] == 1
+            async with Session() as session:
+                keys = await session.scalars(select(IdempotencyKeyORM.key))
+                assert list(keys) == ["new"]
+
+    run(scenario())
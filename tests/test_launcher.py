@@ -0,0 +1,26 @@
+import os
+
+from src import launcher
+
+
+def test_main_passes_settings_to_uvicorn(monkeypatch):
+    calls = []
+    monkeypatch.setattr(launcher.uvicorn, "run", lambda *a, **kw: calls.append((a, kw)))
+    monkeypatch.setattr(launcher, "default_workers", lambda: 3)
+    monkeypatch.setenv("SERVER_WORKERS", "0")
+
+    launcher.main(["--port", "9000", "--workers", "0"])
+
+    ((args, kwargs),) = calls
+    assert args == (launcher.APP_PATH,)
+    assert kwargs["factory"] is True
+    assert kwargs["port"] == 9000
+    assert kwargs["workers"] == 3
+    assert kwargs["loop"] in ("uvloop", "asyncio")
+    assert kwargs["http"] in ("httptools", "h11")
+    # Воркеры узнают своё число из окружения (см. src.core.provisioning)
+    assert os.environ["SERVER_WORKERS"] == "3"
+
+
+def test_default_workers_is_positive():
+    assert launcher.default_workers() >= 1
@@ -0,0 +1,92 @@
+import datetime
+
+from sqlalchemy import select
+
+from src.core import outbox
+from src.core.config import get_settings
+from src.models.database import Session
+from src.models.outbox import OutboxORM
+from tests.conftest import api
+
+
+async def add_event(available_at=None) -> int:
+    async with Session() as session, session.begin():
+        event = OutboxORM(topic="test", action="created", payload={"id": 1})
+        if available_at is not None:
+            event.available_at = available_at
+        session.add(event)
+    return event.id
+
+
+async def get_event(event_id: int):
+    async with Session() as session:
+        return await session.get(OutboxORM, event_id)
+
+
+def test_drain_dispatches_outside_transaction(run, monkeypatch):
+    monkeypatch.setattr(get_settings(), "OUTBOX_ENABLED", False)
+    seen = []
+
+    async def consumer(event: dict) -> None:
+        # Захват уже зафиксирован: другая сессия видит сдвинутый available_at
+        async with Session() as session:
+            claimed = await session.scalar(
+                select(OutboxORM.id).where(
+                    OutboxORM.id == event["id"],
+                    OutboxORM.available_at > outbox.db_time(session, 30),
+                )
+            )
+        seen.append((event["payload"], claimed))
+
+    monkeypatch.setitem(outbox.consumers, "test", [consumer])
+
+    async def scenario():
+        async with api():
+            event_id = await add_event()
+            assert await outbox.drain_batch(10, 300, lease=60) == 1
+            assert seen == [({"id": 1}, event_id)]
+            assert await get_event(event_id) is None
+            assert await outbox.drain_batch(10, 300) == 0
+
+    run(scenario())
+
+
+def test_failed_event_is_backed_off(run, monkeypatch):
+    monkeypatch.setattr(get_settings(), "OUTBOX_ENABLED", False)
+
+    async def consumer(event: dict) -> None:
+        raise RuntimeError("consumer down")
+
+    monkeypatch.setitem(outbox.consumers, "test", [consumer])
+
+    async def scenario():
+        async with api():
+            event_id = await add_event()
+            assert await outbox.drain_batch(10, 300) == 1
+            event = await get_event(event_id)
+            assert event.attempts == 1
+            # Отсрочка — событие не выбирается сразу же повторно
+            assert await outbox.drain_batch(10, 300) == 0
+
+    run(scenario())
+
+
+def test_availability_uses_database_clock(run, monkeypatch):
+    monkeypatch.setattr(get_settings(), "OUTBOX_ENABLED", False)
+    monkeypatch.setitem(outbox.consumers, "test", [])
+
+    async def scenario():
+        async with api():
+            # available_at по часам БД (server_default) доступно сразу,
+            # независимо от часового пояса приложения
+            await add_event()
+            assert await outbox.drain_batch(10, 300) == 1
+
+            async with Session() as session:
+                future = await session.scalar(select(outbox.db_time(session, 3600)))
+            if isinstance(future, str):
+                future = datetime.datetime.fromisoformat(future)
+            await add_event(future)
+            assert await outbox.drain_batch(10, 300) == 0
+
+    run(scenario())
@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+
+from src.core.config import get_settings
+from src.middleware.overload import AIMDLimiter, OverloadMiddleware, classify
+
+
+def make_app(delays: dict[str, float]):
+    """
+    ASGI-приложение, отвечающее 200 с задержкой, зависящей от пути.
+    """
+
+    async def app(scope, receive, send):
+        await asyncio.sleep(delays.get(scope["path"], 0))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    return app
+
+
+async def mixed_traffic(middleware: OverloadMiddleware) -> None:
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(10):
+            await asyncio.gather(
+                client.post("/src/login", json={}),
+                client.post("/src/user", json={}),
+                *(client.get(f"/src/advertisement/{i}") for i in range(5)),
+            )
+
+
+def build(target_latencies=None) -> OverloadMiddleware:
+    limiter = AIMDLimiter(initial=20, min_limit=2, max_limit=100, target_latency=0.005)
+    app = make_app({"/src/login": 0.02, "/src/user": 0.02})
+    return OverloadMiddleware(
+        app,
+        limiter=limiter,
+        queue_budgets=dict.fromkeys(("auth", "write", "search", "get"), 100),
+        target_latencies=target_latencies,
+    )
+
+
+def test_classify_password_hashing_routes_as_auth():
+    assert classify({"path": "/src/login", "method": "POST"}) == "auth"
+    assert classify({"path": "/src/user", "method": "POST"}) == "auth"
+    assert classify({"path": "/src/user/1", "method": "PATCH"}) == "write"
+    assert classify({"path": "/src/user/bulk", "method": "POST"}) == "bulk"
+    assert classify({"path": "/src/advertisement", "method": "GET"}) == "search"
+    assert classify({"path": "/src/advertisement/1", "method": "GET"}) == "get"
+
+
+def test_slow_auth_does_not_shrink_limit(run):
+    middleware = build({"auth": 0})
+    run(mixed_traffic(middleware))
+    assert middleware.limiter.limit >= 20
+    assert middleware.in_flight == 0
+
+
+def test_slow_samples_shrink_limit_without_class_target(run):
+    # Без отдельной цели для auth медленные входы снижают общий лимит
+    middleware = build()
+    run(mixed_traffic(middleware))
+    assert middleware.limiter.limit < 20
+
+
+def test_server_errors_still_count_for_auth():
+    limiter = AIMDLimiter(initial=20, min_limit=2, max_limit=100, target_latency=0)
+    middleware = OverloadMiddleware(
+        make_app({}), limiter=limiter, queue_budgets={}, target_latencies={"auth": 0}
+    )
+    middleware._sample("auth", 10.0, failed=False)
+    assert limiter.limit == 20
+    middleware._sample("auth", 0.001, failed=True)
+    assert limiter.limit == 18
+
+
+def test_slow_bulk_does_not_shrink_limit():
+    # Долгое массовое создание пользователей не снижает лимит обычных записей
+    limiter = AIMDLimiter(initial=20, min_limit=2, max_limit=100, target_latency=0)
+    middleware = OverloadMiddleware(
+        make_app({}),
+        limiter=limiter,
+        queue_budgets={},
+        target_latencies=get_settings().overload_target_latencies(),
+    )
+    middleware._sample("bulk", 10.0, failed=False)
+    assert limiter.limit == 20
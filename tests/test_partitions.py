@@ -0,0 +1,61 @@
+import datetime
+
+from sqlalchemy import MetaData, create_mock_engine
+from sqlalchemy.schema import CreateTable
+
+from src.core import partitions
+from src.core.config import get_settings
+from src.models.advertisements import AdvertisementORM, partition_table
+from src.models.database import Base
+
+
+def test_month_helpers():
+    day = datetime.date(2026, 12, 15)
+    assert partitions.month_start(day) == datetime.date(2026, 12, 1)
+    assert partitions.month_start(day, 1) == datetime.date(2027, 1, 1)
+    assert partitions.month_start(day, -12) == datetime.date(2025, 12, 1)
+    assert partitions.partition_name(day) == "advertisements_y2026m12"
+
+
+def test_start_logs_maintenance_failure(run, monkeypatch, caplog):
+    calls = []
+
+    async def failing_maintain(wait: bool = False) -> bool:
+        calls.append(wait)
+        raise RuntimeError("relation already exists")
+
+    monkeypatch.setattr(partitions, "maintain", failing_maintain)
+
+    async def scenario():
+        maintainer = partitions.PartitionMaintainer()
+        await maintainer.start()
+        assert maintainer._task is not None
+        await maintainer.stop()
+
+    run(scenario())
+    assert calls == [True]
+    assert "Partition maintenance failed" in caplog.text
+
+
+def create_table_ddl(dialect: str) -> str:
+    """
+    Возвращает DDL создания копии таблицы объявлений для диалекта.
+    """
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(metadata)
+    table = metadata.tables[AdvertisementORM.__tablename__]
+    engine = create_mock_engine(f"{dialect}://", lambda *args, **kwargs: None)
+    partition_table(table, engine)
+    return str(CreateTable(table).compile(dialect=engine.dialect))
+
+
+def test_partitioning_is_applied_when_the_table_is_created(monkeypatch):
+    assert "PARTITION BY" not in create_table_ddl("postgresql")
+
+    monkeypatch.setattr(get_settings(), "ADV_PARTITIONED", True)
+    ddl = create_table_ddl("postgresql")
+    assert "PARTITION BY RANGE (date_posted)" in ddl
+    assert "PRIMARY KEY (id, date_posted)" in ddl
+    # SQLite таблицу не секционирует
+    assert "PRIMARY KEY (id)" in create_table_ddl("sqlite")
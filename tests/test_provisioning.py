@@ -0,0 +1,69 @@
+from src.core import provisioning
+from src.core.config import get_settings
+from tests.conftest import api, login
+
+
+def test_bulk_statuses(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "root", role="admin")
+            await login(client, "taken")
+            users = [
+                {"name": "new1", "password": "p1", "role": None},
+                {"name": "taken", "password": "p2", "role": None},
+                {"name": "new2", "password": "p3", "role": "admin"},
+                {"name": "new1", "password": "p4", "role": None},
+            ]
+            response = await client.post(
+                "/user/bulk", json={"users": users}, headers=headers
+            )
+            assert response.status_code == 200, response.text
+            results = response.json()["results"]
+            assert [result["status"] for result in results] == [
+                "created",
+                "exists",
+                "created",
+                "duplicate",
+            ]
+            assert results[0]["id"] != results[2]["id"]
+
+            login_response = await client.post(
+                "/login", json={"name": "new2", "password": "p3"}
+            )
+            assert login_response.status_code == 200
+
+    run(scenario())
+
+
+def test_bulk_requires_admin_and_limits_batch(run, monkeypatch):
+    async def scenario():
+        async with api() as client:
+            user = await login(client, "alice")
+            users = [{"name": "x", "password": "p", "role": None}]
+            response = await client.post(
+                "/user/bulk", json={"users": users}, headers=user
+            )
+            assert response.status_code == 403
+
+            admin = await login(client, "root", role="admin")
+            monkeypatch.setattr(get_settings(), "BULK_USER_MAX_BATCH", 1)
+            response = await client.post(
+                "/user/bulk", json={"users": users * 2}, headers=admin
+            )
+            assert response.status_code == 413
+
+    run(scenario())
+
+
+def test_pool_size_is_shared_between_workers(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(provisioning, "default_workers", lambda: 8)
+    monkeypatch.setattr(settings, "BULK_HASH_WORKERS", 0)
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+    assert provisioning.pool_size() == 1
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 2)
+    assert provisioning.pool_size() == 4
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 16)
+    assert provisioning.pool_size() == 1
+    monkeypatch.setattr(settings, "BULK_HASH_WORKERS", 3)
+    assert provisioning.pool_size() == 3
@@ -0,0 +1,52 @@
+from src.core.queries import QueryRegistry, get_registry, search_query
+from tests.conftest import api, login
+
+
+def test_registry_builds_each_shape_once():
+    cache = QueryRegistry(size=2)
+    built = []
+
+    def build(*shape):
+        built.append(shape)
+        return search_query(("id",), shape, False, False)
+
+    first = cache.get("search", build, "title")
+    assert cache.get("search", build, "title") is first
+    assert cache.get("search", build, "title", "owner") is not first
+    assert built == [("title",), ("title", "owner")]
+    assert cache.stats() == {"search": {"hits": 1, "misses": 2}}
+
+    # Вытесненная из LRU форма строится заново
+    cache.get("search", build, "owner")
+    cache.get("search", build, "title")
+    assert len(built) == 4
+
+
+def test_search_reuses_query_with_new_parameters(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice")
+            for title in ("Bike", "Car"):
+                adv = {
+                    "title": title,
+                    "description": "-",
+                    "price": 100,
+                    "owner": "alice",
+                }
+                await client.post("/advertisement", json=adv, headers=headers)
+
+            before = get_registry().stats().get("search", {"hits": 0, "misses": 0})
+            results = []
+            for title in ("bike", "car"):
+                response = await client.get(
+                    "/advertisement", params={"title": title, "fields": "id,title"}
+                )
+                results.append([adv["title"] for adv in response.json()["advs"]])
+            after = get_registry().stats()["search"]
+
+            # Одна форма запроса — одна сборка, значения передаются параметрами
+            assert results == [["Bike"], ["Car"]]
+            assert after["misses"] - before["misses"] <= 1
+            assert after["hits"] - before["hits"] >= 1
+
+    run(scenario())
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from src import crud
+from src.core.singleflight import SingleFlight
+from src.models.advertisements import AdvertisementORM
+from tests.conftest import api, login
+
+
+def test_concurrent_calls_share_one_execution(run):
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return len(calls)
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        assert results == [1] * 5
+        # Результат не кэшируется: следующий вызов выполняет работу заново
+        assert await flight.do("key", work) == 2
+        assert await flight.do("other", work) == 3
+
+    run(scenario())
+
+
+def test_errors_are_shared(run):
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(
+            *(flight.do("key", work) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(calls) == 1
+
+    run(scenario())
+
+
+def test_cancelling_one_waiter_keeps_shared_call(run):
+    finished = []
+
+    async def work():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+        return "done"
+
+    async def scenario():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert finished == [1]
+
+    run(scenario())
+
+
+def test_cancelling_all_waiters_cancels_shared_call(run):
+    finished = []
+
+    async def work():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+
+    async def scenario():
+        flight = SingleFlight()
+        waiter = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.08)
+        assert finished == []
+        assert flight._calls == {}
+
+    run(scenario())
+
+
+def test_shared_load_checks_each_caller(run, monkeypatch):
+    loads = []
+    get_item_by_id = crud.get_item_by_id
+
+    async def slow_get_item_by_id(session, orm_cls, item_id, **kwargs):
+        if orm_cls is AdvertisementORM:
+            loads.append(item_id)
+            # Держим загрузку, пока не придёт второй запрос
+            await asyncio.sleep(0.05)
+        return await get_item_by_id(session, orm_cls, item_id, **kwargs)
+
+    async def scenario():
+        async with api() as client:
+            alice = await login(client, "alice")
+            bob = await login(client, "bob")
+            adv = {"title": "Bike", "description": "-", "price": 1, "owner": "alice"}
+            response = await client.post("/advertisement", json=adv, headers=alice)
+            adv_id = response.json()["id"]
+
+            monkeypatch.setattr(crud, "get_item_by_id", slow_get_item_by_id)
+            owner, other = await asyncio.gather(
+                client.get(f"/advertisement/{adv_id}", headers=alice),
+                client.get(f"/advertisement/{adv_id}", headers=bob),
+            )
+            # Загрузка общая, но права проверены для каждого вызывающего
+            assert loads == [adv_id]
+            assert owner.status_code == 200
+            assert owner.json()["title"] == "Bike"
+            assert other.status_code == 403
+
+    run(scenario())
@@ -0,0 +1,107 @@
+from sqlalchemy import func, select
+
+from src.core.config import get_settings
+from src.core.purge import purge
+from src.models.advertisements import AdvertisementORM
+from src.models.database import Session
+from src.models.outbox import OutboxORM
+from src.models.tokens import TokenORM
+from src.models.users import UserORM
+from tests.conftest import api, login
+
+ADV = {"title": "Bike", "description": "Red", "price": 100, "owner": "alice"}
+
+
+async def count(orm_cls) -> int:
+    async with Session() as session:
+        return await session.scalar(select(func.count(orm_cls.id)))
+
+
+def test_deleted_advertisement_is_hidden_then_purged(run, monkeypatch):
+    monkeypatch.setattr(get_settings(), "PURGE_ENABLED", False)
+
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice")
+            for _ in range(3):
+                await client.post("/advertisement", json=ADV, headers=headers)
+
+            response = await client.delete("/advertisement/1", headers=headers)
+            assert response.status_code == 200
+            response = await client.get("/advertisement/1", headers=headers)
+            assert response.status_code == 404
+            response = await client.get("/advertisement", params={"title": "bike"})
+            assert [adv["id"] for adv in response.json()["advs"]] == [2, 3]
+
+            # Строка остаётся до фоновой очистки
+            assert await count(AdvertisementORM) == 3
+            assert await purge(batch_size=1, pause=0) == {
+                "advertisements": 1,
+                "tokens": 0,
+                "users": 0,
+                "idempotency_keys": 0,
+            }
+            assert await count(AdvertisementORM) == 2
+
+    run(scenario())
+
+
+def test_deleted_user_is_purged_with_dependents(run, monkeypatch):
+    monkeypatch.setattr(get_settings(), "PURGE_ENABLED", False)
+
+    async def scenario():
+        async with api() as client:
+            alice = await login(client, "alice")
+            await login(client, "bob")
+            await client.post("/advertisement", json=ADV, headers=alice)
+
+            response = await client.delete("/user/1", headers=alice)
+            assert response.status_code == 200
+            # Токены удалённого пользователя недействительны сразу
+            response = await client.post("/advertisement", json=ADV, headers=alice)
+            assert response.status_code == 401
+            # Имя освобождается сразу (частичный уникальный индекс)
+            await login(client, "alice")
+
+            await purge(batch_size=100, pause=0)
+            assert await count(AdvertisementORM) == 0
+            assert await count(UserORM) == 2
+            assert await count(TokenORM) == 2
+
+    run(scenario())
+
+
+def test_deleted_user_advertisements_disappear_at_once(run, monkeypatch):
+    monkeypatch.setattr(get_settings(), "PURGE_ENABLED", False)
+    # События outbox проверяются до их обработки диспетчером
+    monkeypatch.setattr(get_settings(), "OUTBOX_ENABLED", False)
+
+    async def scenario():
+        async with api() as client:
+            alice = await login(client, "alice")
+            admin = await login(client, "root", role="admin")
+            ids = []
+            for _ in range(2):
+                response = await client.post("/advertisement", json=ADV, headers=alice)
+                ids.append(response.json()["id"])
+
+            response = await client.delete("/user/1", headers=alice)
+            assert response.status_code == 200
+
+            # Объявления скрыты сразу, без фоновой очистки
+            response = await client.get("/advertisement", params={"owner": "alice"})
+            assert response.json()["advs"] == []
+            for adv_id in ids:
+                response = await client.get(f"/advertisement/{adv_id}", headers=admin)
+                assert response.status_code == 404
+            response = await client.get("/advertisement/export", headers=admin)
+            assert response.text == ""
+
+            async with Session() as session:
+                events = await session.scalars(
+                    select(OutboxORM).where(OutboxORM.action == "deleted")
+                )
+                deleted = {(event.topic, event.payload["id"]) for event in events}
+            assert {("advertisement", adv_id) for adv_id in ids} <= deleted
+
+    run(scenario())
@@ -0,0 +1,32 @@
+from sqlalchemy import text
+from sqlalchemy.dialects import sqlite
+
+from src.core.config import Settings, get_settings
+from src.models.database import create_engine, insert
+from src.models.users import UserORM
+from tests.conftest import api
+
+
+def test_db_url_selects_backend():
+    settings = Settings(DB_URL="sqlite+aiosqlite:///bench.db")
+    assert settings.det_db_url() == "sqlite+aiosqlite:///bench.db"
+    assert not settings.is_postgres()
+
+    settings = Settings(DB_URL="", DB_HOST="db", DB_PORT="5432")
+    assert settings.det_db_url().startswith("postgresql+asyncpg://")
+    assert "@db:5432/" in settings.det_db_url()
+    assert settings.is_postgres()
+
+
+def test_sqlite_engine(run):
+    async def scenario():
+        assert not get_settings().is_postgres()
+        async with api():
+            assert isinstance(insert(UserORM), sqlite.Insert)
+            async with create_engine().connect() as conn:
+                journal_mode = await conn.scalar(text("PRAGMA journal_mode"))
+                foreign_keys = await conn.scalar(text("PRAGMA foreign_keys"))
+            assert journal_mode == "wal"
+            assert foreign_keys == 1
+
+    run(scenario())
@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+
+from sqlalchemy import func, select
+
+from src.core.startup import collect_report
+from src.models.database import Session
+from src.models.users import UserORM
+from tests.conftest import api, login
+
+
+def test_report_does_not_touch_database(run):
+    async def scenario():
+        async with api() as client:
+            await login(client, "alice")
+            report = await collect_report(limit=200)
+            async with Session() as session:
+                users = await session.scalar(select(func.count(UserORM.id)))
+        return report, users
+
+    report, users = run(scenario())
+    assert users == 1
+    # Импорты фабрики приложения попадают в разбивку
+    assert "src.routers.advertisements" in report
+    assert "create_app (routers, models)" in report
+    assert "lifespan: init_orm" not in report.split("Startup phases")[1]
+
+
+def test_server_import_is_cheap():
+    # Отдельный интерпретатор: в текущем процессе модули уже загружены
+    code = (
+        "import json, sys, src.server\n"
+        "from src.core.config import get_settings\n"
+        "print(json.dumps([m for m in sys.modules if m.startswith('src.')]))\n"
+        "print(get_settings.cache_info().currsize)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    modules = json.loads(output[0])
+    assert "src.models.advertisements" not in modules
+    assert "src.core.provisioning" not in modules
+    assert len(modules) <= 7
+    # Настройки при импорте не создаются
+    assert output[1] == "0"
@@ -0,0 +1,39 @@
+from sqlalchemy import create_mock_engine
+
+from src.core.stats import refresher
+from src.models.advertisements import AdvertisementORM
+from src.models.stats import VIEWS
+from tests.conftest import api
+
+
+def ddl(dialect: str) -> str:
+    """
+    Возвращает DDL создания таблицы объявлений для диалекта без подключения к БД.
+    """
+    statements = []
+
+    def executor(sql, *args, **kwargs):
+        statements.append(str(sql.compile(dialect=engine.dialect)))
+
+    engine = create_mock_engine(f"{dialect}://", executor)
+    AdvertisementORM.__table__.create(engine, checkfirst=False)
+    return "\n".join(statements)
+
+
+def test_views_are_created_only_on_postgres():
+    postgres = ddl("postgresql")
+    for name, (_, key) in VIEWS.items():
+        assert f"CREATE MATERIALIZED VIEW {name}" in postgres
+        assert f"ON {name} ({key})" in postgres
+    assert "MATERIALIZED VIEW" not in ddl("sqlite")
+
+
+def test_stats_endpoint_requires_postgres(run):
+    async def scenario():
+        async with api() as client:
+            response = await client.get("/stats")
+            assert response.status_code == 501
+            # Фоновое обновление на SQLite не запускается
+            assert refresher._task is None
+
+    run(scenario())
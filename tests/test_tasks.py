@@ -0,0 +1,59 @@
+import asyncio
+
+from src.core.tasks import PeriodicTask
+
+
+class Counter(PeriodicTask):
+    wait_first = False
+
+    def __init__(self, busy_ticks: int = 0, fail: bool = False) -> None:
+        super().__init__()
+        self.calls = 0
+        self.busy_ticks = busy_ticks
+        self.fail = fail
+
+    def interval(self) -> float:
+        return 0.05
+
+    async def tick(self) -> bool:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("boom")
+        return self.calls <= self.busy_ticks
+
+
+def test_periodic_task_runs_until_stopped(run):
+    async def scenario():
+        task = Counter()
+        await task.start()
+        await task.start()  # повторный запуск не создаёт вторую задачу
+        await asyncio.sleep(0.12)
+        await task.stop()
+        calls = task.calls
+        await asyncio.sleep(0.1)
+        assert 2 <= calls <= 4
+        assert task.calls == calls
+
+    run(scenario())
+
+
+def test_periodic_task_skips_pause_while_busy(run):
+    async def scenario():
+        task = Counter(busy_ticks=10)
+        await task.start()
+        await asyncio.sleep(0.01)
+        await task.stop()
+        assert task.calls >= 10
+
+    run(scenario())
+
+
+def test_periodic_task_survives_errors(run):
+    async def scenario():
+        task = Counter(fail=True)
+        await task.start()
+        await asyncio.sleep(0.12)
+        await task.stop()
+        assert task.calls >= 2
+
+    run(scenario())
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.core.transactions import CLIENT_CLOSED_REQUEST, run_until_disconnect
+from src.models.database import read_only_session
+from tests.conftest import api
+
+
+def make_request(disconnect_after: float | None) -> Request:
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        if disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    return Request({"type": "http", "method": "GET", "headers": []}, receive)
+
+
+def test_read_timeout_covers_statements_only(run, monkeypatch):
+    async def scenario():
+        async with api():
+            async with read_only_session(0.05) as session:
+                # Работа обработчика между запросами в таймаут не входит
+                await asyncio.sleep(0.1)
+                assert await session.scalar(select(1)) == 1
+
+                execute = AsyncSession.execute
+
+                async def slow_execute(self, *args, **kwargs):
+                    await asyncio.sleep(0.2)
+                    return await execute(self, *args, **kwargs)
+
+                monkeypatch.setattr(AsyncSession, "execute", slow_execute)
+                with pytest.raises(TimeoutError):
+                    await session.execute(select(1))
+
+    run(scenario())
+
+
+def test_disconnect_returns_499(run):
+    async def handler(request: Request) -> Response:
+        await asyncio.sleep(1)
+        return Response(status_code=200)
+
+    response = run(run_until_disconnect(handler, make_request(0.01)))
+    assert response.status_code == CLIENT_CLOSED_REQUEST
+
+
+def test_other_cancellation_is_not_499(run):
+    async def handler(request: Request) -> Response:
+        raise asyncio.CancelledError
+
+    async def scenario():
+        with pytest.raises(asyncio.CancelledError):
+            await run_until_disconnect(handler, make_request(None))
+
+    run(scenario())
+
+
+def test_completed_handler_response_is_returned(run):
+    async def handler(request: Request) -> Response:
+        return Response(status_code=201)
+
+    response = run(run_until_disconnect(handler, make_request(None)))
+    assert response.status_code == 201
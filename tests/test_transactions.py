@@ -0,0 +1,94 @@
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+
+from src.core.transactions import TransactionalRoute, is_serialization_failure
+from src.dependency import SessionDependency
+from src.models.database import Session
+from src.models.users import UserORM
+from tests.conftest import api
+
+
+class SerializationFailure(Exception):
+    sqlstate = "40001"
+
+
+def serialization_error() -> DBAPIError:
+    return DBAPIError("UPDATE ...", {}, SerializationFailure())
+
+
+def build_app(failures: int) -> tuple[FastAPI, list[int]]:
+    router = APIRouter(route_class=TransactionalRoute)
+    attempts = []
+
+    @router.post("/flaky")
+    async def flaky(session: SessionDependency) -> dict:
+        attempts.append(1)
+        session.add(UserORM(name=f"user{len(attempts)}", password="x", role="user"))
+        await session.flush()
+        if len(attempts) <= failures:
+            raise serialization_error()
+        return {"attempts": len(attempts)}
+
+    @router.post("/rejected")
+    async def rejected(session: SessionDependency) -> dict:
+        session.add(UserORM(name="rejected", password="x", role="user"))
+        await session.flush()
+        raise HTTPException(400, "Rejected")
+
+    app = FastAPI()
+    app.include_router(router)
+    return app, attempts
+
+
+async def count_users() -> int:
+    async with Session() as session:
+        return await session.scalar(select(func.count(UserORM.id)))
+
+
+async def post(app: FastAPI, path: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(path)
+
+
+def test_is_serialization_failure():
+    assert is_serialization_failure(serialization_error())
+    assert not is_serialization_failure(ValueError())
+
+
+def test_serialization_failure_is_retried(run):
+    async def scenario():
+        async with api():
+            app, attempts = build_app(failures=2)
+            response = await post(app, "/flaky")
+            assert response.json() == {"attempts": 3}
+            # Откаченные попытки не оставили строк
+            assert await count_users() == 1
+
+    run(scenario())
+
+
+def test_retries_are_limited(run):
+    async def scenario():
+        async with api():
+            app, attempts = build_app(failures=10)
+            with pytest.raises(DBAPIError):
+                await post(app, "/flaky")
+            assert len(attempts) == 3
+            assert await count_users() == 0
+
+    run(scenario())
+
+
+def test_error_rolls_back_request_transaction(run):
+    async def scenario():
+        async with api():
+            app, _ = build_app(failures=0)
+            response = await post(app, "/rejected")
+            assert response.status_code == 400
+            assert await count_users() == 0
+
+    run(scenario())
@@ -0,0 +1,78 @@
+from src import crud
+from src.models.database import Session
+from tests.conftest import api, login
+
+
+async def log_in(client, name: str, password: str) -> int:
+    response = await client.post("/login", json={"name": name, "password": password})
+    return response.status_code
+
+
+def test_password_change_invalidates_cache(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice")
+            assert crud.get_user_cache().get("alice") is not None
+
+            data = {"name": None, "role": None, "password": "changed"}
+            response = await client.patch("/user/1", json=data, headers=headers)
+            assert response.status_code == 200
+            assert await log_in(client, "alice", "secret") == 401
+            assert await log_in(client, "alice", "changed") == 200
+
+    run(scenario())
+
+
+def test_deleted_user_cannot_log_in(run):
+    async def scenario():
+        async with api() as client:
+            headers = await login(client, "alice")
+            response = await client.delete("/user/1", headers=headers)
+            assert response.status_code == 200
+            assert await log_in(client, "alice", "secret") == 401
+
+    run(scenario())
+
+
+def test_cache_is_reset_only_after_commit(run):
+    async def scenario():
+        async with api() as client:
+            await login(client, "alice")
+            cache = crud.get_user_cache()
+
+            async with Session() as session:
+                crud.forget_user(session, "alice")
+                await session.rollback()
+            assert cache.get("alice") is not None
+
+            async with Session() as session:
+                async with session.begin():
+                    crud.forget_user(session, "alice")
+                    assert cache.get("alice") is not None
+                assert cache.get("alice") is None
+
+    run(scenario())
+
+
+def test_read_started_before_invalidation_is_not_cached(run):
+    async def scenario():
+        async with api() as client:
+            await login(client, "alice")
+            cache = crud.get_user_cache()
+            cache.clear()
+
+            async with Session() as session:
+                execute = session.execute
+
+                async def execute_then_invalidate(*args, **kwargs):
+                    # Изменение пользователя фиксируется, пока идёт чтение
+                    result = await execute(*args, **kwargs)
+                    crud._invalidate_users(["alice"])
+                    return result
+
+                session.execute = execute_then_invalidate
+                credentials = await crud.get_user_credentials(session, "alice")
+            assert credentials is not None
+            assert cache.get("alice") is None
+
+    run(scenario())